@@ -1,10 +1,33 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory, Response, stream_with_context, g
 import os
 from werkzeug.utils import secure_filename
-from match import read_file, calculate_cv_jd_match
+from match import read_bytes, calculate_cv_jd_match, calculate_batch_match, compute_match, build_cv_profiles, tfidf_analyzer, warm_up_nlp, JobProfile, CVProfile, resolve_weights, SKILL_TAXONOMIES
 from document_validator import validate_cv, validate_jd
+from feature_cache import FeatureCache, content_hash
+from jobs import JobManager
+from candidate_store import CandidateStore
+from parallel import ParallelScorer, load_cv_profile
+from tfidf_index import TfidfIndex
+from vector_index import VectorIndex
+from jd_registry import JDRegistry
+from score_matrix import COMPONENTS, weighted_scores
+from metrics import timed
+import metrics
+from profiling import RequestProfiler
 
 import json
+import sqlite3
+import functools
+import hmac
+import time
+import base64
+import binascii
+import itertools
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 
 # Adjust paths to point to frontend folder (sibling to backend)
 base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,9 +35,6 @@ frontend_dir = os.path.join(base_dir, '..', 'frontend')
 template_dir = os.path.abspath(os.path.join(frontend_dir, 'templates'))
 static_dir = os.path.abspath(os.path.join(frontend_dir, 'static'))
 
-# Global list to track candidates (in-memory for session)
-# In production, this would be a database
-processed_candidates = []
 
 print(f"Template Dir: {template_dir}")
 print(f"Static Dir: {static_dir}")
@@ -27,60 +47,519 @@ app.secret_key = 'supersecretkey'  # Change this in production
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB limit
 app.config['ALLOWED_EXTENSIONS'] = {'txt', 'pdf', 'docx'}
+# spaCy batching for multi-CV uploads (nlp.pipe)
+app.config['NLP_BATCH_SIZE'] = int(os.environ.get('NLP_BATCH_SIZE', 32))
+app.config['NLP_N_PROCESS'] = int(os.environ.get('NLP_N_PROCESS', 1))
+
+# Load the spaCy model in the background when a worker serves its first request
+# (it is otherwise loaded by the first request that needs it); importing the
+# app never loads it
+app.config['SPACY_PREWARM'] = os.environ.get('SPACY_PREWARM', '1') == '1'
+
+# Processed candidates (Admin Dashboard)
+app.config['CANDIDATE_DB_PATH'] = os.environ.get('CANDIDATE_DB_PATH', os.path.join('db', 'candidates.sqlite3'))
+app.config['ADMIN_PAGE_SIZE'] = int(os.environ.get('ADMIN_PAGE_SIZE', 24))
+app.config['ADMIN_MAX_PAGE_SIZE'] = 100
+
+# Parsed text + CV features cached by file content hash
+app.config['FEATURE_CACHE_PATH'] = os.environ.get('FEATURE_CACHE_PATH', os.path.join('cache', 'features.sqlite3'))
+app.config['FEATURE_CACHE_MAX_ENTRIES'] = int(os.environ.get('FEATURE_CACHE_MAX_ENTRIES', 5000))
+app.config['FEATURE_CACHE_MAX_MB'] = int(os.environ.get('FEATURE_CACHE_MAX_MB', 512))
+
+# Corpus-wide TF-IDF over every CV seen (IDF refreshed every N new CVs, saved every M)
+app.config['TFIDF_INDEX_DIR'] = os.environ.get('TFIDF_INDEX_DIR', os.path.join('cache', 'tfidf_index'))
+app.config['TFIDF_REFRESH_EVERY'] = int(os.environ.get('TFIDF_REFRESH_EVERY', 200))
+app.config['TFIDF_MIN_DOCS'] = int(os.environ.get('TFIDF_MIN_DOCS', 20))
+app.config['TFIDF_SAVE_EVERY'] = int(os.environ.get('TFIDF_SAVE_EVERY', 50))
+
+# Candidate search over every CV seen (/api/candidates/search): document
+# vectors for the first stage, then the shortlist is fully re-scored
+app.config['VECTOR_INDEX_DIR'] = os.environ.get('VECTOR_INDEX_DIR', os.path.join('cache', 'vector_index'))
+app.config['VECTOR_INDEX_SAVE_EVERY'] = int(os.environ.get('VECTOR_INDEX_SAVE_EVERY', 50))
+app.config['VECTOR_ANN_MIN_ITEMS'] = int(os.environ.get('VECTOR_ANN_MIN_ITEMS', 200000))
+app.config['SEARCH_SHORTLIST'] = int(os.environ.get('SEARCH_SHORTLIST', 100))
+app.config['SEARCH_MAX_K'] = 100
+
+# Open requisitions for reverse matching (/api/jds, /api/match/reverse)
+app.config['JD_DB_PATH'] = os.environ.get('JD_DB_PATH', os.path.join('db', 'job_descriptions.sqlite3'))
+
+# Worker processes for CV parsing + scoring (0 = score in the web process)
+app.config['SCORING_PROCESSES'] = int(os.environ.get('SCORING_PROCESSES', 0))
+
+# Background batch jobs (/api/jobs); their progress and results are kept in
+# JOB_DB_PATH so any web worker can answer status and stream requests
+app.config['JOB_DB_PATH'] = os.environ.get('JOB_DB_PATH', os.path.join('db', 'jobs.sqlite3'))
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+app.config['JOB_TTL_SECONDS'] = int(os.environ.get('JOB_TTL_SECONDS', 3600))
+
+# Bulk scoring (/api/match/bulk): CVs are profiled and scored in chunks of
+# BULK_CHUNK_SIZE and streamed back; NDJSON bodies are spooled to disk past BULK_SPOOL_MB
+app.config['BULK_CHUNK_SIZE'] = int(os.environ.get('BULK_CHUNK_SIZE', 16))
+app.config['BULK_MAX_CONTENT_MB'] = int(os.environ.get('BULK_MAX_CONTENT_MB', 512))
+app.config['BULK_SPOOL_MB'] = int(os.environ.get('BULK_SPOOL_MB', 32))
+
+# Keep a copy of each uploaded CV in UPLOAD_FOLDER for the download links
+# (written in the background; uploads are always parsed from memory)
+app.config['PERSIST_UPLOADS'] = os.environ.get('PERSIST_UPLOADS', '1') == '1'
+
+# Opt-in cProfile capture of single requests: send the token in an
+# X-Profile-Token header or a ?profile= query parameter (empty = disabled)
+app.config['PROFILE_TOKEN'] = os.environ.get('PROFILE_TOKEN', '')
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', 'profiles')
+app.config['PROFILE_KEEP'] = int(os.environ.get('PROFILE_KEEP', 50))
+
+# Token for the endpoints that change scoring for everyone (weights, skill
+# taxonomy), sent in an X-Admin-Token header (empty = those endpoints are disabled)
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN', '')
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+candidate_store = CandidateStore(app.config['CANDIDATE_DB_PATH'])
+
+feature_cache = FeatureCache(
+    app.config['FEATURE_CACHE_PATH'],
+    max_entries=app.config['FEATURE_CACHE_MAX_ENTRIES'],
+    max_bytes=app.config['FEATURE_CACHE_MAX_MB'] * 1024 * 1024
+)
+
+tfidf_index = TfidfIndex(
+    app.config['TFIDF_INDEX_DIR'],
+    refresh_every=app.config['TFIDF_REFRESH_EVERY'],
+    min_docs=app.config['TFIDF_MIN_DOCS'],
+    save_every=app.config['TFIDF_SAVE_EVERY']
+)
+
+vector_index = VectorIndex(
+    app.config['VECTOR_INDEX_DIR'],
+    save_every=app.config['VECTOR_INDEX_SAVE_EVERY'],
+    ann_min_items=app.config['VECTOR_ANN_MIN_ITEMS']
+)
+
+jd_registry = JDRegistry(app.config['JD_DB_PATH'], tfidf_index=tfidf_index,
+                         batch_size=app.config['NLP_BATCH_SIZE'])
+
+parallel_scorer = None
+if app.config['SCORING_PROCESSES'] > 0:
+    parallel_scorer = ParallelScorer(max_workers=app.config['SCORING_PROCESSES'], cache=feature_cache)
+
+upload_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-writer")
+
+request_profiler = RequestProfiler(app.config['PROFILE_DIR'], keep=app.config['PROFILE_KEEP'])
+
+job_manager = JobManager(app.config['JOB_DB_PATH'], max_workers=app.config['JOB_WORKERS'],
+                         ttl=app.config['JOB_TTL_SECONDS'])
+
+_prewarm_started = threading.Event()
+
+@app.before_request
+def prewarm_nlp():
+    # After the fork, so every gunicorn worker warms up its own model
+    if app.config['SPACY_PREWARM'] and not _prewarm_started.is_set():
+        _prewarm_started.set()
+        warm_up_nlp()
+
+@app.before_request
+def start_profile():
+    token = app.config['PROFILE_TOKEN']
+    if not token:
+        return
+    given = request.headers.get('X-Profile-Token') or request.args.get('profile')
+    if given and hmac.compare_digest(given, token):
+        g.profile = request_profiler.start()
+        g.profile_busy = g.profile is None
+
+@app.after_request
+def finish_profile(response):
+    capture = g.pop('profile', None)
+    if capture is not None:
+        label = f"{request.method} {request.path}"
+        response.headers['X-Profile-Id'] = capture.id
+        if response.is_streamed:
+            # The body is generated after this hook; stop once the server has sent all of it
+            response.call_on_close(lambda: request_profiler.finish(capture, f"{label} (streamed)"))
+        else:
+            request_profiler.finish(capture, label)
+    elif g.pop('profile_busy', False):
+        response.headers['X-Profile-Id'] = 'busy'
+    return response
+
+@app.teardown_request
+def stop_profile(exc):
+    # The request failed before after_request: keep the capture anyway
+    capture = g.pop('profile', None)
+    if capture is not None:
+        request_profiler.finish(capture, f"{request.method} {request.path} (error)")
+
+def admin_required(view):
+    """Refuse the request unless it carries ADMIN_TOKEN in an X-Admin-Token header."""
+    @functools.wraps(view)
+    def guarded(*args, **kwargs):
+        token = app.config['ADMIN_TOKEN']
+        if not token:
+            return jsonify({"error": "Admin endpoints are disabled (set ADMIN_TOKEN)"}), 403
+        given = request.headers.get('X-Admin-Token')
+        if not given or not hmac.compare_digest(given, token):
+            return jsonify({"error": "Admin token required"}), 401
+        return view(*args, **kwargs)
+    return guarded
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
-def process_match(cv_file, jd_text_input=None, jd_file=None, cv_filename_override=None):
-    """Process a single CV against a JD (either text or file)."""
-    cv_filename = cv_filename_override or secure_filename(cv_file.filename)
-    cv_path = os.path.join(app.config['UPLOAD_FOLDER'], cv_filename)
-    cv_file.save(cv_path)
+def load_job_profile(jd_text_input=None, jd_file=None):
+    """Read and validate the JD once. Returns (JobProfile, error)."""
+    # Get JD text (either from text input or file, parsed in memory)
+    if jd_text_input:
+        jd_text = jd_text_input
+    elif jd_file:
+        jd_text = read_bytes(jd_file.read(), secure_filename(jd_file.filename))
+    else:
+        return None, "No job description provided"
+    
+    # Validate JD
+    is_valid_jd, jd_conf, jd_reason = validate_jd(jd_text)
+    if not is_valid_jd:
+        return None, f"Invalid Job Description: {jd_reason}"
     
-    jd_path = None
+    with metrics.timer("job_profile"):
+        job_profile = JobProfile(jd_text, tfidf_index=tfidf_index, weight_profile=jd_registry.weight_profile())
+    return job_profile, None
+
+def write_upload(data, cv_path):
+    tmp_path = cv_path + '.part'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, cv_path)
+
+def persist_upload(data, cv_filename):
+    """
+    Queue a copy of the CV for the download links, off the request path.
+    Returns the internal filename, or None when PERSIST_UPLOADS is off.
+    """
+    if not app.config['PERSIST_UPLOADS']:
+        return None
+    upload_writer.submit(write_upload, data, os.path.join(app.config['UPLOAD_FOLDER'], cv_filename))
+    return cv_filename
+
+def read_upload(cv_file, cv_filename_override=None):
+    """Read an uploaded CV into memory. Returns (data, cv_filename, cv_internal_filename)."""
+    cv_filename = cv_filename_override or secure_filename(cv_file.filename)
+    cv_file.seek(0)
+    data = cv_file.read()
+    return data, cv_filename, persist_upload(data, cv_filename)
+
+def read_cv(data, cv_filename, cache_key):
+    """
+    Parse and validate CV bytes. Returns (cv, error) where `cv` is a cached
+    CVProfile when these exact bytes were seen before, otherwise the text.
+    """
+    # Read CV, skipping the parser when the features are cached
+    cached = None
     try:
-        # Read CV
-        cv_text = read_file(cv_path)
-        
-        # Validate CV
-        is_valid_cv, cv_conf, cv_reason = validate_cv(cv_text)
-        if not is_valid_cv:
-            return {"error": f"Invalid CV: {cv_reason}"}
-        
-        # Get JD text (either from text input or file)
-        if jd_text_input:
-            jd_text = jd_text_input
-        elif jd_file:
-            jd_filename = secure_filename(jd_file.filename)
-            jd_path = os.path.join(app.config['UPLOAD_FOLDER'], jd_filename)
-            jd_file.save(jd_path)
-            jd_text = read_file(jd_path)
-        else:
-            return {"error": "No job description provided"}
-        
-        # Validate JD
-        is_valid_jd, jd_conf, jd_reason = validate_jd(jd_text)
-        if not is_valid_jd:
-            return {"error": f"Invalid Job Description: {jd_reason}"}
+        cached = feature_cache.get(cache_key)
+    except sqlite3.Error as e:
+        print(f"Feature cache unavailable: {e}")
+    cv = CVProfile.from_dict(cached) if cached else read_bytes(data, cv_filename)
+    cv_text = cv.text if cached else cv
+    
+    # Validate CV
+    is_valid_cv, cv_conf, cv_reason = validate_cv(cv_text)
+    if not is_valid_cv:
+        return None, f"Invalid CV: {cv_reason}"
+    return cv, None
+
+def load_cv(cv_file, cv_filename_override=None):
+    """Read and validate an uploaded CV. Returns (cv, cv_internal_filename, cache_key, error)."""
+    data, cv_filename, cv_internal_filename = read_upload(cv_file, cv_filename_override)
+    cache_key = content_hash(data)
+    cv, error = read_cv(data, cv_filename, cache_key)
+    return cv, cv_internal_filename, cache_key, error
+
+def get_cv_profiles(cvs, cache_keys):
+    """Build CVProfiles for uncached CVs (batched spaCy) and cache them."""
+    profiles = build_cv_profiles(
+        cvs,
+        batch_size=app.config['NLP_BATCH_SIZE'],
+        n_process=app.config['NLP_N_PROCESS']
+    )
+    for cv, cache_key, profile in zip(cvs, cache_keys, profiles):
+        if isinstance(cv, CVProfile):
+            continue
+        try:
+            feature_cache.put(cache_key, profile.to_dict())
+        except sqlite3.Error as e:
+            print(f"Feature cache unavailable: {e}")
+    index_cvs(profiles, cache_keys)
+    return profiles
+
+def index_cvs(profiles, cache_keys):
+    """Add CVs to the corpus TF-IDF and vector indexes (already indexed ones are skipped)."""
+    tfidf_index.add((cache_key, Counter(tfidf_analyzer(profile.text)))
+                    for profile, cache_key in zip(profiles, cache_keys))
+    vector_index.add((cache_key, profile.vector)
+                     for profile, cache_key in zip(profiles, cache_keys))
+
+@timed("process_match")
+def process_match(cv_file, job_profile, cv_filename_override=None):
+    """Process a single CV against a pre-built JobProfile."""
+    cv, cv_filename, cache_key, error = load_cv(cv_file, cv_filename_override)
+    if error:
+        return {"error": error}
+    
+    # Calculate match
+    cv_profile = get_cv_profiles([cv], [cache_key])[0]
+    results = calculate_cv_jd_match(cv_profile, job_profile)
+    results['cv_filename'] = cv_file.filename
+    results['cv_internal_filename'] = cv_filename
+    results['cv_hash'] = cache_key
+    return results
+
+@timed("process_batch")
+def process_batch(cv_files, job_profile):
+    """
+    Process several CVs against one JobProfile, batching the spaCy work.
+    Returns MatchResults in upload order (rendered by the caller).
+    """
+    if parallel_scorer:
+        return process_batch_parallel(cv_files, job_profile)
+    
+    cvs = []
+    cv_filenames = []
+    cache_keys = []
+    for idx, cv_file in enumerate(cv_files):
+        print(f"DEBUG: Reading CV {idx+1}/{len(cv_files)}: {cv_file.filename}")
+        cv, cv_filename, cache_key, error = load_cv(
+            cv_file, cv_filename_override=f"cv_{idx}_{secure_filename(cv_file.filename)}")
+        if error:
+            return {"error": error}
+        cvs.append(cv)
+        cv_filenames.append(cv_filename)
+        cache_keys.append(cache_key)
+    
+    all_results = calculate_batch_match(get_cv_profiles(cvs, cache_keys), job_profile, render=False)
+    for cv_file, cv_filename, cache_key, result in zip(cv_files, cv_filenames, cache_keys, all_results):
+        result.info = {"cv_filename": cv_file.filename, "cv_internal_filename": cv_filename, "cv_hash": cache_key}
+    return all_results
+
+def process_batch_parallel(cv_files, job_profile):
+    """Process several CVs on the worker process pool; results keep upload order."""
+    uploads = []
+    cv_filenames = []
+    for idx, cv_file in enumerate(cv_files):
+        data, cv_filename, cv_internal_filename = read_upload(
+            cv_file, cv_filename_override=f"cv_{idx}_{secure_filename(cv_file.filename)}")
+        uploads.append((data, cv_filename))
+        cv_filenames.append(cv_internal_filename)
+    
+    outcomes = parallel_scorer.profile_files(uploads)
+    for _, _, error in outcomes:
+        if error:
+            return {"error": error}
+    profiles = [profile for profile, _, _ in outcomes]
+    cache_keys = [cache_key for _, cache_key, _ in outcomes]
+    index_cvs(profiles, cache_keys)
+    
+    all_results = calculate_batch_match(profiles, job_profile, render=False)
+    for cv_file, cv_filename, cache_key, result in zip(cv_files, cv_filenames, cache_keys, all_results):
+        result.info = {"cv_filename": cv_file.filename, "cv_internal_filename": cv_filename, "cv_hash": cache_key}
+    return all_results
+
+@timed("score_uploaded_cv")
+def score_uploaded_cv(data, job_profile, cv_filename, cv_internal_filename, jd_id=None):
+    """Background task for /api/jobs: score one CV from the bytes read during the request."""
+    upload_name = secure_filename(cv_filename)
+    if parallel_scorer:
+        cv_profile, cache_key, error = parallel_scorer.submit(data, upload_name).result()
+    else:
+        cv_profile, cache_key, error = load_cv_profile(data, upload_name, feature_cache)
+    if error:
+        return {"error": error}
+    index_cvs([cv_profile], [cache_key])
+    # Kept compact in the job and the store; rendered when sent
+    result = compute_match(cv_profile, job_profile)
+    result.info = {"cv_filename": cv_filename, "cv_internal_filename": cv_internal_filename,
+                   "cv_hash": cache_key, "jd_id": jd_id}
+    log_candidate(result)
+    return result
+
+def profile_cvs(files):
+    """
+    (cv_profile, cache_key, error) for each (bytes, filename) pair, in input
+    order: parsed, validated and profiled on the worker pool when enabled,
+    otherwise here with batched spaCy. Valid CVs are cached and indexed.
+    """
+    if parallel_scorer:
+        outcomes = parallel_scorer.profile_files(files)
+        valid = [(profile, cache_key) for profile, cache_key, error in outcomes if not error]
+        index_cvs([profile for profile, _ in valid], [cache_key for _, cache_key in valid])
+        return outcomes
+    
+    loaded = []
+    for data, filename in files:
+        cache_key = content_hash(data)
+        cv, error = read_cv(data, filename, cache_key)
+        loaded.append((cv, cache_key, error))
+    valid = [(cv, cache_key) for cv, cache_key, error in loaded if not error]
+    profiles = iter(get_cv_profiles([cv for cv, _ in valid], [cache_key for _, cache_key in valid]))
+    return [(None, cache_key, error) if error else (next(profiles), cache_key, None)
+            for _, cache_key, error in loaded]
+
+def decode_bulk_document(item, default_name):
+    """
+    Bytes of one bulk item, {"text": ...} or {"file": <base64>, "filename": ...}.
+    Returns (data, filename, error).
+    """
+    if not isinstance(item, dict):
+        return None, None, "Expected a JSON object"
+    if isinstance(item.get('text'), str):
+        return item['text'].encode('utf-8'), f"{default_name}.txt", None
+    if isinstance(item.get('file'), str):
+        filename = secure_filename(str(item.get('filename') or ''))
+        if not allowed_file(filename):
+            return None, None, "'filename' with a .txt, .pdf or .docx extension is required for files"
+        try:
+            return base64.b64decode(item['file'], validate=True), filename, None
+        except (binascii.Error, ValueError):
+            return None, None, "'file' is not valid base64"
+    return None, None, "Provide 'text' or a base64 'file'"
+
+def score_bulk(job_profile, items, jd_id=None, store=False):
+    """
+    Score bulk CV items against one JD, `BULK_CHUNK_SIZE` at a time, yielding
+    one line per CV (in input order) as soon as its chunk is done, then a
+    summary line. Only one chunk is held in memory.
+    """
+    start = time.perf_counter()
+    total = failed = 0
+    numbered = enumerate(items)
+    while True:
+        chunk = list(itertools.islice(numbered, app.config['BULK_CHUNK_SIZE']))
+        if not chunk:
+            break
+        lines, files = [], []
+        for index, item in chunk:
+            item_id = item.get('id', index) if isinstance(item, dict) else index
+            data, filename, error = decode_bulk_document(item, f"cv_{index}")
+            lines.append({"index": index, "id": item_id, "error": error})
+            if not error:
+                files.append((data, filename))
         
-        # Calculate match
-        results = calculate_cv_jd_match(cv_text, jd_text)
-        results['cv_filename'] = cv_file.filename
-        results['cv_internal_filename'] = cv_filename
-        return results
+        outcomes = iter(profile_cvs(files))
+        profiles, scored_lines = [], []
+        for line in lines:
+            if line['error']:
+                continue
+            profile, cache_key, error = next(outcomes)
+            line['error'] = error
+            line['cv_hash'] = cache_key
+            if not error:
+                profiles.append(profile)
+                scored_lines.append(line)
+        for line, result in zip(scored_lines, calculate_batch_match(profiles, job_profile, render=False)):
+            line['result'] = result
         
-    finally:
-        # Clean up files
+        for line in lines:
+            total += 1
+            if line['error']:
+                failed += 1
+                yield {"index": line['index'], "id": line['id'], "error": line['error']}
+                continue
+            del line['error']
+            result = line.pop('result')
+            if store:
+                result.info = {"cv_filename": str(line['id']), "cv_hash": line['cv_hash'], "jd_id": jd_id}
+                log_candidate(result)
+            line.update(result.to_dict())
+            yield line
+    yield {"status": "done", "total": total, "completed": total - failed, "failed": failed,
+           "took_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+def search_candidates(job_profile, k=10, shortlist_size=None):
+    """
+    Top-k stored candidates for a JD out of every CV seen so far. The
+    nearest neighbours in the vector and corpus TF-IDF indexes form a
+    shortlist; only the shortlist is scored with calculate_cv_jd_match.
+    Shortlisted CVs whose features were evicted from the feature cache can't
+    be rescored: they fill any remaining places, in retrieval order, with
+    the scores stored for them ("rescored": false), and are counted in
+    stats["skipped"]. Returns (results, stats).
+    """
+    shortlist_size = max(shortlist_size or app.config['SEARCH_SHORTLIST'], k)
+    
+    # First stage: semantic and TF-IDF neighbours, blended 30:20 like the final score
+    has_vector = job_profile.vector is not None
+    semantic = dict(vector_index.search(job_profile.vector, shortlist_size)) if has_vector else {}
+    lexical = dict(tfidf_index.search(job_profile.tfidf_counts, shortlist_size))
+    keys = list(semantic.keys() | lexical.keys())
+    if has_vector:
+        missing = [key for key in keys if key not in semantic and key in vector_index]
+        semantic.update(zip(missing, vector_index.scores(job_profile.vector, missing).tolist()))
+    missing = [key for key in keys if key not in lexical and key in tfidf_index.rows]
+    lexical.update(zip(missing, tfidf_index.score(job_profile.tfidf_counts, missing).tolist()))
+    semantic_weight = 0.6 if has_vector else 0.0
+    retrieval = {key: semantic_weight * semantic.get(key, 0.0) + (1 - semantic_weight) * lexical.get(key, 0.0)
+                 for key in keys}
+    
+    # Deleted candidates drop out here
+    stored = candidate_store.by_hashes(keys, components=True)
+    shortlist = sorted((key for key in keys if key in stored), key=retrieval.get, reverse=True)[:shortlist_size]
+    
+    # Second stage: full scoring from cached CV features
+    profiles, scored_keys, evicted = [], [], []
+    for key in shortlist:
         try:
-            # We keep the CV for downloading in the results page
-            # if os.path.exists(cv_path): os.remove(cv_path) 
-            if jd_path and os.path.exists(jd_path): os.remove(jd_path)
-        except:
-            pass
+            cached = feature_cache.get(key)
+        except sqlite3.Error as e:
+            print(f"Feature cache unavailable: {e}")
+            cached = None
+        if cached:
+            profiles.append(CVProfile.from_dict(cached))
+            scored_keys.append(key)
+        else:
+            evicted.append(key)
+    
+    all_results = calculate_batch_match(profiles, job_profile, render=False)
+    for key, result in zip(scored_keys, all_results):
+        candidate = stored[key]
+        result.info = {"candidate_id": candidate['id'], "cv_filename": candidate['filename'],
+                       "cv_internal_filename": candidate['internal_filename'], "cv_hash": key,
+                       "retrieval_score": round(retrieval[key] * 100, 2), "rescored": True}
+    all_results.sort(key=lambda x: x.match_percentage, reverse=True)
+    stats = {"indexed": len(tfidf_index), "shortlisted": len(shortlist), "scored": len(all_results),
+             "skipped": len(evicted)}
+    # Only the top k are rendered
+    results = [result.to_dict() for result in all_results[:k]]
+    for key in evicted[:k - len(results)]:
+        candidate = stored[key]
+        results.append({"candidate_id": candidate['id'], "candidate_name": candidate['name'],
+                        "cv_filename": candidate['filename'], "cv_internal_filename": candidate['internal_filename'],
+                        "cv_hash": key, "retrieval_score": round(retrieval[key] * 100, 2), "rescored": False,
+                        "stored_score": candidate['score'], "stored_jd_id": candidate['jd_id'],
+                        "component_scores": candidate['component_scores']})
+    return results, stats
+
+def log_candidate(res):
+    """Log a result to the Admin Dashboard."""
+    return candidate_store.add(res)
+
+def rescore_candidates(jd_id=None):
+    """
+    Re-weight the stored component scores of a requisition's candidates (or,
+    without `jd_id`, of every candidate not under a requisition profile) with
+    the weight profile now in effect. One query, one vectorized pass, one
+    batched update. Returns the number of candidates rescored.
+    """
+    if jd_id is None:
+        ids, components = candidate_store.components(exclude_jd_ids=jd_registry.weighted_jd_ids())
+    else:
+        ids, components = candidate_store.components(jd_id=jd_id)
+    weights, low_semantic_weights = resolve_weights(jd_registry.weight_profile(jd_id))
+    final = weighted_scores(*(components[name] for name in COMPONENTS), weights=weights,
+                            low_semantic_weights=low_semantic_weights)
+    # Same rounding as calculate_cv_jd_match's match_percentage
+    return candidate_store.update_scores(ids, [round(score * 100, 2) for score in final.tolist()])
 
 @app.route('/', methods=['GET', 'POST'])
 def upload_file():
@@ -119,49 +598,32 @@ def upload_file():
             return render_template('upload.html', error='Invalid JD file type. Allowed: .txt, .pdf, .docx')
         
         try:
+            # Read, validate and analyze the JD once for the whole batch
+            job_profile, jd_error = load_job_profile(
+                jd_text_input=jd_text_input if jd_text_input else None,
+                jd_file=jd_file if jd_file_provided and not jd_text_input else None
+            )
+            if jd_error:
+                return render_template('upload.html', error=jd_error)
+            
             print(f"DEBUG: Processing {len(cv_files)} CV(s)...")
             
             # Process all CVs
-            all_results = []
-            for idx, cv_file in enumerate(cv_files):
-                print(f"DEBUG: Processing CV {idx+1}/{len(cv_files)}: {cv_file.filename}")
-                
-                # Reset file pointers
-                cv_file.seek(0)
-                if jd_file_provided and not jd_text_input:
-                    jd_file.seek(0)  # Reset JD file pointer for each CV
-                
-                # Process match
-                result = process_match(
-                    cv_file, 
-                    jd_text_input=jd_text_input if jd_text_input else None,
-                    jd_file=jd_file if jd_file_provided and not jd_text_input else None,
-                    cv_filename_override=f"cv_{idx}_{secure_filename(cv_file.filename)}"
-                )
-                
-                # Check for errors
-                if isinstance(result, dict) and "error" in result:
-                    return render_template('upload.html', error=result["error"])
-                
-                all_results.append(result)
+            all_results = process_batch(cv_files, job_profile)
+            
+            # Check for errors
+            if isinstance(all_results, dict) and "error" in all_results:
+                return render_template('upload.html', error=all_results["error"])
             
             print(f"DEBUG: Processed {len(all_results)} CVs successfully")
             
             # Log to Admin Dashboard
             for res in all_results:
-                cand_id = len(processed_candidates)
-                processed_candidates.insert(0, {
-                    "id": cand_id,
-                    "name": res.get('candidate_name', 'Unknown'),
-                    "filename": res.get('cv_filename', 'Unknown'),
-                    "internal_filename": res.get('cv_internal_filename', 'Unknown'),
-                    "score": res.get('match_percentage', 0),
-                    "exp": res.get('experience_level', {}).get('cv', 'N/A'),
-                    "full_results": res  # Store full results for the view details button
-                })
+                log_candidate(res)
             
             # Sort by match percentage (highest first)
-            all_results.sort(key=lambda x: x.get('match_percentage', 0), reverse=True)
+            all_results.sort(key=lambda x: x.match_percentage, reverse=True)
+            all_results = [result.to_dict() for result in all_results]
             
             # If single CV, show single result page
             if len(all_results) == 1:
@@ -184,26 +646,72 @@ def about():
 
 @app.route('/admin')
 def admin():
-    return render_template('admin.html', candidates=processed_candidates)
+    """Dashboard page; add ?format=json for the same page as JSON."""
+    filters = {
+        "sort": request.args.get('sort', 'date'),
+        "order": request.args.get('order', 'desc'),
+        "exp": request.args.get('exp') or None,
+        "min_score": request.args.get('min_score', type=float),
+        "max_score": request.args.get('max_score', type=float),
+        "jd_id": request.args.get('jd_id', type=int),
+    }
+    per_page = min(request.args.get('per_page', app.config['ADMIN_PAGE_SIZE'], type=int),
+                   app.config['ADMIN_MAX_PAGE_SIZE'])
+    try:
+        candidates, next_cursor, prev_cursor = candidate_store.page(
+            after=request.args.get('after'),
+            before=request.args.get('before'),
+            limit=max(per_page, 1),
+            **filters
+        )
+    except (ValueError, TypeError):
+        return "Invalid page cursor", 400
+    total = candidate_store.count()
+    # Filtered views count their own matches; `total` stays the whole store
+    matching = candidate_store.count(**{key: filters[key] for key in ("exp", "min_score", "max_score", "jd_id")})
+    
+    if request.args.get('format') == 'json':
+        return jsonify({
+            "candidates": candidates,
+            "total": total,
+            "matching": matching,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "filters": filters,
+        })
+    profiles = request_profiler.recent(5) if app.config['PROFILE_TOKEN'] else []
+    return render_template('admin.html', candidates=candidates, total=total, matching=matching, filters=filters,
+                           per_page=per_page, next_cursor=next_cursor, prev_cursor=prev_cursor,
+                           profiles=profiles)
 
 @app.route('/admin/analysis/<int:cand_id>')
 def view_analysis(cand_id):
-    # Find candidate by ID
-    candidate = next((c for c in processed_candidates if c['id'] == cand_id), None)
+    candidate = candidate_store.get(cand_id)
     if not candidate:
         return "Candidate not found", 404
     return render_template('results.html', results=candidate['full_results'])
 
 @app.route('/admin/delete/<int:cand_id>', methods=['POST'])
 def delete_candidate(cand_id):
-    global processed_candidates
-    processed_candidates = [c for c in processed_candidates if c['id'] != cand_id]
+    candidate_store.delete(cand_id)
     return redirect(url_for('admin'))
 
+@app.route('/admin/profiles/<profile_id>.prof')
+def download_profile(profile_id):
+    return send_from_directory(os.path.abspath(app.config['PROFILE_DIR']), f"{secure_filename(profile_id)}.prof",
+                               as_attachment=True)
+
 @app.route('/download/<path:filename>')
 def download_cv_file(filename):
     return send_from_directory(app.config['UPLOAD_FOLDER'], filename, as_attachment=True)
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Stage timings and document counters in the Prometheus text format."""
+    if not metrics.ENABLED:
+        return "Metrics are disabled (METRICS_ENABLED=0)", 404
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/match', methods=['POST'])
 def api_match():
     if 'cv' not in request.files or 'jd' not in request.files:
@@ -217,7 +725,10 @@ def api_match():
         
     if cv and allowed_file(cv.filename) and jd and allowed_file(jd.filename):
         try:
-            results = process_match(cv, jd)
+            job_profile, jd_error = load_job_profile(jd_file=jd)
+            if jd_error:
+                return jsonify({"error": jd_error}), 400
+            results = process_match(cv, job_profile)
             if "error" in results:
                 return jsonify(results), 400
             return jsonify(results)
@@ -226,6 +737,310 @@ def api_match():
     else:
         return jsonify({"error": "Invalid file type"}), 400
 
+@app.route('/api/match/bulk', methods=['POST'])
+def api_match_bulk():
+    """
+    Score one JD against many CVs and stream the results back as NDJSON.
+    
+    JSON body: {"jd": {...} or "jd_id": N, "store": false, "cvs": [{...}, ...]}
+    NDJSON body (application/x-ndjson): the same header object without "cvs"
+    on the first line, then one CV per line. Documents are {"text": "..."} or
+    {"file": "<base64>", "filename": "cv.pdf"}; CVs may carry an "id" that is
+    echoed back. With "store": true the results go to the Admin Dashboard.
+    """
+    try:
+        # Per-request limit (Flask >= 3.1); older versions keep MAX_CONTENT_LENGTH
+        request.max_content_length = app.config['BULK_MAX_CONTENT_MB'] * 1024 * 1024
+    except AttributeError:
+        pass
+    
+    spool = None
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        # Spooled first, so the whole body is received before the response starts
+        spool = tempfile.SpooledTemporaryFile(max_size=app.config['BULK_SPOOL_MB'] * 1024 * 1024)
+        shutil.copyfileobj(request.stream, spool)
+        spool.seek(0)
+        lines = (line for line in spool if line.strip())
+        try:
+            header = json.loads(next(lines, b'{}'))
+        except ValueError:
+            spool.close()
+            return jsonify({"error": "The first line must be a JSON object"}), 400
+        items = (parse_ndjson_line(line) for line in lines)
+    else:
+        header = request.get_json(silent=True)
+        items = header.get('cvs') if isinstance(header, dict) else None
+        if not isinstance(items, list):
+            return jsonify({"error": "Expected a JSON object with a 'cvs' list"}), 400
+    
+    error = None
+    if not isinstance(header, dict):
+        error = "The first line must be a JSON object"
+    elif header.get('jd_id') is not None:
+        jd_id = header['jd_id']
+        job_profile = jd_registry.profile(jd_id) if isinstance(jd_id, int) else None
+        if job_profile is None:
+            error = "JD not found"
+    else:
+        jd_id = None
+        data, filename, error = decode_bulk_document(header.get('jd'), "jd")
+        if not error:
+            job_profile, error = load_job_profile(jd_text_input=read_bytes(data, filename) or None)
+    if error:
+        if spool is not None:
+            spool.close()
+        return jsonify({"error": error}), 400
+    
+    def generate():
+        try:
+            for line in score_bulk(job_profile, items, jd_id=jd_id, store=bool(header.get('store'))):
+                yield json.dumps(line) + "\n"
+        finally:
+            if spool is not None:
+                spool.close()
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def parse_ndjson_line(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+@app.route('/api/jds', methods=['GET', 'POST'])
+def api_jds():
+    """List open requisitions, or register one ('jd' file or 'jd_text', optional 'title')."""
+    if request.method == 'GET':
+        return jsonify({"jds": jd_registry.list_open()})
+    
+    jd_text_input = request.form.get('jd_text', '').strip()
+    jd_file = request.files.get('jd')
+    jd_file_provided = jd_file and jd_file.filename != ''
+    if not jd_text_input and not jd_file_provided:
+        return jsonify({"error": "Provide a 'jd' file or 'jd_text'"}), 400
+    if jd_file_provided and not jd_text_input and not allowed_file(jd_file.filename):
+        return jsonify({"error": "Invalid JD file type"}), 400
+    
+    job_profile, jd_error = load_job_profile(
+        jd_text_input=jd_text_input if jd_text_input else None,
+        jd_file=jd_file if jd_file_provided and not jd_text_input else None
+    )
+    if jd_error:
+        return jsonify({"error": jd_error}), 400
+    title = request.form.get('title', '').strip() or (jd_file.filename if jd_file_provided else 'Untitled')
+    jd_id = jd_registry.add(title, job_profile.text)
+    return jsonify({"id": jd_id, "title": title}), 201
+
+@app.route('/api/jds/<int:jd_id>', methods=['DELETE'])
+def api_close_jd(jd_id):
+    if not jd_registry.close(jd_id):
+        return jsonify({"error": "JD not found"}), 404
+    return jsonify({"id": jd_id, "status": "closed"})
+
+@app.route('/api/weights')
+def api_weights():
+    """The default weights, the global profile and per-requisition profiles."""
+    weights, low_semantic_weights = resolve_weights()
+    return jsonify(dict(defaults={"weights": weights, "low_semantic_weights": low_semantic_weights},
+                        **jd_registry.weight_profiles()))
+
+@app.route('/api/weights', methods=['PUT'])
+@admin_required
+def api_set_weights():
+    """
+    Set the global profile (JSON {"weights": {...}, "low_semantic_weights": {...}})
+    and queue the rescore of every stored candidate it applies to.
+    """
+    return update_weights(None)
+
+@app.route('/api/jds/<int:jd_id>/weights', methods=['PUT', 'DELETE'])
+@admin_required
+def api_jd_weights(jd_id):
+    """Set (PUT) or drop (DELETE) a requisition's own weight profile and queue the rescore of its candidates."""
+    if not jd_registry.get(jd_id):
+        return jsonify({"error": "JD not found"}), 404
+    if request.method == 'DELETE':
+        jd_registry.clear_weight_profile(jd_id)
+        return queue_rescore(jd_id, jd_registry.weight_profile(jd_id))
+    return update_weights(jd_id)
+
+def update_weights(jd_id):
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    try:
+        profile = jd_registry.set_weight_profile(data, jd_id=jd_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return queue_rescore(jd_id, profile)
+
+def queue_rescore(jd_id, profile):
+    """Rescore in the job pool; the job's single result carries the count and timing."""
+    def rescore():
+        start = time.perf_counter()
+        rescored = rescore_candidates(jd_id)
+        return {"jd_id": jd_id, "rescored": rescored, "took_ms": round((time.perf_counter() - start) * 1000, 2)}
+    job = job_manager.submit([("rescore", rescore)])
+    return jsonify({
+        "jd_id": jd_id,
+        "profile": profile,
+        "job_id": job.id,
+        "status_url": url_for('api_get_job', job_id=job.id)
+    }), 202
+
+@app.route('/api/taxonomy')
+def api_taxonomy():
+    """Version and size of the loaded skill taxonomy."""
+    return jsonify(SKILL_TAXONOMIES.status())
+
+@app.route('/api/taxonomy', methods=['PUT'])
+@admin_required
+def api_replace_taxonomy():
+    """
+    Replace the taxonomy file with the JSON body ({"version", "categories",
+    "aliases"}) and load it. Scoring processes pick up the file on their next
+    check (SKILL_TAXONOMY_CHECK_SECONDS).
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    try:
+        SKILL_TAXONOMIES.replace(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except OSError as e:
+        return jsonify({"error": f"Could not write the taxonomy file: {e}"}), 500
+    return jsonify(SKILL_TAXONOMIES.status())
+
+@app.route('/api/taxonomy/reload', methods=['POST'])
+@admin_required
+def api_taxonomy_reload():
+    """Re-read the taxonomy file now, e.g. after editing it on disk."""
+    try:
+        SKILL_TAXONOMIES.reload()
+    except (OSError, ValueError) as e:
+        return jsonify(dict(SKILL_TAXONOMIES.status(), error=str(e))), 400
+    return jsonify(SKILL_TAXONOMIES.status())
+
+@app.route('/api/match/reverse', methods=['POST'])
+def api_match_reverse():
+    """Rank every open requisition for one CV; `top` limits the list."""
+    cv_file = request.files.get('cv')
+    if not cv_file or cv_file.filename == '':
+        return jsonify({"error": "No CV file"}), 400
+    if not allowed_file(cv_file.filename):
+        return jsonify({"error": "Invalid file type"}), 400
+    top = request.values.get('top', type=int)
+    
+    start = time.perf_counter()
+    cv, _, cache_key, error = load_cv(cv_file)
+    if error:
+        return jsonify({"error": error}), 400
+    cv_profile = get_cv_profiles([cv], [cache_key])[0]
+    results = jd_registry.match(cv_profile, top=top)
+    return jsonify({
+        "cv_filename": cv_file.filename,
+        "candidate_name": cv_profile.name,
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2)
+    })
+
+@app.route('/api/candidates/search', methods=['POST'])
+def api_search_candidates():
+    """Best past candidates for a JD ('jd' file or 'jd_text'); `k` results, ranked."""
+    jd_text_input = request.form.get('jd_text', '').strip()
+    jd_file = request.files.get('jd')
+    jd_file_provided = jd_file and jd_file.filename != ''
+    if not jd_text_input and not jd_file_provided:
+        return jsonify({"error": "Provide a 'jd' file or 'jd_text'"}), 400
+    if jd_file_provided and not jd_text_input and not allowed_file(jd_file.filename):
+        return jsonify({"error": "Invalid JD file type"}), 400
+    k = request.values.get('k', 10, type=int)
+    if k < 1 or k > app.config['SEARCH_MAX_K']:
+        return jsonify({"error": f"k must be between 1 and {app.config['SEARCH_MAX_K']}"}), 400
+    
+    start = time.perf_counter()
+    job_profile, jd_error = load_job_profile(
+        jd_text_input=jd_text_input if jd_text_input else None,
+        jd_file=jd_file if jd_file_provided and not jd_text_input else None
+    )
+    if jd_error:
+        return jsonify({"error": jd_error}), 400
+    results, stats = search_candidates(job_profile, k=k)
+    stats["took_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return jsonify(dict(results=results, **stats))
+
+@app.route('/api/jobs', methods=['POST'])
+def api_create_job():
+    """
+    Queue one JD + N CVs for background scoring and return the job ID right away.
+    The JD is a 'jd' file, 'jd_text', or the 'jd_id' of an open requisition;
+    candidates scored against a requisition use its weight profile.
+    """
+    jd_text_input = request.form.get('jd_text', '').strip()
+    jd_file = request.files.get('jd')
+    jd_file_provided = jd_file and jd_file.filename != ''
+    jd_id = request.form.get('jd_id', type=int)
+    cv_files = [f for f in request.files.getlist('cv') if f.filename != '']
+    
+    if not cv_files or (not jd_text_input and not jd_file_provided and jd_id is None):
+        return jsonify({"error": "Provide 'cv' file(s) and a 'jd' file, 'jd_text' or 'jd_id'"}), 400
+    if jd_file_provided and not jd_text_input and not allowed_file(jd_file.filename):
+        return jsonify({"error": "Invalid JD file type"}), 400
+    for cv_file in cv_files:
+        if not allowed_file(cv_file.filename):
+            return jsonify({"error": f"Invalid CV file type: {cv_file.filename}"}), 400
+    
+    if jd_id is not None:
+        job_profile = jd_registry.profile(jd_id)
+        if job_profile is None:
+            return jsonify({"error": "JD not found"}), 404
+    else:
+        job_profile, jd_error = load_job_profile(
+            jd_text_input=jd_text_input if jd_text_input else None,
+            jd_file=jd_file if jd_file_provided and not jd_text_input else None
+        )
+        if jd_error:
+            return jsonify({"error": jd_error}), 400
+    
+    # Files must be read while the request is alive; parsing and scoring run in the pool
+    tasks = []
+    batch_tag = os.urandom(4).hex()
+    for idx, cv_file in enumerate(cv_files):
+        data, _, cv_internal_filename = read_upload(
+            cv_file, cv_filename_override=f"job_{batch_tag}_{idx}_{secure_filename(cv_file.filename)}")
+        task = functools.partial(score_uploaded_cv, data, job_profile, cv_file.filename, cv_internal_filename, jd_id)
+        if g.get('profile') is not None:
+            # Scoring runs after the request; profile each task on its worker thread
+            task = request_profiler.wrap(task, f"job {batch_tag}: {cv_file.filename}")
+        tasks.append((cv_file.filename, task))
+    
+    job = job_manager.submit(tasks)
+    return jsonify({
+        "id": job.id,
+        "status": job.status,
+        "total": job.total,
+        "status_url": url_for('api_get_job', job_id=job.id),
+        "stream_url": url_for('api_stream_job', job_id=job.id)
+    }), 202
+
+@app.route('/api/jobs/<job_id>')
+def api_get_job(job_id):
+    """Progress plus the results finished so far, ranked by match percentage."""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    top = request.args.get('top', type=int)
+    return jsonify(job.to_dict(top=top))
+
+@app.route('/api/jobs/<job_id>/stream')
+def api_stream_job(job_id):
+    """Stream results as NDJSON, one line per CV as it finishes."""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    lines = (json.dumps(outcome) + "\n" for outcome in job.stream())
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 5001))
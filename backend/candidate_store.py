@@ -0,0 +1,264 @@
+import base64
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from match import MatchResult
+
+# Columns returned for dashboard rows (everything except the full result blob)
+SUMMARY_COLUMNS = "id, name, filename, internal_filename, score, exp, created_at, cv_hash, jd_id"
+
+# Raw score components (match.calculate_cv_jd_match "component_scores") -> columns
+COMPONENT_COLUMNS = {"semantic": "semantic_score", "tfidf": "tfidf_score", "skills": "skills_score",
+                     "exp": "exp_score", "edu": "edu_score"}
+
+# Columns added after the first release, migrated into older databases
+ADDED_COLUMNS = [("cv_hash", "TEXT"), ("jd_id", "INTEGER")] + \
+    [(column, "REAL") for column in COMPONENT_COLUMNS.values()]
+
+# Dashboard sort keys -> indexed columns
+SORT_COLUMNS = {"score": "score", "date": "created_at", "name": "name"}
+
+
+def encode_cursor(value, cand_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, cand_id]).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    value, cand_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    return value, int(cand_id)
+
+
+class CandidateStore:
+    """
+    SQLite-backed store of processed candidates. Dashboard fields live in
+    indexed columns; the match result is kept as zlib-compressed JSON
+    (MatchResult.to_compact where available) and only loaded and rendered
+    when a single candidate is viewed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " name TEXT NOT NULL,"
+                " filename TEXT NOT NULL,"
+                " internal_filename TEXT NOT NULL,"
+                " score REAL NOT NULL,"
+                " exp TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " full_results BLOB NOT NULL)"
+            )
+            columns = [row["name"] for row in conn.execute("PRAGMA table_info(candidates)")]
+            for column, column_type in ADDED_COLUMNS:
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE candidates ADD COLUMN {column} {column_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_candidates_cv_hash ON candidates(cv_hash)")
+            # Per-requisition rankings and rescoring
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_candidates_jd_score ON candidates(jd_id, score)")
+            # Every index ends in the rowid, so (column, id) keyset pages are index range scans
+            for column in SORT_COLUMNS.values():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_candidates_{column} ON candidates({column})")
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_candidates_exp_{column} ON candidates(exp, {column})")
+            # Row count kept by triggers, so the dashboard total never scans the table
+            conn.execute("CREATE TABLE IF NOT EXISTS candidate_stats (total INTEGER NOT NULL)")
+            if conn.execute("SELECT COUNT(*) FROM candidate_stats").fetchone()[0] == 0:
+                conn.execute("INSERT INTO candidate_stats (total) SELECT COUNT(*) FROM candidates")
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS trg_candidates_insert AFTER INSERT ON candidates"
+                " BEGIN UPDATE candidate_stats SET total = total + 1; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS trg_candidates_delete AFTER DELETE ON candidates"
+                " BEGIN UPDATE candidate_stats SET total = total - 1; END"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(self, res) -> int:
+        """
+        Store a match result (a MatchResult, kept in its compact form, or a
+        result dict) and return the new candidate ID.
+        """
+        if isinstance(res, MatchResult):
+            blob = zlib.compress(json.dumps(res.to_compact()).encode('utf-8'))
+            res = dict(res.info or {}, candidate_name=res.candidate_name, match_percentage=res.match_percentage,
+                       experience_level={"cv": res.cv_experience}, component_scores=res.component_scores())
+        else:
+            blob = zlib.compress(json.dumps(res).encode('utf-8'))
+        components = res.get('component_scores') or {}
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO candidates (name, filename, internal_filename, score, exp, created_at, full_results,"
+                f" cv_hash, jd_id, {', '.join(COMPONENT_COLUMNS.values())})"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    res.get('candidate_name', 'Unknown'),
+                    res.get('cv_filename', 'Unknown'),
+                    res.get('cv_internal_filename') or '',
+                    res.get('match_percentage', 0),
+                    res.get('experience_level', {}).get('cv', 'N/A'),
+                    time.time(),
+                    blob,
+                    res.get('cv_hash'),
+                    res.get('jd_id'),
+                    *(components.get(name) for name in COMPONENT_COLUMNS),
+                )
+            )
+            return cur.lastrowid
+
+    def get(self, cand_id: int) -> Optional[dict]:
+        """Summary fields plus `full_results` for one candidate, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {SUMMARY_COLUMNS}, full_results FROM candidates WHERE id = ?", (cand_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        candidate = dict(row)
+        full_results = json.loads(zlib.decompress(row['full_results']))
+        if MatchResult.is_compact(full_results):
+            full_results = MatchResult.from_compact(full_results).to_dict()
+        candidate['full_results'] = full_results
+        # The score column follows weight changes (see rescore), the stored result doesn't
+        candidate['full_results']['match_percentage'] = candidate['score']
+        return candidate
+
+    def delete(self, cand_id: int) -> bool:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM candidates WHERE id = ?", (cand_id,)).rowcount > 0
+
+    def by_hashes(self, hashes: List[str], components: bool = False) -> Dict[str, dict]:
+        """
+        Latest summary row for each CV content hash that has one; with
+        `components`, also its stored "component_scores" (None for rows
+        stored without them).
+        """
+        columns = SUMMARY_COLUMNS + "".join(f", {column}" for column in COMPONENT_COLUMNS.values()) \
+            if components else SUMMARY_COLUMNS
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT {columns} FROM candidates"
+                    f" WHERE cv_hash IN ({', '.join('?' * len(chunk))}) ORDER BY id", chunk
+                ).fetchall()
+                for row in rows:
+                    row = dict(row)
+                    if components:
+                        scores = {name: row.pop(column) for name, column in COMPONENT_COLUMNS.items()}
+                        row['component_scores'] = scores if scores['semantic'] is not None else None
+                    found[row['cv_hash']] = row
+        return found
+
+    def components(self, jd_id: Optional[int] = None,
+                   exclude_jd_ids: Sequence[int] = ()) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        (candidate IDs, {component: scores}) of the candidates scored against
+        requisition `jd_id`, or with no `jd_id` of every candidate except those
+        of `exclude_jd_ids`. Candidates stored without components are left out.
+        """
+        where = [f"{COMPONENT_COLUMNS['semantic']} IS NOT NULL"]
+        params: List = []
+        if jd_id is not None:
+            where.append("jd_id = ?")
+            params.append(jd_id)
+        elif exclude_jd_ids:
+            where.append(f"(jd_id IS NULL OR jd_id NOT IN ({', '.join('?' * len(exclude_jd_ids))}))")
+            params.extend(exclude_jd_ids)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id, {', '.join(COMPONENT_COLUMNS.values())} FROM candidates"
+                f" WHERE {' AND '.join(where)}", params
+            ).fetchall()
+        table = np.array([tuple(row) for row in rows], dtype=np.float64).reshape(len(rows), len(COMPONENT_COLUMNS) + 1)
+        ids = table[:, 0].astype(np.int64)
+        return ids, {name: table[:, i + 1] for i, name in enumerate(COMPONENT_COLUMNS)}
+
+    def update_scores(self, ids: Sequence[int], scores: Sequence[float]) -> int:
+        """Overwrite the score of many candidates in one transaction."""
+        with self._connect() as conn:
+            conn.executemany("UPDATE candidates SET score = ? WHERE id = ?",
+                             zip(scores, (int(cand_id) for cand_id in ids)))
+        return len(ids)
+
+    @staticmethod
+    def _filters(exp: Optional[str] = None, min_score: Optional[float] = None, max_score: Optional[float] = None,
+                 jd_id: Optional[int] = None) -> Tuple[List[str], List]:
+        where, params = [], []
+        if exp:
+            where.append("exp = ?")
+            params.append(exp)
+        if min_score is not None:
+            where.append("score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("score <= ?")
+            params.append(max_score)
+        if jd_id is not None:
+            where.append("jd_id = ?")
+            params.append(jd_id)
+        return where, params
+
+    def count(self, exp: Optional[str] = None, min_score: Optional[float] = None,
+              max_score: Optional[float] = None, jd_id: Optional[int] = None) -> int:
+        """Candidates matching the dashboard filters; unfiltered, the trigger-kept total."""
+        where, params = self._filters(exp, min_score, max_score, jd_id)
+        with self._connect() as conn:
+            if not where:
+                return conn.execute("SELECT total FROM candidate_stats").fetchone()[0]
+            return conn.execute(f"SELECT COUNT(*) FROM candidates WHERE {' AND '.join(where)}", params).fetchone()[0]
+
+    def page(self, sort: str = "date", order: str = "desc", exp: Optional[str] = None,
+             min_score: Optional[float] = None, max_score: Optional[float] = None,
+             jd_id: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None,
+             limit: int = 20) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        """
+        One dashboard page using keyset pagination: `after`/`before` are
+        cursors from a previous page, so every page is an index range scan
+        of `limit` rows no matter how many candidates are stored.
+        Returns (rows, next_cursor, prev_cursor).
+        """
+        column = SORT_COLUMNS.get(sort, "created_at")
+        descending = order != "asc"
+        where, params = self._filters(exp, min_score, max_score, jd_id)
+
+        # Walking backwards (`before`) flips the scan direction, then the rows
+        cursor = before or after
+        backwards = bool(before)
+        scan_desc = descending != backwards
+        if cursor:
+            value, cand_id = decode_cursor(cursor)
+            where.append(f"({column}, id) {'<' if scan_desc else '>'} (?, ?)")
+            params.extend([value, cand_id])
+
+        direction = "DESC" if scan_desc else "ASC"
+        sql = (f"SELECT {SUMMARY_COLUMNS} FROM candidates"
+               f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+               f" ORDER BY {column} {direction}, id {direction} LIMIT ?")
+        with self._connect() as conn:
+            rows = [dict(row) for row in conn.execute(sql, params + [limit + 1]).fetchall()]
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+        if not rows:
+            return [], None, None
+        first = encode_cursor(rows[0][column], rows[0]['id'])
+        last = encode_cursor(rows[-1][column], rows[-1]['id'])
+        next_cursor = last if (has_more or backwards) else None
+        prev_cursor = first if (cursor and not backwards) or (backwards and has_more) else None
+        return rows, next_cursor, prev_cursor
@@ -1,5 +1,7 @@
 import re
-from typing import Tuple
+from typing import FrozenSet, NamedTuple, Tuple
+
+from metrics import timed
 
 # CV-specific keywords and patterns
 CV_KEYWORDS = {
@@ -34,80 +36,120 @@ COMPANY_PATTERNS = [
 ]
 
 
+# All patterns are compiled once. Each category is one alternation, so a
+# single search answers "does any pattern match?". Company patterns are all
+# lowercase and run on the lowercased text, which is much faster than
+# IGNORECASE with the same result.
+CONTACT_RE = re.compile('|'.join(CONTACT_PATTERNS), re.IGNORECASE)
+COMPANY_RE = re.compile('|'.join(COMPANY_PATTERNS))
+
+# Section headings scored on top of the keywords (all of them are keywords too)
+CV_SECTIONS = ('experience', 'education', 'skills')
+JD_SECTIONS = ('responsibilities', 'requirements', 'qualifications')
+
+# Every keyword of either document type, checked once per text. Plain
+# substring tests (C-level search) beat one combined regex for this many literals.
+ALL_KEYWORDS = tuple(sorted(CV_KEYWORDS | JD_KEYWORDS))
+
+
+class DocumentSignals(NamedTuple):
+    """Everything the CV and JD scores need, extracted in one pass over the text."""
+    keywords: FrozenSet[str]
+    has_contact: bool
+    has_company: bool
+
+
 def preprocess_text(text: str) -> str:
     """Normalize text for analysis."""
     return text.lower().strip()
 
 
+def analyze_text(text: str) -> DocumentSignals:
+    """Lowercase the text once and collect the keyword, contact and company signals."""
+    text_lower = preprocess_text(text)
+    return DocumentSignals(
+        keywords=frozenset(keyword for keyword in ALL_KEYWORDS if keyword in text_lower),
+        has_contact=CONTACT_RE.search(text) is not None,
+        has_company=COMPANY_RE.search(text_lower) is not None,
+    )
+
+
 def count_keywords(text: str, keywords: set) -> int:
     """Count how many keywords from the set appear in the text."""
     text_lower = preprocess_text(text)
-    count = 0
-    for keyword in keywords:
-        if keyword in text_lower:
-            count += 1
-    return count
+    return sum(1 for keyword in keywords if keyword in text_lower)
 
 
 def has_contact_info(text: str) -> bool:
     """Check if text contains contact information patterns."""
-    for pattern in CONTACT_PATTERNS:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
+    return CONTACT_RE.search(text) is not None
 
 
 def has_company_patterns(text: str) -> bool:
     """Check if text contains company/hiring patterns."""
-    for pattern in COMPANY_PATTERNS:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
+    return COMPANY_RE.search(text.lower()) is not None
 
 
-def validate_cv(text: str) -> Tuple[bool, float, str]:
-    """
-    Validate if the text is a CV/Resume.
-    
-    Returns:
-        (is_valid, confidence, reason)
-    """
-    if not text or len(text.strip()) < 10:
-        return False, 0.0, "Document is too short (minimum 10 characters required)"
+def is_too_short(text: str) -> bool:
+    return not text or len(text.strip()) < 10
+
+
+def cv_confidence(signals: DocumentSignals) -> float:
+    """CV confidence (0-100) from the document signals."""
+    confidence = 0.0
     
-    # Word count check removed
+    # Keyword matching (max 50 points)
+    confidence += min(len(signals.keywords & CV_KEYWORDS) * 10, 50)
     
-    # Count CV-specific keywords
-    cv_keyword_count = count_keywords(text, CV_KEYWORDS)
+    # Contact information (30 points)
+    if signals.has_contact:
+        confidence += 30
     
-    # Check for contact information (strong CV indicator)
-    has_contact = has_contact_info(text)
+    # Penalize if it looks like a JD (reduce confidence)
+    if signals.has_company:
+        confidence -= 20
     
-    # Check for company patterns (suggests it might be a JD instead)
-    has_company = has_company_patterns(text)
+    # Typical CV sections, 10 points each
+    confidence += sum(1 for section in CV_SECTIONS if section in signals.keywords) * 10
     
-    # Calculate confidence score
+    # Normalize confidence to 0-100
+    return max(0, min(confidence, 100))
+
+
+def jd_confidence(signals: DocumentSignals) -> float:
+    """JD confidence (0-100) from the document signals."""
     confidence = 0.0
     
     # Keyword matching (max 50 points)
-    confidence += min(cv_keyword_count * 10, 50)
+    confidence += min(len(signals.keywords & JD_KEYWORDS) * 10, 50)
     
-    # Contact information (30 points)
-    if has_contact:
+    # Company/hiring patterns (30 points)
+    if signals.has_company:
         confidence += 30
     
-    # Penalize if it looks like a JD (reduce confidence)
-    if has_company:
+    # Penalize if it looks like a CV (reduce confidence)
+    if signals.has_contact:
         confidence -= 20
     
-    # Check for typical CV sections
-    text_lower = preprocess_text(text)
-    cv_sections = ['experience', 'education', 'skills']
-    sections_found = sum(1 for section in cv_sections if section in text_lower)
-    confidence += sections_found * 10  # 10 points per section
+    # Typical JD sections, 10 points each
+    confidence += sum(1 for section in JD_SECTIONS if section in signals.keywords) * 10
     
     # Normalize confidence to 0-100
-    confidence = max(0, min(confidence, 100))
+    return max(0, min(confidence, 100))
+
+
+@timed("validate_cv")
+def validate_cv(text: str) -> Tuple[bool, float, str]:
+    """
+    Validate if the text is a CV/Resume.
+    
+    Returns:
+        (is_valid, confidence, reason)
+    """
+    if is_too_short(text):
+        return False, 0.0, "Document is too short (minimum 10 characters required)"
+    
+    confidence = cv_confidence(analyze_text(text))
     
     # RELAXED VALIDATION: Always valid if it passed the length check
     is_valid = True
@@ -116,6 +158,7 @@ def validate_cv(text: str) -> Tuple[bool, float, str]:
     return is_valid, confidence, reason
 
 
+@timed("validate_jd")
 def validate_jd(text: str) -> Tuple[bool, float, str]:
     """
     Validate if the text is a Job Description.
@@ -123,45 +166,10 @@ def validate_jd(text: str) -> Tuple[bool, float, str]:
     Returns:
         (is_valid, confidence, reason)
     """
-    if not text or len(text.strip()) < 10:
+    if is_too_short(text):
         return False, 0.0, "Document is too short (minimum 10 characters required)"
     
-    # Word count check removed as requested
-    # word_count = len(text.split())
-    # if word_count < 50:
-    #     return False, 0.0, "Document is too short (minimum 50 words required)"
-    
-    # Count JD-specific keywords
-    jd_keyword_count = count_keywords(text, JD_KEYWORDS)
-    
-    # Check for company/hiring patterns (strong JD indicator)
-    has_company = has_company_patterns(text)
-    
-    # Check for contact information (suggests it might be a CV instead)
-    has_contact = has_contact_info(text)
-    
-    # Calculate confidence score
-    confidence = 0.0
-    
-    # Keyword matching (max 50 points)
-    confidence += min(jd_keyword_count * 10, 50)
-    
-    # Company/hiring patterns (30 points)
-    if has_company:
-        confidence += 30
-    
-    # Penalize if it looks like a CV (reduce confidence)
-    if has_contact:
-        confidence -= 20
-    
-    # Check for typical JD sections
-    text_lower = preprocess_text(text)
-    jd_sections = ['responsibilities', 'requirements', 'qualifications']
-    sections_found = sum(1 for section in jd_sections if section in text_lower)
-    confidence += sections_found * 10  # 10 points per section
-    
-    # Normalize confidence to 0-100
-    confidence = max(0, min(confidence, 100))
+    confidence = jd_confidence(analyze_text(text))
     
     # RELAXED VALIDATION: Always valid if it passed the length check
     # We accept "whatever JD" the user provides
@@ -171,6 +179,15 @@ def validate_jd(text: str) -> Tuple[bool, float, str]:
     return is_valid, confidence, reason
 
 
+def document_confidences(text: str) -> Tuple[float, float]:
+    """(CV confidence, JD confidence) from a single analysis of the text; (0, 0) if too short."""
+    if is_too_short(text):
+        return 0.0, 0.0
+    signals = analyze_text(text)
+    return cv_confidence(signals), jd_confidence(signals)
+
+
+@timed("document_type")
 def get_document_type(text: str) -> str:
     """
     Auto-detect document type.
@@ -178,12 +195,12 @@ def get_document_type(text: str) -> str:
     Returns:
         "CV", "JD", or "UNKNOWN"
     """
-    cv_valid, cv_conf, _ = validate_cv(text)
-    jd_valid, jd_conf, _ = validate_jd(text)
+    valid = not is_too_short(text)
+    cv_conf, jd_conf = document_confidences(text)
     
-    if cv_valid and cv_conf > jd_conf:
+    if valid and cv_conf > jd_conf:
         return "CV"
-    elif jd_valid and jd_conf > cv_conf:
+    elif valid and jd_conf > cv_conf:
         return "JD"
     elif cv_conf > 40 or jd_conf > 40:
         # Partial match - return the higher one
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Optional
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of the raw file bytes, used as the cache key."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class FeatureCache:
+    """
+    On-disk cache of parsed documents and their derived features, keyed by
+    the SHA-256 of the file bytes. Values are JSON-serializable dicts stored
+    zlib-compressed in SQLite. The least recently used entries are evicted
+    once the cache holds more than `max_entries` or `max_bytes`.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS features ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_features_last_access ON features(last_access)")
+            # Entry count and total size kept by triggers, so a put never scans the table
+            conn.execute("CREATE TABLE IF NOT EXISTS feature_stats (entries INTEGER NOT NULL, bytes INTEGER NOT NULL)")
+            if conn.execute("SELECT COUNT(*) FROM feature_stats").fetchone()[0] == 0:
+                conn.execute("INSERT INTO feature_stats (entries, bytes) SELECT COUNT(*), COALESCE(SUM(size), 0) FROM features")
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS trg_features_insert AFTER INSERT ON features"
+                " BEGIN UPDATE feature_stats SET entries = entries + 1, bytes = bytes + NEW.size; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS trg_features_update AFTER UPDATE OF size ON features"
+                " BEGIN UPDATE feature_stats SET bytes = bytes - OLD.size + NEW.size; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS trg_features_delete AFTER DELETE ON features"
+                " BEGIN UPDATE feature_stats SET entries = entries - 1, bytes = bytes - OLD.size; END"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the cache safe to share
+        # between threads and gunicorn workers.
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached dict for `key`, or None. Marks the entry as used."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM features WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE features SET last_access = ? WHERE key = ?", (time.time(), key))
+        try:
+            return json.loads(zlib.decompress(row[0]))
+        except (zlib.error, ValueError):
+            self.delete(key)
+            return None
+
+    def put(self, key: str, value: dict) -> None:
+        """Store `value` under `key`, evicting old entries if over budget."""
+        blob = zlib.compress(json.dumps(value).encode('utf-8'))
+        with self._connect() as conn:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete doesn't fire the delete trigger
+            conn.execute(
+                "INSERT INTO features (key, value, size, last_access) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size,"
+                " last_access = excluded.last_access",
+                (key, blob, len(blob), time.time())
+            )
+            self._evict(conn)
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM features WHERE key = ?", (key,))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        count, total = conn.execute("SELECT entries, bytes FROM feature_stats").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM features ORDER BY last_access"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM features WHERE key = ?", stale)
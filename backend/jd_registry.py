@@ -0,0 +1,206 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from match import JobProfile, JobProfileSet, build_job_profiles, match_cv_against_jds, resolve_weights
+
+# weight_profiles.scope of the profile used by JDs without their own
+GLOBAL_SCOPE = "global"
+
+
+class JDRegistry:
+    """
+    Open job requisitions, stored in SQLite. Their JobProfiles are built on
+    first use (spaCy batched with nlp.pipe) and kept in memory together with
+    one JobProfileSet, so a CV is scored against every open JD in a single
+    vectorized pass. Adding or closing a JD only rebuilds the set's matrices,
+    not the profiles. Every change bumps a version stamp in the database, so
+    each process sharing it rebuilds its set on the next use.
+
+    Score weight profiles are kept here too: one global profile plus
+    optional per-requisition overrides (see match.resolve_weights), and
+    reloaded from the database whenever its version stamp changes.
+    """
+
+    def __init__(self, path: str, tfidf_index=None, batch_size: int = 32):
+        self.path = path
+        self.tfidf_index = tfidf_index
+        self.batch_size = batch_size
+        self._profiles: Dict[int, JobProfile] = {}
+        self._job_set: Optional[Tuple[List[dict], JobProfileSet]] = None
+        self._weights: Dict[str, dict] = {}
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_descriptions ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " title TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " is_open INTEGER NOT NULL DEFAULT 1)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_descriptions_open ON job_descriptions(is_open)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS registry_state ("
+                " id INTEGER PRIMARY KEY CHECK (id = 1),"
+                " version INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO registry_state (id, version) VALUES (1, 0)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS weight_profiles ("
+                " scope TEXT PRIMARY KEY,"
+                " profile TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection) -> None:
+        conn.execute("UPDATE registry_state SET version = version + 1 WHERE id = 1")
+
+    def _sync(self) -> None:
+        """Reload weights and drop the cached set if any process changed the registry (lock held)."""
+        with self._connect() as conn:
+            version = conn.execute("SELECT version FROM registry_state WHERE id = 1").fetchone()[0]
+            if version == self._version:
+                return
+            open_ids = {row[0] for row in conn.execute("SELECT id FROM job_descriptions WHERE is_open = 1")}
+            self._weights = {row['scope']: json.loads(row['profile'])
+                             for row in conn.execute("SELECT scope, profile FROM weight_profiles")}
+        self._version = version
+        for jd_id in [jd_id for jd_id in self._profiles if jd_id not in open_ids]:
+            del self._profiles[jd_id]
+        self._apply_weights()
+        self._job_set = None
+
+    def add(self, title: str, text: str) -> int:
+        """Register an open JD and return its ID."""
+        with self._connect() as conn:
+            jd_id = conn.execute(
+                "INSERT INTO job_descriptions (title, text, created_at) VALUES (?, ?, ?)",
+                (title, text, time.time())
+            ).lastrowid
+            self._bump(conn)
+        return jd_id
+
+    def close(self, jd_id: int) -> bool:
+        """Mark a JD as no longer open; it drops out of reverse matching."""
+        with self._connect() as conn:
+            closed = conn.execute(
+                "UPDATE job_descriptions SET is_open = 0 WHERE id = ? AND is_open = 1", (jd_id,)
+            ).rowcount > 0
+            if closed:
+                self._bump(conn)
+        return closed
+
+    def get(self, jd_id: int) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM job_descriptions WHERE id = ?", (jd_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_open(self) -> List[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, title, created_at FROM job_descriptions WHERE is_open = 1 ORDER BY id"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def job_set(self) -> Tuple[List[dict], JobProfileSet]:
+        """(open JD rows, JobProfileSet in the same order), built on first use."""
+        with self._lock:
+            self._sync()
+            if self._job_set is None:
+                with self._connect() as conn:
+                    rows = [dict(row) for row in conn.execute(
+                        "SELECT id, title, text FROM job_descriptions WHERE is_open = 1 ORDER BY id")]
+                missing = [row for row in rows if row['id'] not in self._profiles]
+                built = build_job_profiles([row['text'] for row in missing],
+                                           tfidf_index=self.tfidf_index, batch_size=self.batch_size)
+                for row, profile in zip(missing, built):
+                    profile.weight_profile = self._weight_profile(row['id'])
+                    self._profiles[row['id']] = profile
+                jobs = JobProfileSet([self._profiles[row['id']] for row in rows], tfidf_index=self.tfidf_index)
+                self._job_set = ([{"id": row['id'], "title": row['title']} for row in rows], jobs)
+            return self._job_set
+
+    def profile(self, jd_id: int) -> Optional[JobProfile]:
+        """JobProfile of an open JD (with its weight profile), or None."""
+        self.job_set()
+        with self._lock:
+            return self._profiles.get(jd_id)
+
+    def _weight_profile(self, jd_id: Optional[int]) -> Optional[dict]:
+        if jd_id is not None and str(jd_id) in self._weights:
+            return self._weights[str(jd_id)]
+        return self._weights.get(GLOBAL_SCOPE)
+
+    def weight_profile(self, jd_id: Optional[int] = None) -> Optional[dict]:
+        """Weights in effect for a requisition (its own, else global), or the global ones; None = defaults."""
+        with self._lock:
+            self._sync()
+            return self._weight_profile(jd_id)
+
+    def weight_profiles(self) -> dict:
+        """The global profile and every per-requisition override."""
+        with self._lock:
+            self._sync()
+            return {
+                "global": self._weights.get(GLOBAL_SCOPE),
+                "requisitions": {int(scope): profile for scope, profile in self._weights.items()
+                                 if scope != GLOBAL_SCOPE},
+            }
+
+    def weighted_jd_ids(self) -> List[int]:
+        """Requisitions with their own weight profile."""
+        with self._lock:
+            self._sync()
+            return [int(scope) for scope in self._weights if scope != GLOBAL_SCOPE]
+
+    def set_weight_profile(self, profile: dict, jd_id: Optional[int] = None) -> dict:
+        """
+        Validate and store a weight profile, global or for one requisition.
+        Missing weights are filled in from the defaults; the complete profile
+        is returned. Raises ValueError for an invalid profile.
+        """
+        weights, low_semantic_weights = resolve_weights(profile)
+        profile = {"weights": weights, "low_semantic_weights": low_semantic_weights}
+        scope = GLOBAL_SCOPE if jd_id is None else str(jd_id)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO weight_profiles (scope, profile, updated_at) VALUES (?, ?, ?)",
+                (scope, json.dumps(profile), time.time())
+            )
+            self._bump(conn)
+        return profile
+
+    def clear_weight_profile(self, jd_id: int) -> bool:
+        """Drop a requisition's own profile so it follows the global one again."""
+        with self._connect() as conn:
+            removed = conn.execute("DELETE FROM weight_profiles WHERE scope = ?", (str(jd_id),)).rowcount > 0
+            if removed:
+                self._bump(conn)
+        return removed
+
+    def _apply_weights(self) -> None:
+        # Weights don't enter the set's matrices, so cached profiles are updated in place
+        for jd_id, profile in self._profiles.items():
+            profile.weight_profile = self._weight_profile(jd_id)
+
+    def match(self, cv, top: Optional[int] = None) -> List[dict]:
+        """Rank every open JD for one CV (text or CVProfile); adds `jd_id` and `jd_title`."""
+        rows, jobs = self.job_set()
+        results = match_cv_against_jds(cv, jobs, top=top)
+        for result in results:
+            row = rows[result.pop('jd_index')]
+            result['jd_id'] = row['id']
+            result['jd_title'] = row['title']
+        return results
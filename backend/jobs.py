@@ -0,0 +1,248 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from match import MatchResult
+
+
+def _is_error(outcome) -> bool:
+    return isinstance(outcome, dict) and "error" in outcome
+
+
+def _match_percentage(outcome) -> float:
+    return outcome.get('match_percentage', 0) if isinstance(outcome, dict) else outcome.match_percentage
+
+
+def _encode(outcome) -> bytes:
+    """Result dicts are stored as they are, MatchResults in their compact form."""
+    data = outcome.to_compact() if isinstance(outcome, MatchResult) else outcome
+    return zlib.compress(json.dumps(data).encode('utf-8'))
+
+
+def _decode(blob: bytes) -> dict:
+    data = json.loads(zlib.decompress(blob))
+    return MatchResult.from_compact(data).to_dict() if MatchResult.is_compact(data) else data
+
+
+class JobStore:
+    """
+    SQLite record of batch jobs and their outcomes, so that any web worker
+    (not only the one running the job) can report progress and stream
+    results. Outcomes are numbered in completion order.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " total INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " finished_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_outcomes ("
+                " job_id TEXT NOT NULL,"
+                " seq INTEGER NOT NULL,"
+                " is_error INTEGER NOT NULL,"
+                " score REAL NOT NULL,"
+                " outcome BLOB NOT NULL,"
+                " PRIMARY KEY (job_id, seq))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs(finished_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def create(self, job_id: str, total: int, created_at: float) -> None:
+        with self._connect() as conn:
+            conn.execute("INSERT INTO jobs (id, total, created_at, finished_at) VALUES (?, ?, ?, ?)",
+                         (job_id, total, created_at, created_at if total == 0 else None))
+
+    def load(self, job_id: str) -> Optional[Tuple[int, float]]:
+        """(total, created_at) of a job, or None."""
+        with self._connect() as conn:
+            return conn.execute("SELECT total, created_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def record(self, job_id: str, outcome) -> None:
+        """Append one outcome; the job is finished with its last one."""
+        is_error = _is_error(outcome)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            seq = conn.execute("SELECT COUNT(*) FROM job_outcomes WHERE job_id = ?", (job_id,)).fetchone()[0]
+            conn.execute("INSERT INTO job_outcomes (job_id, seq, is_error, score, outcome) VALUES (?, ?, ?, ?, ?)",
+                         (job_id, seq, int(is_error), 0 if is_error else _match_percentage(outcome), _encode(outcome)))
+            conn.execute("UPDATE jobs SET finished_at = ? WHERE id = ? AND total <= ?", (time.time(), job_id, seq + 1))
+
+    def counts(self, job_id: str) -> Tuple[int, int]:
+        """(completed, failed) outcomes of a job."""
+        with self._connect() as conn:
+            completed, failed = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(is_error), 0) FROM job_outcomes WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return completed, failed
+
+    def ranked(self, job_id: str, top: Optional[int] = None) -> List[dict]:
+        """Successful outcomes by match percentage (ties in completion order)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT outcome FROM job_outcomes WHERE job_id = ? AND is_error = 0 ORDER BY score DESC, seq"
+                " LIMIT ?", (job_id, top if top else -1)
+            ).fetchall()
+        return [_decode(row[0]) for row in rows]
+
+    def errors(self, job_id: str) -> List[dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT outcome FROM job_outcomes WHERE job_id = ? AND is_error = 1 ORDER BY seq",
+                                (job_id,)).fetchall()
+        return [_decode(row[0]) for row in rows]
+
+    def since(self, job_id: str, seq: int) -> List[Tuple[int, dict]]:
+        """(seq, outcome) of the outcomes numbered `seq` and later."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT seq, outcome FROM job_outcomes WHERE job_id = ? AND seq >= ? ORDER BY seq",
+                                (job_id, seq)).fetchall()
+        return [(row[0], _decode(row[1])) for row in rows]
+
+    def expire(self, ttl: float) -> None:
+        """Drop jobs finished more than `ttl` seconds ago."""
+        with self._connect() as conn:
+            stale = [row[0] for row in conn.execute(
+                "SELECT id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (time.time() - ttl,))]
+            for job_id in stale:
+                conn.execute("DELETE FROM job_outcomes WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+
+class BatchJob:
+    """
+    A batch of CV scoring tasks running in the background. Outcomes are
+    recorded in the JobStore in completion order, so every process sees the
+    same progress; `ranked()` gives the results sorted by match percentage.
+    In the process running the job, stream() is woken as each one lands.
+    """
+
+    def __init__(self, store: JobStore, job_id: str, total: int, created_at: float):
+        self.store = store
+        self.id = job_id
+        self.total = total
+        self.created_at = created_at
+        self._cond = threading.Condition()
+
+    @property
+    def completed(self) -> int:
+        return self.store.counts(self.id)[0]
+
+    def _status(self, completed: int) -> str:
+        if completed >= self.total:
+            return "done"
+        return "running" if completed else "queued"
+
+    @property
+    def status(self) -> str:
+        return self._status(self.completed)
+
+    def _record(self, outcome) -> None:
+        self.store.record(self.id, outcome)
+        with self._cond:
+            self._cond.notify_all()
+
+    def ranked(self, top: Optional[int] = None) -> List[dict]:
+        return self.store.ranked(self.id, top)
+
+    def to_dict(self, top: Optional[int] = None) -> dict:
+        completed, failed = self.store.counts(self.id)
+        return {
+            "id": self.id,
+            "status": self._status(completed),
+            "total": self.total,
+            "completed": completed,
+            "failed": failed,
+            "progress": round(completed / self.total * 100, 2) if self.total else 100.0,
+            "results": self.ranked(top),
+            "errors": self.store.errors(self.id),
+        }
+
+    def stream(self, timeout: float = 600, poll: float = 0.5) -> Iterator[dict]:
+        """Yield each result/error as it finishes, then a final status line."""
+        sent = 0
+        deadline = time.time() + timeout
+        while True:
+            new = self.store.since(self.id, sent)
+            sent += len(new)
+            for _, outcome in new:
+                yield outcome
+            if sent >= self.total or time.time() >= deadline:
+                break
+            if not new:
+                # Outcomes recorded by another process are picked up on the next poll
+                with self._cond:
+                    self._cond.wait(timeout=poll)
+        yield {"id": self.id, "status": self._status(sent), "total": self.total, "completed": sent}
+
+
+class JobManager:
+    """
+    Runs BatchJobs on a local worker pool. Jobs are recorded in a JobStore,
+    so status and streams can be served by any web worker, and are dropped
+    `ttl` seconds after they finish. Tasks only run in the process that
+    accepted the job; if it exits, the job stays unfinished.
+    """
+
+    def __init__(self, path: str, max_workers: int = 2, ttl: float = 3600):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-job")
+        self.ttl = ttl
+        self.store = JobStore(path)
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def submit(self, tasks: List[Tuple[str, Callable]]) -> BatchJob:
+        """
+        Queue one task per CV. Each task is (label, fn) where fn returns a
+        result dict or MatchResult, or a dict with an "error" key.
+        """
+        self._expire()
+        job = BatchJob(self.store, uuid.uuid4().hex, len(tasks), time.time())
+        self.store.create(job.id, job.total, job.created_at)
+        with self._lock:
+            self._local[job.id] = job
+        for label, fn in tasks:
+            self.executor.submit(self._run, job, label, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        with self._lock:
+            job = self._local.get(job_id)
+        if job is not None:
+            return job
+        row = self.store.load(job_id)
+        return BatchJob(self.store, job_id, *row) if row else None
+
+    def _run(self, job: BatchJob, label: str, fn: Callable) -> None:
+        try:
+            outcome = fn()
+        except Exception as e:
+            outcome = {"error": str(e)}
+        if _is_error(outcome):
+            outcome = {"cv_filename": label, "error": outcome["error"]}
+        try:
+            job._record(outcome)
+        except sqlite3.Error as e:
+            print(f"Job store unavailable: {e}")
+        if job.status == "done":
+            with self._lock:
+                self._local.pop(job.id, None)
+
+    def _expire(self) -> None:
+        try:
+            self.store.expire(self.ttl)
+        except sqlite3.Error as e:
+            print(f"Job store unavailable: {e}")
@@ -1,61 +1,93 @@
 import re
+import io
+import math
 import string
 import os
 import logging
-import pdfplumber
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+from pdf_text import iter_pdf_pages
+from skill_taxonomy import SkillTaxonomy, TaxonomySource
+from metrics import timed
+import metrics
 import docx
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
-# Try importing spacy
-try:
-    import spacy
-    # Load the model - using 'en_core_web_md' for vectors is recommended
-    # If not found, fall back to simple matching or warn
+# spaCy and its model are loaded lazily on first semantic use (see get_nlp),
+# so importing this module stays cheap. SPACY_MODEL picks the model: "md"
+# (default, word vectors + NER), "sm" (small, no static vectors), "vectors"
+# (md vectors only, no pipeline components; names use the text heuristic)
+# or a package name/path.
+SPACY_MODEL = os.environ.get('SPACY_MODEL', 'md')
+SPACY_MODELS = {"md": "en_core_web_md", "sm": "en_core_web_sm", "vectors": "en_core_web_md"}
+VECTORS_ONLY_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
+def load_nlp(choice):
+    """ Loads the configured spaCy model, falling back to the small one. """
+    try:
+        import spacy
+    except ImportError:
+        return None
+    name = SPACY_MODELS.get(choice, choice)
+    exclude = VECTORS_ONLY_EXCLUDE if choice == "vectors" else []
     try:
-        nlp = spacy.load("en_core_web_md")
+        return spacy.load(name, exclude=exclude)
     except OSError:
-        logging.warning("Spacy model 'en_core_web_md' not found. Semantic matching will be limited. Please run: python -m spacy download en_core_web_md")
+        logging.warning(f"Spacy model '{name}' not found. Semantic matching will be limited. Please run: python -m spacy download {name}")
+    if name != "en_core_web_sm":
         try:
-            nlp = spacy.load("en_core_web_sm") # Fallback to small model
+            return spacy.load("en_core_web_sm") # Fallback to small model
         except OSError:
-            nlp = None
-except ImportError:
-    nlp = None
-
-# predefined skill lists for categorization
-SKILL_CATEGORIES = {
-    "technical": {
-        # Languages
-        "python", "java", "c++", "c#", "c", "javascript", "typescript", "ruby", "php", "swift", "kotlin", "go", "rust", "scala", "r", "matlab", "perl", "shell", "bash",
-        # Web Frameworks (Backend)
-        "django", "flask", "fastapi", "spring", "spring boot", "hibernate", "ruby on rails", "laravel", "express", "nestjs", "asp.net", ".net", "node.js",
-        # Frontend
-        "react", "angular", "vue", "next.js", "nuxt.js", "svelte", "jquery", "html", "css", "sass", "less", "tailwind", "bootstrap", "material ui", "redux", "webpack", "babel",
-        # Mobile
-        "react native", "flutter", "ios", "android", "xamarin", "ionic",
-        # Database
-        "sql", "nosql", "mysql", "postgresql", "mongodb", "sqlite", "oracle", "redis", "cassandra", "dynamodb", "firebase", "elasticsearch", "pl/sql",
-        # Cloud & DevOps
-        "aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "circleci", "gitlab ci", "travis ci", "terraform", "ansible", "puppet", "chef", "prometheus", "grafana", "splunk", "heroku", "digitalocean",
-        # AI/ML/Data
-        "machine learning", "deep learning", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "keras", "opencv", "nlp", "computer vision", "data analysis", "big data", "hadoop", "spark",
-        # Other Technical
-        "git", "github", "gitlab", "bitbucket", "linux", "unix", "windows", "macos", "graphql", "rest api", "soap", "microservices", "serverless", "agile", "scrum", "kanban", "tdd", "bdd", "ci/cd", "oop", "design patterns", "algorithms", "data structures"
-    },
-    "soft": {
-        "communication", "leadership", "teamwork", "problem solving", "critical thinking", "time management", 
-        "adaptability", "creativity", "collaboration", "negotiation", "presentation", "mentoring", "emotional intelligence",
-        "conflict resolution", "decision making", "project management", "accountability", "attention to detail", "work ethic"
-    },
-    "tools": {
-        "jira", "confluence", "slack", "trello", "asana", "zoom", "ms teams", "ms office", "excel", "powerpoint", "word",
-        "tableau", "power bi", "looker", "figma", "adobe xd", "photoshop", "illustrator", "sketch", "invision",
-        "vscode", "visual studio", "pycharm", "intellij", "eclipse", "sublime text", "vim", "emacs",
-        "postman", "swagger", "insomnia", "wireshark", "fiddler"
-    }
-}
+            pass
+    return None
+
+def get_nlp():
+    """ Returns the spaCy pipeline, loading it on first use (thread-safe). """
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        with _nlp_lock:
+            if not _nlp_loaded:
+                _nlp = load_nlp(SPACY_MODEL)
+                _nlp_loaded = True
+    return _nlp
+
+def warm_up_nlp():
+    """ Loads the model in a background thread so the first request doesn't pay for it. """
+    thread = threading.Thread(target=get_nlp, name="spacy-warmup", daemon=True)
+    thread.start()
+    return thread
+
+# Pipeline components each spaCy step can skip. Doc vectors only need the
+# tokenizer (and tok2vec for models without static vectors); names only need NER.
+SIMILARITY_DISABLE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+NAME_DISABLE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+def get_disabled(components):
+    """ Filters a disable list down to the components the loaded model has. """
+    nlp = get_nlp()
+    return [name for name in components if name in nlp.pipe_names] if nlp else []
+
+# The skill taxonomy (categories plus aliases such as "k8s" -> kubernetes) is
+# read from SKILL_TAXONOMY_PATH, a versioned JSON file (YAML with PyYAML), and
+# compiled once. Each process re-reads the file when it changes, checking its
+# mtime at most every SKILL_TAXONOMY_CHECK_SECONDS (0 = only on reload()).
+SKILL_TAXONOMY_PATH = os.environ.get(
+    'SKILL_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'skill_taxonomy.json'))
+SKILL_TAXONOMY_CHECK_SECONDS = float(os.environ.get('SKILL_TAXONOMY_CHECK_SECONDS', 5))
+SKILL_TAXONOMIES = TaxonomySource(SKILL_TAXONOMY_PATH, check_interval=SKILL_TAXONOMY_CHECK_SECONDS)
+
+def get_skill_taxonomy():
+    """ The current SkillTaxonomy, reloaded if its file changed. """
+    return SKILL_TAXONOMIES.current()
 
 def get_stopwords():
     return {
@@ -66,8 +98,13 @@ def get_stopwords():
         'other', 'some', 'such', 'no', 'nor', 'too', 'very', 'can', 'will', 'just', 'should'
     }
 
+# The readers accept a path or a binary file-like object (e.g. io.BytesIO,
+# an uploaded file's stream), so uploads can be parsed without touching disk.
+
 def read_txt(filepath):
     try:
+        if hasattr(filepath, 'read'):
+            return filepath.read().decode('utf-8')
         with open(filepath, 'r', encoding='utf-8') as f:
             return f.read()
     except Exception as e:
@@ -75,15 +112,17 @@ def read_txt(filepath):
         return ""
 
 def read_pdf(filepath):
-    text = ""
+    # Pages are streamed and extraction stops at the PDF_MAX_PAGES / PDF_MAX_CHARS budget
+    pages = []
+    n_pages = 0
     try:
-        with pdfplumber.open(filepath) as pdf:
-            for page in pdf.pages:
-                t = page.extract_text()
-                if t: text += t + "\n"
+        for t in iter_pdf_pages(filepath):
+            n_pages += 1
+            if t: pages.append(t + "\n")
     except Exception as e:
         print(f"Error reading PDF file: {e}")
-    return text
+    metrics.inc("pdf_pages_total", n_pages)
+    return "".join(pages)
 
 def read_docx(filepath):
     text = ""
@@ -95,15 +134,31 @@ def read_docx(filepath):
         print(f"Error reading DOCX file: {e}")
     return text
 
+READERS = {'.txt': read_txt, '.pdf': read_pdf, '.docx': read_docx}
+
+def count_document(ext, size):
+    fmt = ext.lower().lstrip('.')
+    metrics.inc("documents_total", format=fmt)
+    metrics.inc("document_bytes_total", size, format=fmt)
+
+@timed("read_file")
 def read_file(filepath):
     if not os.path.exists(filepath):
         return ""
     _, ext = os.path.splitext(filepath)
-    ext = ext.lower()
-    if ext == '.txt': return read_txt(filepath)
-    elif ext == '.pdf': return read_pdf(filepath)
-    elif ext == '.docx': return read_docx(filepath)
-    return ""
+    reader = READERS.get(ext.lower())
+    if reader:
+        count_document(ext, os.path.getsize(filepath))
+    return reader(filepath) if reader else ""
+
+@timed("read_file")
+def read_bytes(data, filename):
+    """ Extracts text from in-memory file bytes; the extension of `filename` picks the parser. """
+    _, ext = os.path.splitext(filename)
+    reader = READERS.get(ext.lower())
+    if reader:
+        count_document(ext, len(data))
+    return reader(io.BytesIO(data)) if reader else ""
 
 def preprocess_text(text):
     text = text.lower()
@@ -111,6 +166,7 @@ def preprocess_text(text):
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
+@timed("experience")
 def detect_experience_level(text):
     """
     Heuristic to detect experience level: Junior, Mid, Senior.
@@ -124,38 +180,29 @@ def detect_experience_level(text):
         return "Junior Level"
     return "Not Specified"
 
-def extract_categorized_skills(text):
+@timed("skills")
+def extract_categorized_skills(text, taxonomy=None):
     """
     Extracts skills from text and categorizes them.
     """
-    found_skills = {
-        "technical": set(),
-        "soft": set(),
-        "tools": set()
-    }
-    
-    text_processed = preprocess_text(text)
-    
-    # Check for multi-word skills first (simple check)
-    for category, skills in SKILL_CATEGORIES.items():
-        for skill in skills:
-            if skill in text_processed:
-                found_skills[category].add(skill)
-                
-    return found_skills
+    # Whole-token matches only, so "r" and "c" no longer hit every document
+    return (taxonomy or get_skill_taxonomy()).extract(text)
 
 def get_semantic_similarity(text1, text2):
     """
     Calculates semantic similarity using spaCy word vectors.
     """
+    nlp = get_nlp()
     if not nlp:
         return 0.0
     
-    doc1 = nlp(text1[:100000]) # Limit length for performance
-    doc2 = nlp(text2[:100000])
+    disable = get_disabled(SIMILARITY_DISABLE)
+    doc1 = nlp(text1[:100000], disable=disable) # Limit length for performance
+    doc2 = nlp(text2[:100000], disable=disable)
     
     return doc1.similarity(doc2)
 
+@timed("education")
 def detect_education(text):
     """
     Heuristic to detect education level/qualifications.
@@ -185,6 +232,208 @@ def get_tfidf_similarity(text1, text2):
     except:
         return 0.0
 
+# Same tokenization/stop words as the vectorizer in get_tfidf_similarity
+tfidf_analyzer = TfidfVectorizer(stop_words='english').build_analyzer()
+
+# Smoothed IDF of a term found in only one of two documents: ln(3/2) + 1.
+# Terms found in both get ln(3/3) + 1 = 1.
+PAIR_IDF_SINGLE = math.log(1.5) + 1.0
+
+def get_tfidf_similarity_from_counts(counts1, counts2):
+    """
+    Same score as get_tfidf_similarity, but from pre-computed term counts,
+    so one side (the JD) can be analyzed once and reused.
+    """
+    if not counts1 or not counts2:
+        return 0.0
+
+    def norm(counts, other):
+        return math.sqrt(sum((tf * (1.0 if term in other else PAIR_IDF_SINGLE)) ** 2
+                             for term, tf in counts.items()))
+
+    dot = sum(tf * counts2[term] for term, tf in counts1.items() if term in counts2)
+    if not dot:
+        return 0.0
+    return dot / (norm(counts1, counts2) * norm(counts2, counts1))
+
+@timed("doc_vector")
+def get_doc_vector(text, doc=None):
+    """
+    Returns (vector, norm) of the text's spaCy doc, the only parts of the doc
+    that similarity needs. `doc` may come from nlp.pipe (batch path).
+    """
+    nlp = get_nlp()
+    if not nlp:
+        return None, 0.0
+    if doc is None:
+        doc = nlp(text[:100000], disable=get_disabled(SIMILARITY_DISABLE))
+    return doc.vector, doc.vector_norm
+
+def get_vector_similarity(vector1, norm1, vector2, norm2):
+    """
+    Cosine similarity of two stored vectors, equal bit for bit to the
+    matching cosine_matrix entry. The dot product is the float64 sum of the
+    elementwise products (BLAS dot and matmul would each round differently),
+    so it can differ from spaCy's float32 Doc.similarity by about 1e-8.
+    """
+    if vector1 is None or vector2 is None or norm1 == 0 or norm2 == 0:
+        return 0.0
+    dot = np.multiply(np.asarray(vector1, dtype=np.float64), np.asarray(vector2, dtype=np.float64)).sum()
+    return float(dot / (norm1 * norm2))
+
+def cosine_matrix(vectors1, norms1, vectors2, norms2, chunk_bytes=64 * 1024 * 1024):
+    """
+    get_vector_similarity for every pair of rows, (N x d) and (M x d) -> N x M.
+    Rows with a zero norm (e.g. missing vectors stored as zeros) score 0.
+    """
+    a = np.asarray(vectors1, dtype=np.float64)
+    b = np.asarray(vectors2, dtype=np.float64)
+    dots = np.zeros((len(a), len(b)))
+    if a.size and b.size:
+        step = max(1, chunk_bytes // (8 * b.size))
+        for start in range(0, len(a), step):
+            dots[start:start + step] = (a[start:start + step, None, :] * b[None, :, :]).sum(axis=-1)
+    denom = np.outer(np.asarray(norms1, dtype=np.float64), np.asarray(norms2, dtype=np.float64))
+    return np.divide(dots, denom, out=np.zeros_like(dots), where=denom != 0)
+
+class SkillProfile:
+    """
+    The skills of a profile's text under one SkillTaxonomy: by category
+    (`skills`) and as the taxonomy's bitset (`skill_bits`). After a taxonomy
+    reload they are re-extracted from the text the first time the profile is
+    scored under the new version.
+    """
+    def set_skills(self, skills, taxonomy):
+        self.skills = skills
+        self.skill_bits = bits = taxonomy.bits_of(skills)
+        self.taxonomy = taxonomy
+        return bits
+
+    def skill_bits_for(self, taxonomy):
+        """ skill_bits under `taxonomy`. """
+        if self.taxonomy is taxonomy:
+            return self.skill_bits
+        if self.taxonomy.digest == taxonomy.digest:
+            return self.set_skills(self.skills, taxonomy)
+        return self.set_skills(extract_categorized_skills(self.text, taxonomy), taxonomy)
+
+class JobProfile(SkillProfile):
+    """
+    Everything derived from a job description, computed once and reused
+    for every CV matched against it. With a ready corpus `tfidf_index`
+    (see tfidf_index.py) the TF-IDF score uses corpus-wide IDF instead of
+    the two-document pair. `doc` may come from nlp.pipe (batch path).
+    `weight_profile` overrides the score weights (see resolve_weights).
+    """
+    def __init__(self, jd_text, tfidf_index=None, doc=None, weight_profile=None):
+        self.text = jd_text
+        self.tfidf_index = tfidf_index
+        self.weight_profile = weight_profile
+        self.experience = detect_experience_level(jd_text)
+        taxonomy = get_skill_taxonomy()
+        self.set_skills(extract_categorized_skills(jd_text, taxonomy), taxonomy)
+        self.education = detect_education(jd_text)
+        self.vector, self.vector_norm = get_doc_vector(jd_text, doc)
+        self.tfidf_counts = Counter(tfidf_analyzer(jd_text))
+
+    @timed("semantic")
+    def semantic_similarity(self, cv):
+        if self.vector is None:
+            return 0.0
+        # Doc.similarity short-circuits identical documents to 1.0
+        if cv.text[:100000] == self.text[:100000]:
+            return 1.0
+        return get_vector_similarity(cv.vector, cv.vector_norm, self.vector, self.vector_norm)
+
+    @timed("tfidf")
+    def tfidf_similarity(self, cv_text):
+        return self.tfidf_similarities([cv_text])[0]
+
+    @timed("tfidf_batch")
+    def tfidf_similarities(self, cv_texts):
+        """ TF-IDF scores for many CVs; one sparse product when the index is ready. """
+        cv_counts = [Counter(tfidf_analyzer(text)) for text in cv_texts]
+        if self.tfidf_index is not None and self.tfidf_index.ready:
+            return self.tfidf_index.similarities(cv_counts, self.tfidf_counts)
+        return [get_tfidf_similarity_from_counts(counts, self.tfidf_counts) for counts in cv_counts]
+
+class CVProfile(SkillProfile):
+    """
+    Everything derived from a CV on its own (no JD involved). It is what the
+    feature cache stores, so a known CV can be re-scored without parsing or
+    running spaCy again. `skills` were extracted under `taxonomy` (default:
+    the current one); cached or pickled profiles from another taxonomy
+    version get theirs re-extracted.
+    """
+    def __init__(self, text, experience, skills, education, name, vector, vector_norm, taxonomy=None):
+        self.text = text
+        self.experience = experience
+        self.set_skills(skills, taxonomy or get_skill_taxonomy())
+        self.education = education
+        self.name = name
+        self.vector = vector
+        self.vector_norm = vector_norm
+
+    @classmethod
+    def from_text(cls, text, cv_doc=None, name_doc=None):
+        vector, vector_norm = get_doc_vector(text, cv_doc)
+        taxonomy = get_skill_taxonomy()
+        return cls(
+            text,
+            detect_experience_level(text),
+            extract_categorized_skills(text, taxonomy),
+            detect_education(text),
+            extract_name(text, name_doc),
+            vector,
+            vector_norm,
+            taxonomy
+        )
+
+    def __getstate__(self):
+        # Bitsets are per process: profiles cross to and from scoring workers by skill name
+        state = dict(self.__dict__, taxonomy=self.taxonomy.digest)
+        del state["skill_bits"]
+        return state
+
+    def __setstate__(self, state):
+        digest = state.pop("taxonomy")
+        self.__dict__.update(state)
+        taxonomy = get_skill_taxonomy()
+        skills = self.skills if digest == taxonomy.digest else extract_categorized_skills(self.text, taxonomy)
+        self.set_skills(skills, taxonomy)
+
+    def to_dict(self):
+        return {
+            "text": self.text,
+            "experience": self.experience,
+            "skills": {k: sorted(v) for k, v in self.skills.items()},
+            "taxonomy": self.taxonomy.digest,
+            "education": self.education,
+            "name": self.name,
+            "vector": self.vector.tolist() if self.vector is not None else None,
+            "vector_norm": self.vector_norm
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        vector = data.get("vector")
+        # Skills cached under another taxonomy (or before versions were kept) are extracted again
+        taxonomy = get_skill_taxonomy()
+        if data.get("taxonomy") == taxonomy.digest:
+            skills = {k: set(v) for k, v in data["skills"].items()}
+        else:
+            skills = extract_categorized_skills(data["text"], taxonomy)
+        return cls(
+            data["text"],
+            data["experience"],
+            skills,
+            data["education"],
+            data["name"],
+            np.array(vector, dtype=np.float32) if vector is not None else None,
+            data["vector_norm"],
+            taxonomy
+        )
+
 def calculate_experience_match(cv_exp, jd_exp):
     """
     Returns a score (0.0 to 1.0) based on experience level match.
@@ -247,13 +496,17 @@ def compare_education(cv_edu, jd_edu):
     else:
         return "Below Requirements", "danger"
 
-def extract_name(text):
+@timed("name")
+def extract_name(text, doc=None):
     """
     Extracts candidate name from CV text.
     First tries SpaCy NER, then falls back to first lines.
+    `doc` may be a pre-computed doc of the first 1000 chars (batch path).
     """
+    nlp = get_nlp()
     if nlp:
-        doc = nlp(text[:1000]) # Check first 1000 chars
+        if doc is None:
+            doc = nlp(text[:1000], disable=get_disabled(NAME_DISABLE)) # Check first 1000 chars
         for ent in doc.ents:
             if ent.label_ == "PERSON":
                 # Basic cleaning
@@ -270,6 +523,7 @@ def extract_name(text):
             
     return "Candidate"
 
+@timed("summary")
 def generate_summary(cv_text, name, results):
     """
     Generates a 2-line professional summary.
@@ -291,7 +545,263 @@ def generate_summary(cv_text, name, results):
         
     return f"{line1} {line2}"
 
-def calculate_cv_jd_match(cv_text, jd_text):
+# Weighted Final Score Logic
+# New Standard Config:
+# Semantic: 30%, TF-IDF: 20%, Skills: 30%, Exp: 10%, Edu: 10%
+SCORE_WEIGHTS = {
+    "semantic": 0.30,
+    "tfidf": 0.20,
+    "skills": 0.30,
+    "exp": 0.10,
+    "edu": 0.10
+}
+
+# Semantic below the threshold with skill overlap above the minimum usually
+# means missing vectors: redistribute the semantic weight to Skills and TF-IDF
+LOW_SEMANTIC_THRESHOLD = 0.1
+LOW_SEMANTIC_MIN_SKILLS = 0.3
+LOW_SEMANTIC_WEIGHTS = {
+    "semantic": 0.0,
+    "tfidf": 0.35,
+    "skills": 0.45,
+    "exp": 0.10,
+    "edu": 0.10
+}
+
+# Dampen 100% and invalid 0%
+SCORE_FLOOR = 0.05
+SCORE_CEILING = 0.98
+
+def resolve_weights(weight_profile=None):
+    """
+    (weights, low_semantic_weights) for a weight profile, a dict with optional
+    "weights" and "low_semantic_weights" maps; missing entries keep the defaults.
+    Raises ValueError for unknown components or weights that aren't >= 0 numbers.
+    """
+    if not weight_profile:
+        return SCORE_WEIGHTS, LOW_SEMANTIC_WEIGHTS
+    unknown = set(weight_profile) - {"weights", "low_semantic_weights"}
+    if unknown:
+        raise ValueError(f"Unknown weight profile keys: {', '.join(sorted(unknown))}")
+    resolved = []
+    for key, defaults in (("weights", SCORE_WEIGHTS), ("low_semantic_weights", LOW_SEMANTIC_WEIGHTS)):
+        overrides = weight_profile.get(key) or {}
+        unknown = set(overrides) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown score components: {', '.join(sorted(unknown))}")
+        for name, value in overrides.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not value >= 0:
+                raise ValueError(f"Weight '{name}' must be a number >= 0")
+        resolved.append({name: float(overrides.get(name, default)) for name, default in defaults.items()})
+    return tuple(resolved)
+
+# Shown with every result; the same for all candidates
+ANALYSIS_BASIS = (
+    {"criteria": "Semantic Similarity", "desc": "Contextual understanding of the text using AI models (SpaCy) to find meaning beyond keywords."},
+    {"criteria": "Technical Overlap", "desc": "Direct matching of hard skills and technologies required by the JD."},
+    {"criteria": "Experience Match", "desc": "Evaluation of years of experience and seniority level (Junior/Mid/Senior)."},
+    {"criteria": "Education Check", "desc": "Verification of academic requirements (Degrees, Certifications)."}
+)
+
+def empty_match_result():
+    """ Result for an unreadable CV or JD: a safe empty structure so the template doesn't crash. """
+    return {
+        "match_percentage": 0,
+        "confidence_score": 0,
+        "semantic_score": 0,
+        "tfidf_score": 0,
+        "skill_match_score": 0,
+        "experience_level": {"cv": "Unknown", "jd": "Unknown"},
+        "education": {"cv": ["Not Detected"], "jd": ["Not Specified"]},
+        "skills": {
+            "matched": [],
+            "missing": [],
+            "cv_categorized": {},
+            "jd_categorized": {}
+        },
+        "details": "Could not read text from files."
+    }
+
+@dataclass(slots=True)
+class MatchResult:
+    """
+    One CV-JD match in compact form: the raw score components, the final
+    score, both sides' experience and education (shared with the profiles,
+    not copied) and both sides' skills as bitsets of `taxonomy`.
+    `taxonomy_version` is the version the skills were extracted under (it
+    stays that of the stored result when a later taxonomy reads it back).
+    to_dict() renders the full result with skill lists and narratives only
+    when it is shown or returned; to_compact() is the stored form. `info`
+    carries caller fields (cv_filename, cv_hash, ...) into the rendered dict.
+    """
+    candidate_name: str
+    cv_experience: str
+    jd_experience: str
+    cv_education: list
+    jd_education: list
+    cv_skills: int
+    jd_skills: int
+    semantic: float
+    tfidf: float
+    skills: float
+    exp: float
+    edu: float
+    final: float
+    taxonomy: SkillTaxonomy
+    taxonomy_version: Optional[str]
+    info: Optional[dict] = None
+
+    @property
+    def match_percentage(self):
+        return round(self.final * 100, 2)
+
+    @property
+    def confidence(self):
+        # Agreement between semantic and TF-IDF
+        return 1.0 - abs(self.semantic - self.tfidf)
+
+    def component_scores(self):
+        """ Unrounded inputs of the weighted score, so stored results can be re-weighted. """
+        return {"semantic": self.semantic, "tfidf": self.tfidf, "skills": self.skills, "exp": self.exp, "edu": self.edu}
+
+    def to_dict(self):
+        """ The full result, as calculate_cv_jd_match returns it. """
+        cv_exp, jd_exp = self.cv_experience, self.jd_experience
+        taxonomy = self.taxonomy
+        cv_flat, jd_flat = self.cv_skills, self.jd_skills
+        common_skills = cv_flat & jd_flat
+        missing_skills = jd_flat & ~cv_flat
+        technical = taxonomy.category_masks.get('technical', 0)
+        matched_tech = taxonomy.skill_names(common_skills & technical)
+        missing_tech = taxonomy.skill_names(missing_skills & technical)
+        matched = taxonomy.skill_names(common_skills)
+
+        # --- Generate Narrative Insights ---
+        strengths = []
+        improvements = []
+
+        # 1. Experience Analysis
+        if self.exp == 1.0:
+            if cv_exp == jd_exp:
+                strengths.append(f"Experience Alignment: Demonstrates the required {cv_exp} seniority.")
+            elif "Senior" in cv_exp and "Junior" in jd_exp:
+                strengths.append("High Seniority: Candidate exceeds the minimum experience requirements.")
+            elif jd_exp == "Not Specified":
+                strengths.append("Experience Alignment: Background checks out with the job requirements.")
+        elif self.exp == 0.0:
+            improvements.append(f"Portfolio Alignment: Highlight projects or roles that demonstrate {jd_exp} level seniority.")
+
+        # 2. Skill Analysis
+        if self.skills >= 0.8:
+            strengths.append("Excellent overlap with the required technical technology stack.")
+        elif self.skills >= 0.5:
+            strengths.append("Good foundation in core required skills.")
+        else:
+            improvements.append("Skill Gap: The technical profile needs significant reinforcement for this role.")
+
+        # Highlighting specific strong matched / missing skills (Top 3)
+        if matched_tech:
+            strengths.append(f"Core Competency: Strong proficiency in {', '.join(matched_tech[:3]).title()}.")
+        if missing_tech:
+            improvements.append(f"Recommended Focus: Gain practical experience with {', '.join(missing_tech[:3]).title()}.")
+
+        # 3. Semantic Context
+        if self.semantic > 0.75:
+            strengths.append("Strategic Fit: Professional background closely mirrors the role objectives.")
+        elif self.semantic < 0.4:
+            improvements.append("Keyword Optimization: Align resume terminology with the industry standard language used in the JD.")
+
+        # Determine Education Match Status
+        edu_status, edu_class = compare_education(self.cv_education, self.jd_education)
+
+        # Determine Experience Match Status for UI
+        exp_status = "Meets Requirements"
+        exp_class = "success"
+        if self.exp == 1.0 and cv_exp == "Senior" and jd_exp == "Junior":
+            exp_status = "Exceeds Requirements"
+            exp_class = "success"
+        elif self.exp < 0.5 and jd_exp != "Not Specified":
+            exp_status = "Below Requirements"
+            exp_class = "danger"
+        elif jd_exp == "Not Specified":
+            exp_status = "Not Specified"
+            exp_class = "neutral"
+
+        # Partial results for summary gen
+        partial_results = {
+            "experience_level": {"cv": cv_exp},
+            "education": {"cv": self.cv_education},
+            "skills": {"matched": matched}
+        }
+
+        results = {
+            "candidate_name": self.candidate_name,
+            "candidate_summary": generate_summary(None, self.candidate_name, partial_results),
+            "match_percentage": self.match_percentage,
+            "confidence_score": round(self.confidence * 100, 2),
+            "semantic_score": round(self.semantic * 100, 2),
+            "tfidf_score": round(self.tfidf * 100, 2),
+            "skill_match_score": round(self.skills * 100, 2),
+            "component_scores": self.component_scores(),
+            "experience_level": {
+                "cv": cv_exp,
+                "jd": jd_exp
+            },
+            "education": {
+                "cv": self.cv_education,
+                "jd": self.jd_education
+            },
+            "qualification_comparison": {
+                "education": {"status": edu_status, "class": edu_class},
+                "experience": {"status": exp_status, "class": exp_class}
+            },
+            "key_strengths": strengths,
+            "areas_for_improvement": improvements,
+            "skills": {
+                "matched": matched,
+                "missing": taxonomy.skill_names(missing_skills),
+                "extra": taxonomy.skill_names(cv_flat & ~jd_flat),
+                "cv_categorized": taxonomy.categorized(cv_flat),
+                "jd_categorized": taxonomy.categorized(jd_flat)
+            },
+            "technical_skills_evaluation": [
+                {"skill": s, "status": "Strong Match"} for s in matched_tech
+            ] + [
+                {"skill": s, "status": "Missing"} for s in missing_tech
+            ],
+            "analysis_basis": [dict(item) for item in ANALYSIS_BASIS],
+            "taxonomy_version": self.taxonomy_version
+        }
+        if self.info:
+            results.update(self.info)
+        return results
+
+    def to_compact(self):
+        """ JSON-ready stored form; skills are kept by name, since IDs are per process. """
+        return {
+            "match_result": 1,
+            "name": self.candidate_name,
+            "experience": [self.cv_experience, self.jd_experience],
+            "education": [self.cv_education, self.jd_education],
+            "skills": [self.taxonomy.categorized(self.cv_skills), self.taxonomy.categorized(self.jd_skills)],
+            "scores": [self.semantic, self.tfidf, self.skills, self.exp, self.edu, self.final],
+            "taxonomy_version": self.taxonomy_version,
+            "info": self.info,
+        }
+
+    @classmethod
+    def from_compact(cls, data):
+        # Skills the current taxonomy lacks (stored under an older one) must not be interned into it
+        taxonomy, skill_bits = get_skill_taxonomy().resolve(data["skills"])
+        return cls(data["name"], *data["experience"], *data["education"], *skill_bits, *data["scores"],
+                   taxonomy, data.get("taxonomy_version"), info=data.get("info"))
+
+    @staticmethod
+    def is_compact(data):
+        return isinstance(data, dict) and data.get("match_result") == 1
+
+@timed("match")
+def compute_match(cv_text, jd_text, cv_doc=None, name_doc=None, tfidf_score=None, semantic_score=None):
     """
     Advanced matching function combining:
     1. Semantic Similarity (spaCy)
@@ -299,76 +809,55 @@ def calculate_cv_jd_match(cv_text, jd_text):
     3. Skill Overlap
     4. Experience Match
     5. Education Match
+
+    `jd_text` may be the raw JD text or a JobProfile built from it; pass a
+    JobProfile when matching many CVs against the same JD. Likewise `cv_text`
+    may be a CVProfile (e.g. from the feature cache). `cv_doc`, `name_doc`,
+    `tfidf_score` and `semantic_score` are optional values pre-computed by
+    calculate_batch_match / match_cv_against_jds.
+    Returns a MatchResult, or None when either document is empty.
     """
+    job = jd_text if isinstance(jd_text, JobProfile) else None
+    if job is not None:
+        jd_text = job.text
+    cv = cv_text if isinstance(cv_text, CVProfile) else None
+    if cv is not None:
+        cv_text = cv.text
+
     if not cv_text or not jd_text:
-        # Return a safe empty structure so the template doesn't crash
-        return {
-            "match_percentage": 0,
-            "confidence_score": 0,
-            "semantic_score": 0,
-            "tfidf_score": 0,
-            "skill_match_score": 0,
-            "experience_level": {"cv": "Unknown", "jd": "Unknown"},
-            "education": {"cv": ["Not Detected"], "jd": ["Not Specified"]},
-            "skills": {
-                "matched": [],
-                "missing": [],
-                "cv_categorized": {},
-                "jd_categorized": {}
-            },
-            "details": "Could not read text from files."
-        }
+        return None
+
+    if job is None:
+        job = JobProfile(jd_text)
+    if cv is None:
+        cv = CVProfile.from_text(cv_text, cv_doc, name_doc)
 
     # 1. Experience Level
-    cv_exp = detect_experience_level(cv_text)
-    jd_exp = detect_experience_level(jd_text)
-    exp_score = calculate_experience_match(cv_exp, jd_exp)
+    exp_score = calculate_experience_match(cv.experience, job.experience)
 
-    # 2. Skill Extraction
-    cv_skills = extract_categorized_skills(cv_text)
-    jd_skills = extract_categorized_skills(jd_text)
-    
-    # Flatten skills for overlap calc
-    cv_flat = set().union(*cv_skills.values())
-    jd_flat = set().union(*jd_skills.values())
-    
-    common_skills = cv_flat.intersection(jd_flat)
-    missing_skills = jd_flat - cv_flat
-    
-    skill_match_ratio = len(common_skills) / len(jd_flat) if jd_flat else 0.0
+    # 2. Skill Overlap, on the skill bitsets of the current taxonomy
+    taxonomy = get_skill_taxonomy()
+    cv_skill_bits = cv.skill_bits_for(taxonomy)
+    jd_skill_bits = job.skill_bits_for(taxonomy)
+    jd_count = jd_skill_bits.bit_count()
+    skill_match_ratio = (cv_skill_bits & jd_skill_bits).bit_count() / jd_count if jd_count else 0.0
 
     # 3. Education Match
-    cv_edu = detect_education(cv_text)
-    jd_edu = detect_education(jd_text)
-    edu_score = calculate_education_match(cv_edu, jd_edu)
+    edu_score = calculate_education_match(cv.education, job.education)
 
     # 4. Semantic & TF-IDF
-    semantic_score = get_semantic_similarity(cv_text, jd_text)
-    tfidf_score = get_tfidf_similarity(cv_text, jd_text)
-    
-    # Weighted Final Score Logic
-    # New Standard Config:
-    # Semantic: 30%, TF-IDF: 20%, Skills: 30%, Exp: 10%, Edu: 10%
+    if semantic_score is None:
+        semantic_score = job.semantic_similarity(cv)
+    if tfidf_score is None:
+        tfidf_score = job.tfidf_similarity(cv_text)
     
-    weights = {
-        "semantic": 0.30,
-        "tfidf": 0.20,
-        "skills": 0.30, 
-        "exp": 0.10,
-        "edu": 0.10
-    }
+    # Weighted Final Score Logic (see SCORE_WEIGHTS)
+    weights, low_semantic_weights = resolve_weights(job.weight_profile)
 
     # Dynamic adjustment for missing vectors (Low Semantic but High Skills)
-    if semantic_score < 0.1 and skill_match_ratio > 0.3:
+    if semantic_score < LOW_SEMANTIC_THRESHOLD and skill_match_ratio > LOW_SEMANTIC_MIN_SKILLS:
         print("Warning: Low semantic score detected. Adjusting weights.")
-        # Redistribute semantic weight to Skills and TF-IDF
-        weights = {
-            "semantic": 0.0,
-            "tfidf": 0.35,
-            "skills": 0.45,
-            "exp": 0.10,
-            "edu": 0.10
-        }
+        weights = low_semantic_weights
 
     final_score = (semantic_score * weights["semantic"]) + \
                   (tfidf_score * weights["tfidf"]) + \
@@ -378,122 +867,168 @@ def calculate_cv_jd_match(cv_text, jd_text):
     
     # Dampen 100% and invalid 0%
     # Ensure a small baseline for document structure match if non-empty
-    if final_score < 0.05: final_score = 0.05
-    if final_score > 0.98: final_score = 0.98 
-    
-    # Confidence Score (based on agreement between semantic and TF-IDF)
-    divergence = abs(semantic_score - tfidf_score)
-    # --- Generate Narrative Insights ---
-    strengths = []
-    improvements = []
-    
-    # 1. Experience Analysis
-    if exp_score == 1.0:
-        if cv_exp == jd_exp:
-            strengths.append(f"Experience Alignment: Demonstrates the required {cv_exp} seniority.")
-        elif "Senior" in cv_exp and "Junior" in jd_exp:
-            strengths.append("High Seniority: Candidate exceeds the minimum experience requirements.")
-        elif jd_exp == "Not Specified":
-            strengths.append("Experience Alignment: Background checks out with the job requirements.")
-    elif exp_score == 0.0:
-        improvements.append(f"Portfolio Alignment: Highlight projects or roles that demonstrate {jd_exp} level seniority.")
-
-    # 2. Skill Analysis
-    if skill_match_ratio >= 0.8:
-        strengths.append("Excellent overlap with the required technical technology stack.")
-    elif skill_match_ratio >= 0.5:
-        strengths.append("Good foundation in core required skills.")
+    if final_score < SCORE_FLOOR: final_score = SCORE_FLOOR
+    if final_score > SCORE_CEILING: final_score = SCORE_CEILING
+
+    return MatchResult(cv.name, cv.experience, job.experience, cv.education, job.education,
+                       cv_skill_bits, jd_skill_bits, semantic_score, tfidf_score, skill_match_ratio,
+                       exp_score, edu_score, final_score, taxonomy, taxonomy.version)
+
+def calculate_cv_jd_match(cv_text, jd_text, cv_doc=None, name_doc=None, tfidf_score=None, semantic_score=None):
+    """
+    compute_match rendered to the full result dict (see MatchResult.to_dict),
+    or the empty structure when either document is empty.
+    """
+    result = compute_match(cv_text, jd_text, cv_doc, name_doc, tfidf_score, semantic_score)
+    return result.to_dict() if result is not None else empty_match_result()
+
+@timed("cv_profiles_batch")
+def build_cv_profiles(cvs, batch_size=32, n_process=1):
+    """
+    Builds a CVProfile for every CV text, running spaCy over all of them with
+    nlp.pipe: once for similarity (no parser/NER) and once for names (NER
+    only). Items that are already CVProfiles are passed through untouched.
+    """
+    cvs = list(cvs)
+    texts = [cv for cv in cvs if not isinstance(cv, CVProfile)]
+
+    nlp = get_nlp()
+    if nlp:
+        cv_docs = nlp.pipe((t[:100000] for t in texts), batch_size=batch_size,
+                           n_process=n_process, disable=get_disabled(SIMILARITY_DISABLE))
+        name_docs = nlp.pipe((t[:1000] for t in texts), batch_size=batch_size,
+                             n_process=n_process, disable=get_disabled(NAME_DISABLE))
     else:
-        improvements.append("Skill Gap: The technical profile needs significant reinforcement for this role.")
-        
-    # Highlighting specific strong matched skills (Top 3)
-    matched_tech = [s for s in common_skills if s in cv_skills.get('technical', set())]
-    if matched_tech:
-        top_skills = list(matched_tech)[:3]
-        strengths.append(f"Core Competency: Strong proficiency in {', '.join(top_skills).title()}.")
-
-    # Highlighting specific missing skills (Top 3)
-    missing_tech = [s for s in missing_skills if s in jd_skills.get('technical', set())]
-    if missing_tech:
-        top_missing = list(missing_tech)[:3]
-        improvements.append(f"Recommended Focus: Gain practical experience with {', '.join(top_missing).title()}.")
-    
-    # 3. Semantic Context
-    if semantic_score > 0.75:
-        strengths.append("Strategic Fit: Professional background closely mirrors the role objectives.")
-    elif semantic_score < 0.4:
-        improvements.append("Keyword Optimization: Align resume terminology with the industry standard language used in the JD.")
+        cv_docs = name_docs = [None] * len(texts)
 
-    confidence = 1.0 - divergence
+    built = iter([CVProfile.from_text(text, cv_doc, name_doc)
+                  for text, cv_doc, name_doc in zip(texts, cv_docs, name_docs)])
+    return [cv if isinstance(cv, CVProfile) else next(built) for cv in cvs]
 
-    # Determine Education Match Status
-    edu_status, edu_class = compare_education(cv_edu, jd_edu)
-    
-    # Determine Experience Match Status for UI
-    exp_status = "Meets Requirements"
-    exp_class = "success"
-    if exp_score == 1.0 and cv_exp == "Senior" and jd_exp == "Junior":
-        exp_status = "Exceeds Requirements"
-        exp_class = "success"
-    elif exp_score < 0.5 and jd_exp != "Not Specified":
-        exp_status = "Below Requirements"
-        exp_class = "danger"
-    elif jd_exp == "Not Specified":
-        exp_status = "Not Specified"
-        exp_class = "neutral"
-
-    # New: Extract Name and Generate Summary
-    candidate_name = extract_name(cv_text)
-    
-    # Partial results for summary gen
-    partial_results = {
-        "experience_level": {"cv": cv_exp},
-        "education": {"cv": cv_edu},
-        "skills": {"matched": list(common_skills)}
-    }
-    candidate_summary = generate_summary(cv_text, candidate_name, partial_results)
+@timed("batch_match")
+def calculate_batch_match(cvs, jd_text, batch_size=32, n_process=1, render=True):
+    """
+    Scores many CVs (texts or CVProfiles) against one JD, batching the spaCy
+    work through build_cv_profiles and every component through one
+    score_matrix pass. Returns results in input order, identical to
+    calculate_cv_jd_match; with render=False, compute_match's MatchResults
+    (None for empty CVs) are returned unrendered.
+    """
+    from score_matrix import score_matrix  # score_matrix imports this module
 
-    return {
-        "candidate_name": candidate_name,
-        "candidate_summary": candidate_summary,
-        "match_percentage": round(final_score * 100, 2),
-        "confidence_score": round(confidence * 100, 2),
-        "semantic_score": round(semantic_score * 100, 2),
-        "tfidf_score": round(tfidf_score * 100, 2),
-        "skill_match_score": round(skill_match_ratio * 100, 2),
-        "experience_level": {
-            "cv": cv_exp,
-            "jd": jd_exp
-        },
-        "education": {
-            "cv": detect_education(cv_text),
-            "jd": detect_education(jd_text)
-        },
-        "qualification_comparison": {
-            "education": {"status": edu_status, "class": edu_class},
-            "experience": {"status": exp_status, "class": exp_class}
-        },
-        "key_strengths": strengths,
-        "areas_for_improvement": improvements,
-        "skills": {
-            "matched": list(common_skills),
-            "missing": list(missing_skills),
-            "extra": list(cv_flat - jd_flat),
-            "cv_categorized": {k: list(v) for k, v in cv_skills.items()},
-            "jd_categorized": {k: list(v) for k, v in jd_skills.items()}
-        },
-        "technical_skills_evaluation": [
-            {"skill": s, "status": "Strong Match"} for s in common_skills if s in cv_skills.get('technical', [])
-        ] + [
-            {"skill": s, "status": "Missing"} for s in missing_skills if s in jd_skills.get('technical', [])
-        ],
-        "analysis_basis": [
-            {"criteria": "Semantic Similarity", "desc": "Contextual understanding of the text using AI models (SpaCy) to find meaning beyond keywords."},
-            {"criteria": "Technical Overlap", "desc": "Direct matching of hard skills and technologies required by the JD."},
-            {"criteria": "Experience Match", "desc": "Evaluation of years of experience and seniority level (Junior/Mid/Senior)."},
-            {"criteria": "Education Check", "desc": "Verification of academic requirements (Degrees, Certifications)."}
-        ]
-    }
+    job = jd_text if isinstance(jd_text, JobProfile) else JobProfile(jd_text)
+    profiles = build_cv_profiles(cvs, batch_size=batch_size, n_process=n_process)
+    taxonomy = get_skill_taxonomy()
+    scores = {name: matrix[:, 0].tolist() for name, matrix in score_matrix(profiles, [job], taxonomy=taxonomy).items()}
+    jd_skill_bits = job.skill_bits_for(taxonomy)
+
+    results = []
+    for i, cv in enumerate(profiles):
+        result = None
+        if cv.text and job.text:
+            result = MatchResult(cv.name, cv.experience, job.experience, cv.education, job.education,
+                                 cv.skill_bits_for(taxonomy), jd_skill_bits, scores["semantic"][i],
+                                 scores["tfidf"][i], scores["skills"][i], scores["exp"][i], scores["edu"][i],
+                                 scores["final"][i], taxonomy, taxonomy.version)
+        if render:
+            result = result.to_dict() if result is not None else empty_match_result()
+        results.append(result)
+    return results
+
+def stack_vectors(profiles):
+    """ (N x d vectors, N norms) of CV/Job profiles; missing vectors become zero rows with norm 0. """
+    dim = next((len(p.vector) for p in profiles if p.vector is not None), 0)
+    vectors = np.zeros((len(profiles), dim))
+    norms = np.zeros(len(profiles))
+    for i, p in enumerate(profiles):
+        if p.vector is not None:
+            vectors[i] = p.vector
+            norms[i] = p.vector_norm
+    return vectors, norms
+
+def semantic_matrix(cvs, jobs, job_vectors=None):
+    """ JobProfile.semantic_similarity for every (CV, JD) pair, as an N x M array. """
+    vectors, norms = job_vectors if job_vectors is not None else stack_vectors(jobs)
+    scores = cosine_matrix(*stack_vectors(cvs), vectors, norms)
+    # JDs without vectors score 0; Doc.similarity short-circuits identical documents to 1.0
+    has_vector = np.array([job.vector is not None for job in jobs], dtype=bool)
+    scores[:, ~has_vector] = 0.0
+    heads = {}
+    for j, job in enumerate(jobs):
+        if has_vector[j]:
+            heads.setdefault(job.text[:100000], []).append(j)
+    for i, cv in enumerate(cvs):
+        for j in heads.get(cv.text[:100000], ()):
+            scores[i, j] = 1.0
+    return scores
+
+class JobProfileSet:
+    """
+    Many JobProfiles prepared for scoring one CV against all of them: the JD
+    vectors are stacked into one matrix, so the semantic scores for every JD
+    are a single matrix-vector product, and with a ready corpus index the
+    TF-IDF scores are one sparse product against the JDs' TF-IDF rows.
+    """
+    def __init__(self, jobs, tfidf_index=None):
+        self.jobs = [job if isinstance(job, JobProfile) else JobProfile(job, tfidf_index=tfidf_index) for job in jobs]
+        self.tfidf_index = tfidf_index if tfidf_index is not None else next(
+            (job.tfidf_index for job in self.jobs if job.tfidf_index is not None), None)
+        self.vectors, self.norms = stack_vectors(self.jobs)
+        self._tfidf_rows = None  # (index version, JD TF-IDF rows)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def semantic_similarities(self, cv):
+        """ JobProfile.semantic_similarity for every JD, in JD order. """
+        return semantic_matrix([cv], self.jobs, job_vectors=(self.vectors, self.norms))[0].tolist()
+
+    def tfidf_similarities(self, cv_text):
+        """ JobProfile.tfidf_similarity for every JD, in JD order. """
+        cv_counts = Counter(tfidf_analyzer(cv_text))
+        index = self.tfidf_index
+        if index is None or not index.ready:
+            return [get_tfidf_similarity_from_counts(cv_counts, job.tfidf_counts) for job in self.jobs]
+        if not cv_counts:
+            return [0.0] * len(self.jobs)
+        version = index.version
+        if self._tfidf_rows is None or self._tfidf_rows[0] != version:
+            self._tfidf_rows = (version, index.transform([job.tfidf_counts for job in self.jobs]))
+        return index.similarities_to(self._tfidf_rows[1], cv_counts)
+
+def build_job_profiles(jd_texts, tfidf_index=None, batch_size=32):
+    """ JobProfiles for many JD texts, running spaCy over all of them with nlp.pipe. """
+    jd_texts = list(jd_texts)
+    nlp = get_nlp()
+    if nlp:
+        docs = nlp.pipe((t[:100000] for t in jd_texts), batch_size=batch_size,
+                        disable=get_disabled(SIMILARITY_DISABLE))
+    else:
+        docs = [None] * len(jd_texts)
+    return [JobProfile(text, tfidf_index=tfidf_index, doc=doc) for text, doc in zip(jd_texts, docs)]
+
+def match_cv_against_jds(cv, jobs, top=None):
+    """
+    Reverse matching: scores one CV (text or CVProfile) against many JDs (a
+    JobProfileSet, or a list of JD texts / JobProfiles). The semantic and
+    TF-IDF scores for all JDs are computed in one vectorized pass; the rest
+    is calculate_cv_jd_match. Returns results ranked by match percentage,
+    each with `jd_index`, the JD's position in `jobs`.
+    """
+    job_set = jobs if isinstance(jobs, JobProfileSet) else JobProfileSet(jobs)
+    if not isinstance(cv, CVProfile):
+        cv = CVProfile.from_text(cv)
+
+    semantic_scores = job_set.semantic_similarities(cv)
+    tfidf_scores = job_set.tfidf_similarities(cv.text)
+    results = []
+    for i, (job, semantic_score, tfidf_score) in enumerate(zip(job_set.jobs, semantic_scores, tfidf_scores)):
+        result = compute_match(cv, job, tfidf_score=tfidf_score, semantic_score=semantic_score)
+        results.append((result.match_percentage if result is not None else 0, i, result))
+    # Only the returned results are rendered
+    results.sort(key=lambda x: x[0], reverse=True)
+    return [dict(result.to_dict() if result is not None else empty_match_result(), jd_index=i)
+            for _, i, result in (results[:top] if top else results)]
 
 if __name__ == "__main__":
     # Sample Data
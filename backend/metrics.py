@@ -0,0 +1,147 @@
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Stage timers, counters and histograms, exposed in the Prometheus text format
+# on /metrics. With METRICS_ENABLED=0, timed() leaves functions untouched and
+# timer()/inc()/observe() return immediately.
+#
+# Values live in the process that records them: with SCORING_PROCESSES > 0 or
+# several gunicorn workers, each process reports its own.
+
+ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+PREFIX = "hr_"
+
+# Seconds; stages range from sub-millisecond lookups to multi-second PDFs
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "stage_duration_seconds": "Time spent per pipeline stage.",
+    "documents_total": "Documents read, by format.",
+    "document_bytes_total": "Bytes of documents read, by format.",
+    "pdf_pages_total": "PDF pages extracted.",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[str, Dict[Labels, float]] = {}
+# name -> labels -> [bucket counts..., +Inf count, sum]
+_histograms: Dict[str, Dict[Labels, list]] = {}
+_buckets: Dict[str, Tuple[float, ...]] = {}
+_null_timer = contextlib.nullcontext()
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    """Add to a counter."""
+    if not ENABLED:
+        return
+    key = _labels(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+
+def observe(name: str, value: float, buckets: Tuple[float, ...] = DURATION_BUCKETS, **labels) -> None:
+    """Record one value in a histogram."""
+    if not ENABLED:
+        return
+    key = _labels(labels)
+    with _lock:
+        buckets = _buckets.setdefault(name, buckets)
+        series = _histograms.setdefault(name, {})
+        counts = series.get(key)
+        if counts is None:
+            counts = series[key] = [0] * (len(buckets) + 2)
+        counts[bisect.bisect_left(buckets, value)] += 1
+        counts[-1] += value
+
+
+class _StageTimer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe("stage_duration_seconds", time.perf_counter() - self.start, stage=self.stage)
+        return False
+
+
+def timer(stage: str):
+    """`with timer("stage"):` records the block's duration under that stage."""
+    return _StageTimer(stage) if ENABLED else _null_timer
+
+
+def timed(stage: str):
+    """Decorator form of timer(); a no-op when metrics are disabled."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe("stage_duration_seconds", time.perf_counter() - start, stage=stage)
+        return wrapper
+    return decorate
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    with _lock:
+        for name, series in sorted(_counters.items()):
+            full = PREFIX + name
+            lines.append(f"# HELP {full} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {full} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+        for name, series in sorted(_histograms.items()):
+            full = PREFIX + name
+            buckets = _buckets[name]
+            lines.append(f"# HELP {full} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {full} histogram")
+            for labels, counts in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f"{full}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{full}_sum{_format_labels(labels)} {_format_value(counts[-1])}")
+                lines.append(f"{full}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _buckets.clear()
@@ -0,0 +1,105 @@
+import multiprocessing
+import sqlite3
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from document_validator import validate_cv
+from feature_cache import FeatureCache, content_hash
+from match import CVProfile, get_nlp, read_bytes
+
+# Per-process state, set up once by _init_worker
+_worker_cache: Optional[FeatureCache] = None
+
+
+def load_cv_profile(data: bytes, filename: str, cache: Optional[FeatureCache] = None) -> Tuple[Optional[CVProfile], str, Optional[str]]:
+    """
+    Parse, validate and profile one uploaded CV from its bytes, using the
+    feature cache when given. This is the CPU-heavy part of scoring
+    (PDF parsing + spaCy); `filename` only selects the parser.
+    Returns (cv_profile, cache_key, error).
+    """
+    cache_key = content_hash(data)
+
+    cached = None
+    if cache is not None:
+        try:
+            cached = cache.get(cache_key)
+        except sqlite3.Error as e:
+            print(f"Feature cache unavailable: {e}")
+    cv_text = cached["text"] if cached else read_bytes(data, filename)
+
+    is_valid_cv, cv_conf, cv_reason = validate_cv(cv_text)
+    if not is_valid_cv:
+        return None, cache_key, f"Invalid CV: {cv_reason}"
+
+    if cached:
+        return CVProfile.from_dict(cached), cache_key, None
+    cv_profile = CVProfile.from_text(cv_text)
+    if cache is not None:
+        try:
+            cache.put(cache_key, cv_profile.to_dict())
+        except sqlite3.Error as e:
+            print(f"Feature cache unavailable: {e}")
+    return cv_profile, cache_key, None
+
+
+def _init_worker(cache_path: Optional[str], cache_max_entries: int, cache_max_bytes: int) -> None:
+    """Runs once in each worker process: load the spaCy model and open the cache."""
+    global _worker_cache
+    get_nlp()
+    if cache_path:
+        _worker_cache = FeatureCache(cache_path, max_entries=cache_max_entries, max_bytes=cache_max_bytes)
+
+
+def _profile_in_worker(data: bytes, filename: str) -> Tuple[Optional[CVProfile], Optional[str], Optional[str]]:
+    try:
+        return load_cv_profile(data, filename, _worker_cache)
+    except Exception as e:
+        return None, None, str(e)
+
+
+class ParallelScorer:
+    """
+    Spreads CV parsing and profiling (PDF parsing + spaCy) over a pool of
+    worker processes; each worker loads the spaCy model once at startup.
+    The pool returns CVProfiles; callers do the cheap final scoring in their
+    own process (match.calculate_batch_match), so results match the serial
+    path exactly.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache: Optional[FeatureCache] = None,
+                 start_method: str = "spawn"):
+        self.max_workers = max_workers
+        self.cache = cache
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Started on first use, so importing the app never forks
+        if self._executor is None:
+            cache = self.cache
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(cache.path if cache else None,
+                          cache.max_entries if cache else 0,
+                          cache.max_bytes if cache else 0),
+            )
+        return self._executor
+
+    def submit(self, data: bytes, filename: str) -> Future:
+        """Profile one file's bytes in the pool; the future yields (cv_profile, cache_key, error)."""
+        return self.executor.submit(_profile_in_worker, data, filename)
+
+    def profile_files(self, files: List[Tuple[bytes, str]], chunksize: int = 1) -> List[Tuple[Optional[CVProfile], Optional[str], Optional[str]]]:
+        """(cv_profile, cache_key, error) for every (bytes, filename) pair, in input order."""
+        datas = [data for data, _ in files]
+        filenames = [filename for _, filename in files]
+        return list(self.executor.map(_profile_in_worker, datas, filenames, chunksize=chunksize))
+
+    def shutdown(self, cancel_futures: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=cancel_futures)
+            self._executor = None
@@ -0,0 +1,133 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+import pdfplumber
+
+try:
+    # Ships with pdfplumber >= 0.11; without it every PDF takes the layout path
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# 'layout' = pdfplumber's layout analysis, 'fast' = plain text from pdfium.
+# The engines space and order some text differently, so switching changes
+# the extracted text (and scores) of existing PDFs
+PDF_ENGINE = os.environ.get('PDF_ENGINE', 'layout')
+# Extraction stops at whichever budget is reached first (0 = no limit)
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 100000))
+# Worker processes for page-parallel layout extraction of long PDFs (0 = off)
+PDF_PAGE_WORKERS = int(os.environ.get('PDF_PAGE_WORKERS', 0))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 24))
+PDF_PAGES_PER_TASK = 8
+
+PdfSource = Union[str, bytes, BinaryIO]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _page_pool(workers: int) -> ProcessPoolExecutor:
+    # pdfium is not thread-safe, so pages are split across processes
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _fast_pages(doc, start: int, stop: Optional[int]) -> Iterator[str]:
+    """Text of pages [start, stop) of an open pdfium document, which is closed afterwards."""
+    try:
+        for i in range(start, min(stop or len(doc), len(doc))):
+            page = doc[i]
+            textpage = page.get_textpage()
+            yield textpage.get_text_bounded().replace('\r\n', '\n')
+            textpage.close()
+            page.close()
+    finally:
+        doc.close()
+
+
+def _layout_pages(source: PdfSource, start: int, stop: Optional[int]) -> Iterator[str]:
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with pdfplumber.open(source) as pdf:
+        for page in pdf.pages[start:stop]:
+            yield page.extract_text() or ""
+            page.close()
+
+
+def _extract_range(source: PdfSource, start: int, stop: int) -> List[str]:
+    """Worker task: layout text of pages [start, stop)."""
+    return list(_layout_pages(source, start, stop))
+
+
+def _parallel_pages(source: PdfSource, n_pages: int, workers: int) -> Iterator[str]:
+    pool = _page_pool(workers)
+    futures = [pool.submit(_extract_range, source, start, min(start + PDF_PAGES_PER_TASK, n_pages))
+               for start in range(0, n_pages, PDF_PAGES_PER_TASK)]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Budget reached (or the caller stopped early): drop the chunks not started yet
+        for future in futures:
+            future.cancel()
+
+
+def page_count(source: PdfSource) -> int:
+    if pdfium is None:
+        with pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source) as pdf:
+            return len(pdf.pages)
+    doc = pdfium.PdfDocument(source)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+def iter_pdf_pages(source: PdfSource, max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                   engine: Optional[str] = None, workers: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each page lazily, stopping after `max_pages` pages or
+    once `max_chars` characters have been yielded (the last page is kept
+    whole). Defaults come from the PDF_* settings above.
+
+    Only the layout engine is worth spreading over processes: the fast
+    engine extracts hundreds of pages in the time it takes to start a worker.
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    engine = engine or PDF_ENGINE
+    workers = PDF_PAGE_WORKERS if workers is None else workers
+    if hasattr(source, 'read'):
+        # Streams are read once so workers (and the fallback) can reopen them
+        source = source.read()
+
+    pages = None
+    if engine == 'fast' and pdfium is not None:
+        try:
+            pages = _fast_pages(pdfium.PdfDocument(source), 0, max_pages or None)
+        except pdfium.PdfiumError:
+            # Some damaged files only open with pdfminer
+            pass
+    elif workers > 0:
+        n_pages = page_count(source)
+        n_pages = min(n_pages, max_pages) if max_pages else n_pages
+        if n_pages >= PDF_PARALLEL_MIN_PAGES:
+            pages = _parallel_pages(source, n_pages, workers)
+    if pages is None:
+        pages = _layout_pages(source, 0, max_pages or None)
+
+    chars = 0
+    for text in pages:
+        yield text
+        chars += len(text)
+        if max_chars and chars >= max_chars:
+            pages.close()
+            return
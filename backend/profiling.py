@@ -0,0 +1,108 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import time
+from typing import Callable, List, Optional
+
+
+class ProfileCapture:
+    __slots__ = ("profile", "start", "id")
+
+    def __init__(self, profile: cProfile.Profile):
+        self.profile = profile
+        self.start = time.perf_counter()
+        # Known up front, so a streamed response can name its capture before the body runs
+        now = time.time()
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}{int(now * 1000) % 1000:03d}-{os.urandom(3).hex()}"
+
+
+class RequestProfiler:
+    """
+    cProfile captures of single requests (or background tasks). Each capture
+    is saved as a .prof file, readable with pstats or snakeviz, plus a JSON
+    summary of the top functions by cumulative time for the admin page.
+    Only the newest `keep` captures are kept.
+    """
+
+    def __init__(self, directory: str, keep: int = 50, top: int = 25):
+        self.directory = directory
+        self.keep = keep
+        self.top = top
+
+    def start(self) -> Optional[ProfileCapture]:
+        """Start profiling the current thread; None if another profiler is already running."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows a single active profiler per process
+            return None
+        return ProfileCapture(profile)
+
+    def finish(self, capture: ProfileCapture, label: str) -> dict:
+        """Stop a capture, save it and return its summary."""
+        capture.profile.disable()
+        total_ms = round((time.perf_counter() - capture.start) * 1000, 2)
+        stats = pstats.Stats(capture.profile)
+
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        profile_id = capture.id
+        stats.dump_stats(os.path.join(self.directory, profile_id + '.prof'))
+
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        summary = {
+            "id": profile_id,
+            "label": label,
+            "created_at": now,
+            "total_ms": total_ms,
+            "calls": stats.total_calls,
+            "top": [{
+                "function": f"{'/'.join(filename.replace(os.sep, '/').split('/')[-2:])}:{line}({name})",
+                "calls": ncalls,
+                "own_ms": round(own * 1000, 2),
+                "cumulative_ms": round(cumulative * 1000, 2),
+            } for (filename, line, name), (_, ncalls, own, cumulative, _) in top],
+        }
+        with open(os.path.join(self.directory, profile_id + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f)
+        self._prune()
+        return summary
+
+    def wrap(self, fn: Callable, label: str) -> Callable:
+        """`fn` profiled whenever it runs (e.g. a job task on a worker thread)."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            capture = self.start()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                if capture is not None:
+                    self.finish(capture, label)
+        return wrapper
+
+    def _ids(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted((name[:-5] for name in os.listdir(self.directory) if name.endswith('.json')), reverse=True)
+
+    def _prune(self) -> None:
+        for profile_id in self._ids()[self.keep:]:
+            for ext in ('.json', '.prof'):
+                try:
+                    os.remove(os.path.join(self.directory, profile_id + ext))
+                except OSError:
+                    pass
+
+    def recent(self, limit: int = 10) -> List[dict]:
+        """Summaries of the newest captures, newest first."""
+        summaries = []
+        for profile_id in self._ids()[:limit]:
+            try:
+                with open(os.path.join(self.directory, profile_id + '.json'), encoding='utf-8') as f:
+                    summaries.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return summaries
@@ -0,0 +1,287 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import deque
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional, only needed for .parquet output
+    pyarrow = None
+
+from document_validator import validate_jd
+from feature_cache import FeatureCache
+from match import (READERS, JobProfile, MatchResult, calculate_batch_match, get_skill_taxonomy, read_file,
+                   resolve_weights)
+from parallel import ParallelScorer, load_cv_profile
+from score_matrix import COMPONENTS
+
+# Offline batch scoring: one JD against every CV in a directory or zip
+# archive, without the web app. CVs are read lazily and profiled on a pool of
+# worker processes (each loads the spaCy model once); results are appended to
+# the output after every chunk, so an interrupted run picks up where it
+# stopped when started again with the same --out.
+#
+#   python backend/score.py --jd jd.pdf --cvs ./cvs_or_archive.zip --out results.csv
+#
+# Parquet output needs pyarrow; rows are collected in <out>.partial.jsonl and
+# converted once the run completes.
+
+# match_percentage and confidence_score are percentages like the API's; the
+# <component>_raw columns are the unweighted 0-1 component scores
+COLUMNS = ["file", "cv_hash", "name", "match_percentage", "confidence_score"] + \
+          [f"{name}_raw" for name in COMPONENTS] + \
+          ["cv_experience", "jd_experience", "matched_skills", "missing_skills", "error", "jd_hash", "taxonomy_version"]
+FORMATS = (".csv", ".jsonl", ".parquet")
+
+
+def iter_documents(source: str) -> Iterator[Tuple[str, Callable[[], bytes]]]:
+    """(name, load) for every .txt/.pdf/.docx file in a directory tree or zip archive, in name order."""
+    def readable(name):
+        base = os.path.basename(name)
+        return not base.startswith('.') and os.path.splitext(base)[1].lower() in READERS
+
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = sorted(info.filename for info in archive.infolist()
+                           if not info.is_dir() and not info.filename.startswith('__MACOSX/'))
+            for name in filter(readable, names):
+                yield name, lambda name=name: archive.read(name)
+        return
+
+    names = []
+    for directory, _, filenames in os.walk(source):
+        names += [os.path.relpath(os.path.join(directory, f), source) for f in filenames]
+    for name in sorted(filter(readable, names)):
+        path = os.path.join(source, name)
+        yield name.replace(os.sep, '/'), lambda path=path: open(path, 'rb').read()
+
+
+def result_row(name: str, cv_hash: Optional[str], result: Optional[MatchResult], jd_hash: str,
+               error: Optional[str] = None) -> dict:
+    """One flat output row for a scored CV, read straight off its MatchResult, or for a failed one."""
+    row = dict.fromkeys(COLUMNS)
+    row.update(file=name, cv_hash=cv_hash, jd_hash=jd_hash, error=error)
+    if error:
+        return row
+    cv_skills, jd_skills, taxonomy = result.cv_skills, result.jd_skills, result.taxonomy
+    row.update(
+        name=result.candidate_name,
+        match_percentage=result.match_percentage,
+        confidence_score=round(result.confidence * 100, 2),
+        cv_experience=result.cv_experience,
+        jd_experience=result.jd_experience,
+        matched_skills=";".join(taxonomy.skill_names(cv_skills & jd_skills)),
+        missing_skills=";".join(taxonomy.skill_names(jd_skills & ~cv_skills)),
+        taxonomy_version=result.taxonomy_version,
+    )
+    for component, score in result.component_scores().items():
+        row[f"{component}_raw"] = score
+    return row
+
+
+class ResultWriter:
+    """
+    Appends rows to a CSV or JSONL file. On resume, a last line cut off by an
+    interruption is dropped and the files already written are reported, so
+    they can be skipped.
+    """
+
+    def __init__(self, path: str, jd_hash: str, restart: bool = False):
+        self.path = path
+        self.format = os.path.splitext(path)[1].lower()
+        self.done: Set[str] = set()
+        if restart and os.path.exists(path):
+            os.remove(path)
+        if os.path.exists(path):
+            self._resume(jd_hash)
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'a', newline='', encoding='utf-8')
+        self.csv = None
+        if self.format == '.csv':
+            self.csv = csv.DictWriter(self.file, fieldnames=COLUMNS, lineterminator='\n')
+            if new:
+                self.csv.writeheader()
+
+    def _resume(self, jd_hash: str) -> None:
+        with open(self.path, 'rb+') as f:
+            content = f.read()
+            complete = content.rfind(b'\n') + 1
+            if complete < len(content):
+                f.truncate(complete)
+        lines = content[:complete].decode('utf-8').splitlines()
+        if self.format == '.csv':
+            rows = csv.DictReader(lines)
+        else:
+            rows = (json.loads(line) for line in lines if line.strip())
+        for row in rows:
+            if set(row) != set(COLUMNS):
+                raise ValueError(f"{self.path} was written with other columns; use --restart to overwrite it")
+            if row.get('jd_hash') != jd_hash:
+                raise ValueError(f"{self.path} holds results for a different JD, weights or skill taxonomy; "
+                                 "use --restart to overwrite it")
+            self.done.add(row['file'])
+
+    def write(self, rows: List[dict]) -> None:
+        for row in rows:
+            if self.csv is not None:
+                self.csv.writerow(row)
+            else:
+                self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def write_parquet(jsonl_path: str, path: str) -> None:
+    with open(jsonl_path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    table = pyarrow.Table.from_pylist(rows, schema=pyarrow.schema(
+        [(name, pyarrow.string()) for name in COLUMNS[:3]] +
+        [(name, pyarrow.float64()) for name in COLUMNS[3:10]] +
+        [(name, pyarrow.string()) for name in COLUMNS[10:]]))
+    pyarrow.parquet.write_table(table, path)
+
+
+def profile_documents(documents, scorer: Optional[ParallelScorer], cache: Optional[FeatureCache], window: int):
+    """
+    (name, cv_profile, cache_key, error) for each document, in input order.
+    With a pool, up to `window` files are in flight at a time, so files are
+    read no faster than the workers profile them.
+    """
+    if scorer is None:
+        for name, load in documents:
+            try:
+                yield (name,) + load_cv_profile(load(), name, cache)
+            except Exception as e:
+                yield name, None, None, str(e)
+        return
+
+    pending = deque()
+    for name, load in documents:
+        try:
+            pending.append((name, scorer.submit(load(), os.path.basename(name))))
+        except OSError as e:
+            pending.append((name, e))
+        while len(pending) >= window:
+            yield _outcome(*pending.popleft())
+    while pending:
+        yield _outcome(*pending.popleft())
+
+
+def _outcome(name, future):
+    if isinstance(future, Exception):
+        return name, None, None, str(future)
+    return (name,) + future.result()
+
+
+def score_documents(job_profile: JobProfile, documents, writer: ResultWriter, jd_hash: str,
+                    scorer: Optional[ParallelScorer] = None, cache: Optional[FeatureCache] = None,
+                    chunk_size: int = 64, window: int = 64) -> Tuple[int, int]:
+    """Scores and writes every document not yet in the output; returns (scored, failed)."""
+    scored = failed = 0
+    todo = ((name, load) for name, load in documents if name not in writer.done)
+    chunk = []
+
+    def flush():
+        valid = [(name, profile, cache_key) for name, profile, cache_key, error in chunk if not error]
+        results = iter(calculate_batch_match([profile for _, profile, _ in valid], job_profile, render=False))
+        writer.write([result_row(name, cache_key, None if error else next(results), jd_hash, error)
+                      for name, _, cache_key, error in chunk])
+        chunk.clear()
+
+    for outcome in profile_documents(todo, scorer, cache, window):
+        chunk.append(outcome)
+        if outcome[3]:
+            failed += 1
+        else:
+            scored += 1
+        if len(chunk) >= chunk_size:
+            flush()
+            print(f"{scored + failed} CVs scored ({failed} failed)", end="\r", flush=True)
+    if chunk:
+        flush()
+    return scored, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a directory or zip archive of CVs against one JD.")
+    parser.add_argument("--jd", required=True, help="job description (.txt, .pdf or .docx)")
+    parser.add_argument("--cvs", required=True, help="directory or .zip archive of CVs")
+    parser.add_argument("--out", required=True, help="results file: .csv, .jsonl or .parquet")
+    parser.add_argument("--weights", help="JSON weight profile, as accepted by /api/weights")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="scoring processes (0 = score in this process)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="CVs scored and written per chunk")
+    parser.add_argument("--cache", help="feature cache to reuse, e.g. cache/features.sqlite3")
+    parser.add_argument("--restart", action="store_true", help="discard earlier results instead of resuming")
+    args = parser.parse_args()
+
+    out_format = os.path.splitext(args.out)[1].lower()
+    if out_format not in FORMATS:
+        parser.error(f"--out must end in one of {', '.join(FORMATS)}")
+    if out_format == '.parquet' and pyarrow is None:
+        parser.error("Parquet output needs pyarrow (pip install pyarrow)")
+    if not os.path.exists(args.cvs):
+        parser.error(f"{args.cvs} does not exist")
+
+    weight_profile = None
+    if args.weights:
+        with open(args.weights, encoding='utf-8') as f:
+            weight_profile = json.load(f)
+        try:
+            resolve_weights(weight_profile)
+        except ValueError as e:
+            parser.error(f"Invalid weights: {e}")
+
+    jd_text = read_file(args.jd)
+    is_valid_jd, _, reason = validate_jd(jd_text)
+    if not is_valid_jd:
+        sys.exit(f"Invalid JD: {reason}")
+    # Resuming only makes sense against the same JD, weights and skill taxonomy
+    jd_hash = hashlib.sha256(json.dumps([jd_text, weight_profile, get_skill_taxonomy().digest],
+                                        sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    job_profile = JobProfile(jd_text, weight_profile=weight_profile)
+
+    rows_path = args.out + ".partial.jsonl" if out_format == '.parquet' else args.out
+    try:
+        writer = ResultWriter(rows_path, jd_hash, restart=args.restart)
+    except ValueError as e:
+        sys.exit(str(e))
+    if writer.done:
+        print(f"Resuming: {len(writer.done)} CVs already in {rows_path}")
+
+    cache = FeatureCache(args.cache) if args.cache else None
+    scorer = ParallelScorer(max_workers=args.workers, cache=cache) if args.workers > 0 else None
+    start = time.perf_counter()
+    interrupted = False
+    try:
+        scored, failed = score_documents(job_profile, iter_documents(args.cvs), writer, jd_hash, scorer=scorer,
+                                         cache=cache, chunk_size=args.chunk_size,
+                                         window=max(args.chunk_size, args.workers * 4))
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        writer.close()
+        if scorer is not None:
+            scorer.shutdown(cancel_futures=True)
+    if interrupted:
+        print("\nInterrupted; run the same command again to resume.")
+        sys.exit(130)
+
+    if out_format == '.parquet':
+        write_parquet(rows_path, args.out)
+        os.remove(rows_path)
+    print(f"\nScored {scored} CVs ({failed} failed) in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from collections import Counter
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from match import (LOW_SEMANTIC_MIN_SKILLS, LOW_SEMANTIC_THRESHOLD, LOW_SEMANTIC_WEIGHTS, SCORE_CEILING,
+                   SCORE_FLOOR, SCORE_WEIGHTS, JobProfile, JobProfileSet, build_cv_profiles,
+                   calculate_education_match, calculate_experience_match, get_skill_taxonomy,
+                   get_tfidf_similarity_from_counts, resolve_weights, semantic_matrix, tfidf_analyzer)
+
+COMPONENTS = ("semantic", "tfidf", "skills", "exp", "edu")
+
+
+def skill_matrix(cv_skill_bits: Sequence[int], jd_skill_bits: Sequence[int], taxonomy=None) -> np.ndarray:
+    """len(common) / len(JD skills) for every pair of skill bitsets (of `taxonomy`), 0 when the JD lists none."""
+    taxonomy = taxonomy or get_skill_taxonomy()
+    # Integer popcounts, so the ratios are exactly the per-pair ones
+    cv_words = taxonomy.words(cv_skill_bits)
+    ratios = np.zeros((len(cv_skill_bits), len(jd_skill_bits)))
+    for j, jd_bits in enumerate(jd_skill_bits):
+        ratios[:, j] = taxonomy.overlap(cv_words, jd_bits).ratio
+    return ratios
+
+
+def lookup_matrix(cv_values: Sequence, jd_values: Sequence, score: Callable) -> np.ndarray:
+    """score(cv_value, jd_value) for every pair, from a table over the few distinct values."""
+    def ids(values):
+        keys: Dict = {}
+        return [keys.setdefault(tuple(v) if isinstance(v, list) else v, len(keys)) for v in values], list(keys)
+
+    cv_ids, cv_keys = ids(cv_values)
+    jd_ids, jd_keys = ids(jd_values)
+    table = np.array([[score(a, b) for b in jd_keys] for a in cv_keys], dtype=np.float64)
+    if not table.size:
+        return np.zeros((len(cv_ids), len(jd_ids)))
+    return table[np.ix_(cv_ids, jd_ids)]
+
+
+def tfidf_matrix(cv_texts: Sequence[str], jobs: Sequence[JobProfile], tfidf_index=None) -> np.ndarray:
+    """
+    JobProfile.tfidf_similarity for every pair. With a ready corpus index this
+    is one sparse product; the two-document fallback has pair-specific IDF
+    weights and is evaluated pair by pair.
+    """
+    cv_counts = [Counter(tfidf_analyzer(text)) for text in cv_texts]
+    if tfidf_index is not None and tfidf_index.ready:
+        rows = tfidf_index.transform(cv_counts)
+        jd_rows = tfidf_index.transform([job.tfidf_counts for job in jobs])
+        return (rows @ jd_rows.T).toarray()
+    return np.array([[get_tfidf_similarity_from_counts(counts, job.tfidf_counts) for job in jobs]
+                     for counts in cv_counts]).reshape(len(cv_counts), len(jobs))
+
+
+def weighted_scores(semantic: np.ndarray, tfidf: np.ndarray, skills: np.ndarray, exp: np.ndarray,
+                    edu: np.ndarray, weights: Optional[dict] = None,
+                    low_semantic_weights: Optional[dict] = None) -> np.ndarray:
+    """
+    The final-score step of calculate_cv_jd_match on whole arrays: per-pair
+    weight selection (low semantic + high skills -> LOW_SEMANTIC_WEIGHTS),
+    the weighted sum in the same order, and the floor/ceiling clamp. Weights
+    may also be arrays that broadcast against the scores (one per JD column).
+    """
+    weights = weights or SCORE_WEIGHTS
+    low_semantic_weights = low_semantic_weights or LOW_SEMANTIC_WEIGHTS
+    low = (semantic < LOW_SEMANTIC_THRESHOLD) & (skills > LOW_SEMANTIC_MIN_SKILLS)
+
+    def weight(name):
+        return np.where(low, low_semantic_weights[name], weights[name])
+
+    final = (semantic * weight("semantic")) + \
+            (tfidf * weight("tfidf")) + \
+            (skills * weight("skills")) + \
+            (exp * weight("exp")) + \
+            (edu * weight("edu"))
+    return np.minimum(np.maximum(final, SCORE_FLOOR), SCORE_CEILING)
+
+
+def job_weights(jobs: Sequence[JobProfile]):
+    """Per-column (weights, low_semantic_weights) arrays from each JobProfile's weight profile."""
+    resolved = [resolve_weights(job.weight_profile) for job in jobs]
+    return tuple({name: np.array([pair[i][name] for pair in resolved]) for name in COMPONENTS} for i in (0, 1))
+
+
+def score_matrix(cvs: Sequence, jobs: Sequence, tfidf_index=None, weights: Optional[dict] = None,
+                 taxonomy=None) -> Dict[str, np.ndarray]:
+    """
+    Scores N CVs against M JDs at once. `cvs` are CVProfiles or texts, `jobs`
+    JobProfiles, texts or a JobProfileSet. Returns N x M float arrays for the
+    final score ("final", a fraction: match_percentage is round(final * 100, 2)),
+    "confidence" and each component in COMPONENTS, numerically identical to
+    what calculate_cv_jd_match computes pair by pair. `weights` replaces the
+    JDs' own weight profiles for every column. Skills are compared on the
+    bitsets of `taxonomy` (default: the current one).
+    """
+    if isinstance(jobs, JobProfileSet):
+        tfidf_index = tfidf_index if tfidf_index is not None else jobs.tfidf_index
+        job_vectors = (jobs.vectors, jobs.norms)
+        jobs = jobs.jobs
+    else:
+        jobs = [job if isinstance(job, JobProfile) else JobProfile(job, tfidf_index=tfidf_index) for job in jobs]
+        job_vectors = None
+        if tfidf_index is None:
+            tfidf_index = next((job.tfidf_index for job in jobs if job.tfidf_index is not None), None)
+    cvs = build_cv_profiles(cvs)
+    taxonomy = taxonomy or get_skill_taxonomy()
+
+    scores = {
+        "semantic": semantic_matrix(cvs, jobs, job_vectors=job_vectors),
+        "tfidf": tfidf_matrix([cv.text for cv in cvs], jobs, tfidf_index),
+        "skills": skill_matrix([cv.skill_bits_for(taxonomy) for cv in cvs],
+                               [job.skill_bits_for(taxonomy) for job in jobs], taxonomy),
+        "exp": lookup_matrix([cv.experience for cv in cvs], [job.experience for job in jobs], calculate_experience_match),
+        "edu": lookup_matrix([cv.education for cv in cvs], [job.education for job in jobs], calculate_education_match),
+    }
+    low_semantic_weights = None
+    if weights is None and any(job.weight_profile for job in jobs):
+        weights, low_semantic_weights = job_weights(jobs)
+    scores["final"] = weighted_scores(*(scores[name] for name in COMPONENTS), weights=weights,
+                                      low_semantic_weights=low_semantic_weights)
+    scores["confidence"] = 1.0 - np.abs(scores["semantic"] - scores["tfidf"])
+
+    # Empty documents get calculate_cv_jd_match's all-zero result
+    empty = np.array([not cv.text for cv in cvs], dtype=bool)[:, None] | \
+        np.array([not job.text for job in jobs], dtype=bool)[None, :]
+    for matrix in scores.values():
+        matrix[empty] = 0.0
+    return scores
@@ -0,0 +1,90 @@
+import contextlib
+import os
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; concurrent saves from several processes are then not serialized
+    fcntl = None
+
+
+class ShardDirectory:
+    """
+    Append-only .npz shards in a directory shared by several processes
+    (gunicorn workers). A save writes only its new rows as one more shard,
+    under an exclusive flock; readers hold a shared one, so a shard can't be
+    compacted away while they read. The directory's mtime changes with every
+    shard written or removed, which makes "anything new?" a single stat.
+    """
+
+    def __init__(self, directory: str, max_shards: int = 32):
+        self.directory = directory
+        self.max_shards = max_shards  # compact() beyond this many (indexes do it on load)
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.directory)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino
+
+    @contextlib.contextmanager
+    def lock(self, shared: bool = False):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, '.lock'), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def names(self) -> List[str]:
+        """Shard names, oldest first."""
+        try:
+            return sorted(name for name in os.listdir(self.directory) if name.endswith('.npz'))
+        except FileNotFoundError:
+            return []
+
+    def read(self, name: str) -> Optional[Dict[str, np.ndarray]]:
+        """The arrays of one shard, or None if it was compacted away meanwhile (only possible without fcntl)."""
+        try:
+            with np.load(os.path.join(self.directory, name), allow_pickle=False) as shard:
+                return {key: shard[key] for key in shard.files}
+        except FileNotFoundError:
+            return None
+
+    def read_new(self, seen: Set[str]) -> Iterator[Dict[str, np.ndarray]]:
+        """The shards whose names aren't in `seen`, adding them to it (and dropping the removed ones)."""
+        names = self.names()
+        for name in names:
+            if name in seen:
+                continue
+            shard = self.read(name)
+            if shard is not None:
+                seen.add(name)
+                yield shard
+        seen.intersection_update(names)
+
+    def write(self, **arrays: np.ndarray) -> str:
+        """Write a new shard (atomically) and return its name. Call under the exclusive lock."""
+        # Time first, so names sort in the order the shards were written
+        name = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.npz"
+        path = os.path.join(self.directory, name)
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(path + '.tmp', path)
+        return name
+
+    def compact(self, names: Iterable[str], **arrays: np.ndarray) -> str:
+        """Replace the shards `names` with one holding `arrays`. Call under the exclusive lock."""
+        name = self.write(**arrays)
+        for old in names:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self.directory, old))
+        return name
@@ -0,0 +1,399 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:
+    import yaml
+except ImportError:  # optional, only needed for .yaml/.yml taxonomy files
+    yaml = None
+
+# Tokens for skill matching keep "+" and "#" so that "c++" and "c#" survive,
+# while ".", "/" and "-" split ("node.js" -> node, js; "ci/cd" -> ci, cd).
+SKILL_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+    _bitwise_count = np.bitwise_count
+else:
+    _POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _bitwise_count(words: np.ndarray) -> np.ndarray:
+        counts = _POPCOUNT8[np.ascontiguousarray(words).view(np.uint8)]
+        return counts.reshape(words.shape + (8,)).sum(axis=-1)
+
+
+def tokenize_skills(text):
+    return SKILL_TOKEN_RE.findall(text.lower())
+
+
+def build_skill_trie(categories, aliases=None):
+    """
+    Compiles the skill taxonomy into a token trie.
+    Each node is a dict of token -> child node; a node that ends a skill
+    stores its (category, skill) pairs under the None key. An alias ends in
+    the (category, skill) pairs of the canonical skill it stands for.
+    """
+    trie = {}
+
+    def add(phrase, entries):
+        tokens = tokenize_skills(phrase)
+        if not tokens:
+            return
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(None, []).extend(entries)
+
+    for category, skills in categories.items():
+        for skill in skills:
+            add(skill, [(category, skill)])
+    if aliases:
+        canonical_categories = {}
+        for category, skills in categories.items():
+            for skill in skills:
+                canonical_categories.setdefault(skill, []).append(category)
+        for alias, skill in aliases.items():
+            add(alias, [(category, skill) for category in canonical_categories.get(skill, ())])
+    return trie
+
+
+def _trie_child(node, token):
+    child = node.get(token)
+    # Tolerate simple plurals ("REST APIs" -> "rest api")
+    if child is None and len(token) > 3 and token.endswith('s'):
+        child = node.get(token[:-1])
+    return child
+
+
+def match_skill_tokens(tokens, trie):
+    """
+    Single pass over the document tokens, following the trie from every
+    start position. Cost depends on the text length and the longest skill,
+    not on the number of skills in the taxonomy.
+    """
+    found = []
+    for start in range(len(tokens)):
+        node = _trie_child(trie, tokens[start])
+        pos = start + 1
+        while node is not None:
+            if None in node:
+                found.extend(node[None])
+            if pos >= len(tokens):
+                break
+            node = _trie_child(node, tokens[pos])
+            pos += 1
+    return found
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per row of a (..., W) uint64 word array."""
+    return _bitwise_count(words).sum(axis=-1, dtype=np.int64)
+
+
+class SkillOverlap(NamedTuple):
+    """One JD against N CVs: skills shared with each CV, and the JD's own count."""
+    matched_count: np.ndarray
+    jd_count: int
+
+    @property
+    def ratio(self) -> np.ndarray:
+        """skill_match_ratio per CV: matched / JD skills, 0 when the JD lists none."""
+        if not self.jd_count:
+            return np.zeros(len(self.matched_count))
+        return self.matched_count / self.jd_count
+
+
+class SkillTaxonomy:
+    """
+    Skill categories compiled for matching. Every skill has an integer ID
+    (taxonomy skills sorted by name, then any others in order of first
+    sight) and every category a mask of its skill IDs, so a document's
+    skills are one bitset, a Python int with bit i for names[i], and its
+    categorized skills are that bitset ANDed with the category masks.
+    `aliases` map other spellings to a skill ("k8s" -> "kubernetes"); a
+    document mentioning an alias gets the canonical skill.
+
+    Many bitsets can be laid out as rows of uint64 words (words()), so
+    overlaps of one JD with N CVs are vectorized AND + popcount.
+
+    `version` is the one declared by the taxonomy file; `digest` identifies
+    the content, so skills extracted under another taxonomy can be spotted.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], aliases: Optional[Dict[str, str]] = None,
+                 version: Optional[str] = None):
+        categories = {category: set(skills) for category, skills in categories.items()}
+        aliases = dict(aliases or {})
+        self._lock = threading.Lock()
+        self.categories: Dict[str, Set[str]] = categories
+        self.aliases: Dict[str, str] = aliases
+        self.names: List[str] = sorted(set().union(*categories.values()))
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.size = len(self.names)
+        unknown = sorted(skill for skill in set(aliases.values()) if skill not in self.ids)
+        if unknown:
+            raise ValueError(f"Aliases of unknown skills: {', '.join(unknown[:10])}")
+        self.category_masks: Dict[str, int] = {category: self.mask(skills) for category, skills in categories.items()}
+        self.trie = build_skill_trie(categories, aliases)
+        content = json.dumps([{category: sorted(skills) for category, skills in categories.items()}, aliases],
+                             sort_keys=True)
+        self.digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        self.version = str(version) if version is not None else self.digest
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def extract(self, text: str) -> Dict[str, Set[str]]:
+        """Skills found in `text` (whole-token matches), as {category: set of names}."""
+        found = {category: set() for category in self.categories}
+        for category, skill in match_skill_tokens(tokenize_skills(text), self.trie):
+            found[category].add(skill)
+        return found
+
+    def _intern(self, skill: str, category: Optional[str]) -> int:
+        # Skills outside the taxonomy, e.g. from a feature cache written with an older one
+        with self._lock:
+            skill_id = self.ids.get(skill)
+            if skill_id is None:
+                skill_id = self.ids[skill] = len(self.names)
+                self.names.append(skill)
+            if category is not None:
+                self.category_masks[category] = self.category_masks.get(category, 0) | (1 << skill_id)
+        return skill_id
+
+    def bits(self, skills: Iterable[str], category: Optional[str] = None) -> int:
+        """Bitset of skill names; unknown ones get new IDs (under `category`, if given)."""
+        bits = 0
+        ids = self.ids
+        for skill in skills:
+            skill_id = ids.get(skill)
+            if skill_id is None:
+                skill_id = self._intern(skill, category)
+            bits |= 1 << skill_id
+        return bits
+
+    def scratch(self) -> "SkillTaxonomy":
+        """A copy that interns skills into IDs of its own, leaving this taxonomy untouched."""
+        copy = object.__new__(SkillTaxonomy)
+        copy.__dict__.update(self.__dict__)
+        with self._lock:
+            copy.names, copy.ids, copy.category_masks = list(self.names), dict(self.ids), dict(self.category_masks)
+        copy._lock = threading.Lock()
+        return copy
+
+    def resolve(self, categorized: Sequence[Dict[str, Iterable[str]]]) -> Tuple["SkillTaxonomy", List[int]]:
+        """
+        bits_of() of stored skills without interning: if any is unknown, they
+        are resolved in a scratch() copy. Returns the taxonomy the bitsets
+        belong to, and the bitsets.
+        """
+        known = all(skill in self.ids for skills_by_category in categorized
+                    for skills in skills_by_category.values() for skill in skills)
+        taxonomy = self if known else self.scratch()
+        return taxonomy, [taxonomy.bits_of(skills_by_category) for skills_by_category in categorized]
+
+    def mask(self, skills: Iterable[str]) -> int:
+        """bits() of many known skills, built as a byte array (large taxonomies have 10k+ bit masks)."""
+        ids = np.fromiter((self.ids[skill] for skill in skills), dtype=np.int64)
+        flags = np.zeros(self.width() * 64, dtype=np.uint8)
+        flags[ids] = 1
+        return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+    def bits_of(self, categorized: Dict[str, Iterable[str]]) -> int:
+        """Bitset of extract() output (or a cached copy of it)."""
+        bits = 0
+        for category, skills in categorized.items():
+            bits |= self.bits(skills, category)
+        return bits
+
+    def skill_names(self, bits: int) -> List[str]:
+        """Skill names in a bitset, in ID order."""
+        names = []
+        while bits:
+            low = bits & -bits
+            names.append(self.names[low.bit_length() - 1])
+            bits ^= low
+        return names
+
+    def categorized(self, bits: int) -> Dict[str, List[str]]:
+        """{category: skill names} of a bitset, for every category."""
+        return {category: self.skill_names(bits & mask) for category, mask in self.category_masks.items()}
+
+    def width(self) -> int:
+        """uint64 words per bitset row, enough for every skill ID so far."""
+        return max(1, (len(self.names) + 63) // 64)
+
+    def words(self, bitsets: Sequence[int], width: Optional[int] = None) -> np.ndarray:
+        """(N, width) uint64 rows of bitsets, bit i of a row in word i // 64."""
+        width = width or self.width()
+        n_bytes = width * 8
+        data = b"".join(bits.to_bytes(n_bytes, "little") for bits in bitsets)
+        return np.frombuffer(data, dtype="<u8").astype(np.uint64).reshape(len(bitsets), width)
+
+    def overlap(self, cvs, jd_bits: int) -> SkillOverlap:
+        """
+        Skills N CVs share with one JD. `cvs` are bitsets or, to rank the
+        same pool against many JDs, their words().
+        """
+        cv_words = cvs if isinstance(cvs, np.ndarray) else self.words(cvs)
+        jd_words = self.words([jd_bits], cv_words.shape[1])
+        return SkillOverlap(popcount(cv_words & jd_words), int(popcount(jd_words)[0]))
+
+
+def parse_skill_taxonomy(data) -> SkillTaxonomy:
+    """
+    Compiles a taxonomy document:
+        {"version": "...", "categories": {category: [skill, ...]},
+         "aliases": {skill: [alias, ...]}}
+    Names are matched case-insensitively, so they are stored lowercased.
+    Raises ValueError for a malformed document.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("categories"), dict) or not data["categories"]:
+        raise ValueError("A skill taxonomy needs a non-empty \"categories\" object")
+
+    def names(values, what):
+        if not isinstance(values, list) or not all(isinstance(v, str) and v.strip() for v in values):
+            raise ValueError(f"{what} must be a list of non-empty strings")
+        return [v.strip().lower() for v in values]
+
+    categories = {str(category): names(skills, f"Category {category!r}")
+                  for category, skills in data["categories"].items()}
+    skills = set().union(*categories.values())
+    aliases = {}
+    raw_aliases = data.get("aliases") or {}
+    if not isinstance(raw_aliases, dict):
+        raise ValueError("\"aliases\" must map skills to lists of aliases")
+    for skill, skill_aliases in raw_aliases.items():
+        for alias in names(skill_aliases, f"Aliases of {skill!r}"):
+            if alias in skills:
+                raise ValueError(f"Alias {alias!r} is also a skill")
+            if aliases.setdefault(alias, skill.strip().lower()) != skill.strip().lower():
+                raise ValueError(f"Alias {alias!r} is given for two skills")
+    version = data.get("version")
+    return SkillTaxonomy(categories, aliases, version=str(version) if version not in (None, "") else None)
+
+
+def _is_yaml(path: str) -> bool:
+    if os.path.splitext(path)[1].lower() not in ('.yaml', '.yml'):
+        return False
+    if yaml is None:
+        raise ValueError("YAML skill taxonomies need PyYAML (pip install pyyaml)")
+    return True
+
+
+def load_skill_taxonomy(path: str) -> SkillTaxonomy:
+    """Reads and compiles a JSON (or, with PyYAML, YAML) taxonomy file."""
+    with open(path, encoding='utf-8') as f:
+        if _is_yaml(path):
+            try:
+                data = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML in {path}: {e}")
+        else:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON in {path}: {e}")
+    return parse_skill_taxonomy(data)
+
+
+class TaxonomySource:
+    """
+    The current SkillTaxonomy of a taxonomy file. current() re-reads the file
+    when it changed, looking at its mtime at most every `check_interval`
+    seconds (0 = never), so every process, web or scoring worker, picks up an
+    edited file without a restart; reload() and replace() swap it at once.
+    A file that fails to load is reported and the loaded taxonomy is kept.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._taxonomy = load_skill_taxonomy(path)
+        self._checked = time.monotonic()
+        self.loaded_at = time.time()
+        self.error: Optional[str] = None
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def current(self) -> SkillTaxonomy:
+        if self.check_interval > 0 and time.monotonic() - self._checked >= self.check_interval:
+            self._check()
+        return self._taxonomy
+
+    def _check(self) -> None:
+        with self._lock:
+            if time.monotonic() - self._checked < self.check_interval:
+                return
+            self._checked = time.monotonic()
+            stamp = self._file_stamp()
+            if stamp == self._stamp or stamp is None:
+                return
+            self._stamp = stamp  # a broken file is not retried until it changes again
+            try:
+                self._swap(load_skill_taxonomy(self.path))
+            except (OSError, ValueError) as e:
+                self.error = str(e)
+                print(f"Skill taxonomy reload failed, keeping version {self._taxonomy.version}: {e}")
+
+    def _swap(self, taxonomy: SkillTaxonomy) -> SkillTaxonomy:
+        # An unchanged file keeps the compiled taxonomy, so profiles need no re-extraction
+        if taxonomy.digest != self._taxonomy.digest:
+            self._taxonomy = taxonomy
+        self.loaded_at = time.time()
+        self.error = None
+        return self._taxonomy
+
+    def reload(self) -> SkillTaxonomy:
+        """Re-reads the file now; raises OSError/ValueError (keeping the old taxonomy) if it can't be loaded."""
+        with self._lock:
+            stamp = self._file_stamp()
+            taxonomy = load_skill_taxonomy(self.path)
+            self._stamp = stamp
+            self._checked = time.monotonic()
+            return self._swap(taxonomy)
+
+    def replace(self, data: dict) -> SkillTaxonomy:
+        """
+        Validates a taxonomy document, writes it to the file in the file's
+        format (YAML for .yaml/.yml, JSON otherwise) and loads it; raises
+        ValueError if invalid or if a YAML file can't be written.
+        """
+        taxonomy = parse_skill_taxonomy(data)
+        as_yaml = _is_yaml(self.path)
+        with self._lock:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                if as_yaml:
+                    yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+                else:
+                    json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._stamp = self._file_stamp()
+            self._checked = time.monotonic()
+            return self._swap(taxonomy)
+
+    def status(self) -> dict:
+        taxonomy = self._taxonomy
+        return {
+            "version": taxonomy.version,
+            "digest": taxonomy.digest,
+            "path": self.path,
+            "skills": taxonomy.size,
+            "aliases": len(taxonomy.aliases),
+            "categories": {category: len(skills) for category, skills in taxonomy.categories.items()},
+            "loaded_at": self.loaded_at,
+            "error": self.error,
+        }
@@ -0,0 +1,317 @@
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from shards import ShardDirectory
+
+
+def smoothed_idf(df: np.ndarray, n_docs: int) -> np.ndarray:
+    """Same IDF as sklearn's TfidfVectorizer(smooth_idf=True)."""
+    return np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+
+class TfidfIndex:
+    """
+    TF-IDF model over the whole candidate corpus.
+
+    Raw term counts are kept as a sparse (documents x vocabulary) matrix with
+    a vocabulary that grows as documents are added, so the IDF can be
+    refreshed from document frequencies at any time without the original
+    texts. Rows of `matrix` are L2-normalized TF-IDF vectors, which makes
+    scoring one JD against every CV a single sparse matrix-vector product.
+
+    Terms outside the vocabulary (only possible for texts that were never
+    added) count towards a document's norm but can't contribute to a match.
+
+    New rows are kept as blocks and stacked onto `counts` and `matrix` on
+    the next query (or every `consolidate_every` blocks), so adding a
+    document doesn't copy the whole corpus.
+
+    With a `directory`, the documents added since the last save are written
+    as one more shard (see shards.py) every `save_every` new documents.
+    Several processes (gunicorn workers) may share the directory: before
+    writing, a process merges in the shards the others wrote, and search()
+    picks them up as soon as they are on disk, so every process refreshes
+    its IDF over the same shared corpus. load() compacts the shards into one
+    once there are more than a few dozen.
+    """
+
+    def __init__(self, directory: Optional[str] = None, refresh_every: int = 500, min_docs: int = 20,
+                 save_every: int = 50, consolidate_every: int = 64):
+        self.directory = directory
+        self.refresh_every = refresh_every
+        self.min_docs = min_docs
+        self.save_every = save_every
+        self.consolidate_every = consolidate_every
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []  # column -> term
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.counts = sp.csr_matrix((0, 0), dtype=np.float64)
+        self.idf = np.zeros(0)
+        self.idf_docs = 0  # corpus size the IDF was computed from
+        self.matrix = sp.csr_matrix((0, 0), dtype=np.float64)
+        self._blocks: List[sp.csr_matrix] = []  # counts of rows not stacked onto `counts` yet
+        self._weighted: List[sp.csr_matrix] = []  # their TF-IDF rows, once weighed
+        self._pending = 0  # documents added since the last IDF refresh
+        self._unsaved: List[Tuple[List[str], sp.csr_matrix]] = []  # blocks added here since the last save
+        self._unsaved_docs = 0
+        self._shards = ShardDirectory(directory) if directory else None
+        self._seen: Set[str] = set()  # shards already merged
+        self._stamp = None  # shard directory as last read or written
+        self._lock = threading.RLock()
+        if directory and self._shards.names():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def ready(self) -> bool:
+        """Corpus IDF is only meaningful once the corpus has a few documents."""
+        return len(self.keys) >= self.min_docs
+
+    def _idf_for(self, term: str) -> float:
+        col = self.vocabulary.get(term)
+        if col is not None and col < len(self.idf):
+            return self.idf[col]
+        # Unseen term: document frequency 0
+        return float(smoothed_idf(np.array(0.0), self.idf_docs))
+
+    def add(self, documents: Iterable[Tuple[str, Counter]]) -> int:
+        """
+        Add (key, term counts) pairs, skipping keys already indexed. Returns
+        the number of new rows. The IDF is refreshed every `refresh_every`
+        additions; until then new rows are weighted with the current IDF.
+        """
+        with self._lock:
+            added = self._append(documents)
+            self._unsaved_docs += added
+            if self.directory and self._unsaved_docs >= self.save_every:
+                self.save()
+            return added
+
+    def _columns(self, terms: Iterable[str]) -> List[int]:
+        """Vocabulary columns of `terms`, adding the new ones."""
+        cols = []
+        for term in terms:
+            col = self.vocabulary.get(term)
+            if col is None:
+                col = self.vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            cols.append(col)
+        return cols
+
+    def _append(self, documents: Iterable[Tuple[str, Counter]]) -> int:
+        with self._lock:
+            indptr, indices, data, new_keys = [0], [], [], []
+            for key, counts in documents:
+                if key in self.rows or key in new_keys or not counts:
+                    continue
+                indices.extend(self._columns(counts.keys()))
+                data.extend(float(tf) for tf in counts.values())
+                indptr.append(len(indices))
+                new_keys.append(key)
+            if not new_keys:
+                return 0
+
+            block = sp.csr_matrix((data, indices, indptr), shape=(len(new_keys), len(self.vocabulary)))
+            self._append_block(new_keys, block)
+            self._unsaved.append((new_keys, block))
+            self._weigh_new_rows()
+            return len(new_keys)
+
+    def _merge(self, shard: Dict[str, np.ndarray]) -> int:
+        """Append the rows of a saved shard whose keys aren't indexed yet."""
+        keys = shard["keys"].tolist()
+        keep = [row for row, key in enumerate(keys) if key not in self.rows]
+        if not keep:
+            return 0
+        cols = np.array(self._columns(shard["terms"].tolist()), dtype=np.int64)
+        block = sp.csr_matrix((shard["data"], cols[shard["indices"]], shard["indptr"]),
+                              shape=(len(keys), len(self.vocabulary)))
+        if len(keep) < len(keys):
+            block = block[keep]
+        self._append_block([keys[row] for row in keep], block)
+        return len(keep)
+
+    def _append_block(self, keys: List[str], block: sp.csr_matrix) -> None:
+        for key in keys:
+            self.rows[key] = len(self.keys)
+            self.keys.append(key)
+        self._blocks.append(block)
+        self._pending += len(keys)
+
+    def _weigh_new_rows(self) -> None:
+        """Refresh the IDF when due, or weigh the blocks appended since with the current one."""
+        if self._pending >= self.refresh_every or len(self.idf) == 0:
+            self.refresh()
+            return
+        width = len(self.vocabulary)
+        idf = np.concatenate([self.idf, np.full(width - len(self.idf), smoothed_idf(np.array(0.0), self.idf_docs))])
+        self._weighted.extend(self._weigh(block, idf[:block.shape[1]]) for block in self._blocks[len(self._weighted):])
+        if len(self._blocks) >= self.consolidate_every:
+            self._consolidate()
+
+    def _consolidate(self) -> None:
+        """Stack the pending row blocks onto `counts` and `matrix` (one copy for any number of blocks)."""
+        if not self._blocks:
+            return
+        width = len(self.vocabulary)
+        self.counts = sp.vstack([self._widen(m, width) for m in [self.counts, *self._blocks]], format='csr')
+        self.matrix = sp.vstack([self._widen(m, width) for m in [self.matrix, *self._weighted]], format='csr')
+        self._blocks, self._weighted = [], []
+
+    def refresh(self) -> None:
+        """Recompute the IDF over the whole corpus and rebuild the matrix."""
+        with self._lock:
+            self._blocks, blocks = [], self._blocks
+            self._weighted = []
+            width = len(self.vocabulary)
+            self.counts = sp.vstack([self._widen(m, width) for m in [self.counts, *blocks]], format='csr')
+            n_docs = self.counts.shape[0]
+            df = np.bincount(self.counts.indices, minlength=width).astype(np.float64)
+            self.idf = smoothed_idf(df, n_docs)
+            self.idf_docs = n_docs
+            self.matrix = self._weigh(self.counts, self.idf)
+            self._pending = 0
+
+    @staticmethod
+    def _widen(matrix: sp.csr_matrix, width: int) -> sp.csr_matrix:
+        if matrix.shape[1] == width:
+            return matrix
+        return sp.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width))
+
+    @staticmethod
+    def _weigh(counts: sp.csr_matrix, idf: np.ndarray) -> sp.csr_matrix:
+        weighted = sp.csr_matrix(counts.multiply(idf[np.newaxis, :]))
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sp.csr_matrix(sp.diags(1.0 / norms) @ weighted)
+
+    def vectorize(self, counts: Counter) -> sp.csr_matrix:
+        """L2-normalized TF-IDF row (1 x vocabulary) for arbitrary term counts."""
+        with self._lock:
+            width = len(self.vocabulary)
+            cols, weights, norm = [], [], 0.0
+            for term, tf in counts.items():
+                weight = tf * self._idf_for(term)
+                norm += weight * weight
+                col = self.vocabulary.get(term)
+                if col is not None:
+                    cols.append(col)
+                    weights.append(weight)
+            norm = np.sqrt(norm) or 1.0
+            return sp.csr_matrix((np.array(weights) / norm, (np.zeros(len(cols), dtype=int), cols)), shape=(1, width))
+
+    def transform(self, counts_list: List[Counter]) -> sp.csr_matrix:
+        """Stack vectorize() rows for several documents."""
+        width = len(self.vocabulary)
+        if not counts_list:
+            return sp.csr_matrix((0, width))
+        return sp.vstack([self._widen(self.vectorize(c), width) for c in counts_list], format='csr')
+
+    def similarity(self, counts1: Counter, counts2: Counter) -> float:
+        """Cosine similarity of two documents under the corpus IDF."""
+        if not counts1 or not counts2:
+            return 0.0
+        return self.similarities([counts1], counts2)[0]
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """Changes whenever transform() output could change (IDF refresh or new terms)."""
+        return self.idf_docs, len(self.vocabulary)
+
+    def similarities_to(self, rows: sp.csr_matrix, counts: Counter) -> List[float]:
+        """Scores rows from an earlier transform() against one document."""
+        with self._lock:
+            query = self.vectorize(counts)
+            width = len(self.vocabulary)
+            scores = self._widen(rows, width) @ query.T
+            return [float(s) for s in scores.toarray().ravel()]
+
+    def similarities(self, counts_list: List[Counter], query_counts: Counter) -> List[float]:
+        """Scores many documents against one query with one sparse product."""
+        with self._lock:
+            query = self.vectorize(query_counts)
+            docs = self.transform(counts_list)
+            width = len(self.vocabulary)
+            scores = self._widen(docs, width) @ self._widen(query, width).T
+            return [float(s) for s in scores.toarray().ravel()]
+
+    def score(self, query_counts: Counter, keys: Optional[List[str]] = None) -> np.ndarray:
+        """Cosine scores of the query against indexed documents (all, or `keys`)."""
+        with self._lock:
+            self._consolidate()
+            query = self.vectorize(query_counts)
+            width = len(self.vocabulary)
+            matrix = self._widen(self.matrix, width)
+            if keys is not None:
+                matrix = matrix[[self.rows[k] for k in keys]]
+            return (matrix @ query.T).toarray().ravel()
+
+    def search(self, query_counts: Counter, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (key, cosine score) pairs over the whole corpus, best first."""
+        with self._lock:
+            self.sync()
+            if not self.keys or not query_counts:
+                return []
+            scores = self.score(query_counts)
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.keys[row], float(scores[row])) for row in top]
+
+    def _shard_arrays(self, keys: List[str], counts: sp.csr_matrix) -> Dict[str, np.ndarray]:
+        """A shard of `counts` rows that carries only the terms they use."""
+        used = np.unique(counts.indices)
+        local = np.zeros(max(counts.shape[1], 1), dtype=np.int64)
+        local[used] = np.arange(len(used))
+        return {"keys": np.array(keys, dtype=str), "terms": np.array([self.terms[col] for col in used], dtype=str),
+                "data": counts.data, "indices": local[counts.indices], "indptr": counts.indptr}
+
+    def _read_shards(self) -> int:
+        """Merge the shards not read yet; call under the shard lock."""
+        self._stamp = self._shards.stamp()
+        added = sum(self._merge(shard) for shard in self._shards.read_new(self._seen))
+        if added:
+            self._weigh_new_rows()
+        return added
+
+    def sync(self) -> int:
+        """Add the documents other processes saved since this one last read or wrote the shards."""
+        with self._lock:
+            if not self.directory:
+                return 0
+            stamp = self._shards.stamp()
+            if stamp is None or stamp == self._stamp:
+                return 0
+            with self._shards.lock(shared=True):
+                return self._read_shards()
+
+    def save(self) -> None:
+        """Merge in the shards other processes wrote, then write the documents added here since the last save."""
+        with self._lock:
+            with self._shards.lock():
+                self._read_shards()
+                if self._unsaved:
+                    keys = [key for block_keys, _ in self._unsaved for key in block_keys]
+                    width = len(self.vocabulary)
+                    counts = sp.vstack([self._widen(block, width) for _, block in self._unsaved], format='csr')
+                    self._seen.add(self._shards.write(**self._shard_arrays(keys, counts)))
+                    self._stamp = self._shards.stamp()
+            self._unsaved = []
+            self._unsaved_docs = 0
+
+    def load(self) -> None:
+        """Read every shard in `directory`, compacting them into one if there are too many."""
+        with self._lock:
+            with self._shards.lock():
+                self._read_shards()
+                if len(self._seen) > self._shards.max_shards:
+                    self._consolidate()
+                    self._seen = {self._shards.compact(self._seen, **self._shard_arrays(self.keys, self.counts))}
+                    self._stamp = self._shards.stamp()
@@ -0,0 +1,198 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from shards import ShardDirectory
+
+try:
+    # Optional: approximate search once the pool is large
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+class VectorIndex:
+    """
+    Document vectors (spaCy `doc.vector`) of every indexed CV, keyed by
+    content hash. Rows are stored L2-normalized in a float32 matrix, so
+    cosine similarity against a JD is one matrix-vector product; top-k
+    uses argpartition instead of a full sort.
+
+    With hnswlib installed and at least `ann_min_items` vectors, search()
+    goes through an HNSW graph instead of the exact scan. The graph is
+    rebuilt in memory on first use and kept up to date by add(). The exact
+    scan of 100k 300-d vectors takes ~10ms, so it is only worth it beyond that.
+
+    With a `directory`, the vectors added since the last save are written as
+    one more shard every `save_every` additions. Processes sharing the
+    directory merge each other's shards when they save or search, and load()
+    compacts the shards into one once there are more than a few dozen (same
+    scheme as TfidfIndex, see shards.py).
+    """
+
+    def __init__(self, directory: Optional[str] = None, save_every: int = 50,
+                 ann_min_items: int = 200000, ann_ef: int = 128):
+        self.directory = directory
+        self.save_every = save_every
+        self.ann_min_items = ann_min_items
+        self.ann_ef = ann_ef
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self._data = np.zeros((0, 0), dtype=np.float32)  # grows by doubling; rows past len(keys) are free
+        self._ann = None
+        self._unsaved: List[str] = []  # keys added here since the last save
+        self._shards = ShardDirectory(directory) if directory else None
+        self._seen: Set[str] = set()  # shards already merged
+        self._stamp = None  # shard directory as last read or written
+        self._lock = threading.RLock()
+        if directory and self._shards.names():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._data[:len(self.keys)]
+
+    @property
+    def dim(self) -> int:
+        return self._data.shape[1]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add(self, items: Iterable[Tuple[str, np.ndarray]]) -> int:
+        """Add (key, vector) pairs, skipping known keys and empty vectors. Returns the number added."""
+        with self._lock:
+            new_keys, new_vectors = [], []
+            for key, vector in items:
+                if vector is None or key in self.rows or key in new_keys or not np.any(vector):
+                    continue
+                new_keys.append(key)
+                new_vectors.append(vector)
+            if not new_keys:
+                return 0
+
+            block = self._normalize(np.vstack(new_vectors))
+            if self.dim and block.shape[1] != self.dim:
+                raise ValueError(f"Vector size {block.shape[1]} does not match the index ({self.dim})")
+            self._append(new_keys, block)
+            self._unsaved.extend(new_keys)
+            if self.directory and len(self._unsaved) >= self.save_every:
+                self.save()
+            return len(new_keys)
+
+    def _append(self, keys: List[str], block: np.ndarray) -> None:
+        start = len(self.keys)
+        self._reserve(start + len(keys), block.shape[1])
+        self._data[start:start + len(keys)] = block
+        for key in keys:
+            self.rows[key] = len(self.keys)
+            self.keys.append(key)
+        if self._ann is not None:
+            if self._ann.get_max_elements() < len(self._data):
+                self._ann.resize_index(len(self._data))
+            self._ann.add_items(block, np.arange(start, len(self.keys)))
+
+    def _reserve(self, size: int, dim: int) -> None:
+        if size <= len(self._data):
+            return
+        data = np.zeros((max(size, 2 * len(self._data), 64), dim), dtype=np.float32)
+        if self.keys:
+            data[:len(self.keys)] = self.matrix
+        self._data = data
+
+    def scores(self, query: np.ndarray, keys: Optional[List[str]] = None) -> np.ndarray:
+        """Exact cosine scores of the query against all rows (or just `keys`)."""
+        with self._lock:
+            query = self._normalize(query)
+            if not self.keys or (keys is not None and not keys):
+                return np.zeros(0 if keys is None else len(keys), dtype=np.float32)
+            if keys is None:
+                return self.matrix @ query
+            return self._data[[self.rows[k] for k in keys]] @ query
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (key, cosine score) pairs, best first."""
+        with self._lock:
+            self.sync()
+            if not self.keys or query is None or not np.any(query):
+                return []
+            k = min(k, len(self.keys))
+            if hnswlib is not None and len(self.keys) >= self.ann_min_items:
+                ann = self._ann_index()
+                ann.set_ef(max(self.ann_ef, k))
+                labels, distances = ann.knn_query(self._normalize(query), k=k)
+                return [(self.keys[row], 1.0 - float(d)) for row, d in zip(labels[0], distances[0])]
+
+            scores = self.scores(query)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.keys[row], float(scores[row])) for row in top]
+
+    def _ann_index(self):
+        if self._ann is None:
+            ann = hnswlib.Index(space='ip', dim=self.dim)
+            ann.init_index(max_elements=len(self._data), ef_construction=200, M=16)
+            ann.add_items(self.matrix, np.arange(len(self.keys)))
+            self._ann = ann
+        return self._ann
+
+    def _merge(self, shard: Dict[str, np.ndarray]) -> int:
+        """Append the vectors of a saved shard whose keys aren't indexed yet."""
+        keys = shard["keys"].tolist()
+        keep = [row for row, key in enumerate(keys) if key not in self.rows]
+        if not keep:
+            return 0
+        vectors = shard["vectors"]
+        if self.dim and vectors.shape[1] != self.dim:
+            print(f"Vector index shard skipped: vector size {vectors.shape[1]} does not match the index ({self.dim})")
+            return 0
+        self._append([keys[row] for row in keep], vectors[keep])
+        return len(keep)
+
+    def _read_shards(self) -> int:
+        """Merge the shards not read yet; call under the shard lock."""
+        self._stamp = self._shards.stamp()
+        return sum(self._merge(shard) for shard in self._shards.read_new(self._seen))
+
+    def sync(self) -> int:
+        """Add the vectors other processes saved since this one last read or wrote the shards."""
+        with self._lock:
+            if not self.directory:
+                return 0
+            stamp = self._shards.stamp()
+            if stamp is None or stamp == self._stamp:
+                return 0
+            with self._shards.lock(shared=True):
+                return self._read_shards()
+
+    def save(self) -> None:
+        """Merge in the shards other processes wrote, then write the vectors added here since the last save."""
+        with self._lock:
+            with self._shards.lock():
+                self._read_shards()
+                if self._unsaved:
+                    vectors = self._data[[self.rows[key] for key in self._unsaved]]
+                    self._seen.add(self._shards.write(keys=np.array(self._unsaved, dtype=str), vectors=vectors))
+                    self._stamp = self._shards.stamp()
+            self._unsaved = []
+
+    def load(self) -> None:
+        """Read every shard in `directory`, compacting them into one if there are too many."""
+        with self._lock:
+            with self._shards.lock():
+                self._read_shards()
+                if len(self._seen) > self._shards.max_shards:
+                    self._seen = {self._shards.compact(self._seen, keys=np.array(self.keys, dtype=str),
+                                                       vectors=self.matrix)}
+                    self._stamp = self._shards.stamp()
@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+# Add backend to path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(root_dir, 'backend'))
+
+import match
+from match import JobProfile, calculate_batch_match, calculate_cv_jd_match, read_file
+
+SAMPLES_DIR = os.path.join(root_dir, 'data', 'samples')
+COPIES = 20  # each sample CV is scored this many times
+
+def main():
+    if not match.get_nlp():
+        print("No spaCy model loaded; install en_core_web_md to benchmark the NLP path.")
+        return
+
+    cv_files = sorted(f for f in os.listdir(SAMPLES_DIR) if f.endswith('_cv.pdf'))
+    cv_texts = [read_file(os.path.join(SAMPLES_DIR, f)) for f in cv_files] * COPIES
+    job = JobProfile(read_file(os.path.join(SAMPLES_DIR, 'sample_jd.pdf')))
+
+    start = time.perf_counter()
+    single = [calculate_cv_jd_match(text, job) for text in cv_texts]
+    single_rate = len(cv_texts) / (time.perf_counter() - start)
+    print(f"single-doc path:          {single_rate:8.1f} CVs/sec")
+
+    for batch_size, n_process in ((32, 1), (128, 1), (32, 2)):
+        start = time.perf_counter()
+        batch = calculate_batch_match(cv_texts, job, batch_size=batch_size, n_process=n_process)
+        rate = len(cv_texts) / (time.perf_counter() - start)
+        same = "identical" if batch == single else "DIFFERENT"
+        print(f"nlp.pipe batch={batch_size:<4} n_process={n_process}: {rate:8.1f} CVs/sec ({same})")
+
+if __name__ == "__main__":
+    main()
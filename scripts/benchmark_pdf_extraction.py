@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+import time
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# Add backend to path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(root_dir, 'backend'))
+
+from pdf_text import iter_pdf_pages
+
+PAGES = 300
+
+def create_long_pdf(filename, pages):
+    c = canvas.Canvas(filename, pagesize=letter)
+    for page in range(pages):
+        y = 750
+        for line in range(40):
+            c.drawString(40, y, f"Page {page} line {line}: Python, Django, SQL, Docker and AWS experience.")
+            y -= 18
+        c.showPage()
+    c.save()
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), 'long.pdf')
+    create_long_pdf(path, PAGES)
+
+    runs = [
+        ("layout, all pages", dict(engine='layout', max_pages=0, max_chars=0)),
+        ("fast, all pages", dict(engine='fast', max_pages=0, max_chars=0)),
+        ("fast, default budget", dict(engine='fast')),
+        ("layout, default budget", dict(engine='layout')),
+        ("layout, 2 page workers", dict(engine='layout', max_pages=0, max_chars=0, workers=2)),
+    ]
+    for label, limits in runs:
+        start = time.perf_counter()
+        pages = list(iter_pdf_pages(path, **limits))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<24} {len(pages):4d} pages {sum(map(len, pages)):8d} chars {elapsed:7.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Add backend to path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(root_dir, 'backend'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import match
+from document_validator import validate_cv
+from generate_corpus import generate_corpus, synthetic_cv, synthetic_jd
+from match import (CVProfile, JobProfile, calculate_cv_jd_match, compute_match, extract_categorized_skills,
+                   extract_name, read_bytes, read_docx, read_pdf)
+
+# Benchmarks every stage of the matching pipeline on synthetic corpora and
+# writes the numbers as JSON, so two releases can be compared with --compare.
+#
+# Text stages run over the whole corpus. The file stages (read_pdf,
+# read_docx, end_to_end) run over the first --file-sample CVs written to
+# disk, since generating 100k PDFs would take longer than the benchmark.
+# The similarity and compute_match stages score each CV's profile against
+# its JD's JobProfile, as the API does; tfidf_similarities is timed per
+# batch of CVS_PER_JD CVs.
+
+SIZES = (10, 1000, 100000)
+STAGES = ("read_pdf", "read_docx", "validate_cv", "extract_categorized_skills", "cv_profile",
+          "semantic_similarity", "tfidf_similarities", "extract_name", "compute_match", "end_to_end")
+CVS_PER_JD = 100
+
+def peak_rss_mb():
+    """ Peak resident set size of this process so far, or None where unsupported. """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def time_calls(fn, items):
+    """ Calls fn(*item) for every item after one warm-up call; returns per-call seconds. """
+    if items:
+        fn(*items[0])
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        fn(*item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def summarize(latencies, docs=None):
+    """ Latency stats; throughput counts `docs` documents (default one per call). """
+    latencies = np.array(latencies)
+    total = float(latencies.sum())
+    docs = len(latencies) if docs is None else docs
+    return {
+        "calls": len(latencies),
+        "total_s": round(total, 4),
+        "throughput_per_s": round(docs / total, 2) if total else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 4),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 4),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def run_size(n, file_sample, seed):
+    """ Builds an n-CV corpus and times each stage; runs in a fresh process per size. """
+    rng = random.Random(seed)
+    build_start = time.perf_counter()
+    cvs = ["\n".join(synthetic_cv(rng, i)) for i in range(n)]
+    jds = ["\n".join(synthetic_jd(rng, i)) for i in range(max(1, n // CVS_PER_JD))]
+    jobs = [JobProfile(jd) for jd in jds]
+
+    workdir = tempfile.mkdtemp(prefix="hr_bench_")
+    try:
+        n_files = min(n, file_sample) if file_sample else n
+        paths = generate_corpus(workdir, n_files, n_jds=0, seed=seed)
+        build_s = time.perf_counter() - build_start
+
+        job = jobs[0]
+        files = [(open(path, 'rb').read(), os.path.basename(path)) for path in paths["pdf"]]
+
+        def end_to_end(data, filename):
+            text = read_bytes(data, filename)
+            validate_cv(text)
+            return calculate_cv_jd_match(text, job)
+
+        # Filled by the cv_profile stage (the warm-up call is overwritten) for the stages after it
+        profiles = {}
+
+        def cv_profile(i, cv):
+            profiles[i] = CVProfile.from_text(cv)
+
+        def profile_pairs():
+            return [(profiles[i], jobs[i % len(jobs)]) for i in range(n)]
+
+        batches = [(job, cvs[j::len(jobs)]) for j, job in enumerate(jobs)]
+        stages = {
+            "read_pdf": (read_pdf, [(path,) for path in paths["pdf"]]),
+            "read_docx": (read_docx, [(path,) for path in paths["docx"]]),
+            "validate_cv": (validate_cv, [(cv,) for cv in cvs]),
+            "extract_categorized_skills": (extract_categorized_skills, [(cv,) for cv in cvs]),
+            "cv_profile": (cv_profile, list(enumerate(cvs))),
+            "semantic_similarity": (lambda cv, job: job.semantic_similarity(cv), profile_pairs),
+            "tfidf_similarities": (lambda job, texts: job.tfidf_similarities(texts), batches),
+            "extract_name": (extract_name, [(cv,) for cv in cvs]),
+            "compute_match": (compute_match, profile_pairs),
+            "end_to_end": (end_to_end, files),
+        }
+        results = {}
+        for stage in STAGES:
+            fn, items = stages[stage]
+            if stage == "semantic_similarity" and not match.get_nlp():
+                results[stage] = {"skipped": "no spaCy model loaded"}
+                continue
+            items = items() if callable(items) else items
+            docs = sum(len(texts) for _, texts in items) if stage == "tfidf_similarities" else None
+            results[stage] = summarize(time_calls(fn, items), docs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {"documents": n, "jds": len(jds), "files": n_files, "corpus_build_s": round(build_s, 2),
+            "stages": results, "peak_rss_mb": peak_rss_mb()}
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root_dir,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    nlp = match.get_nlp()
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "spacy_model": f"{nlp.meta.get('name')}-{nlp.meta.get('version')}" if nlp else None,
+        "pdf_engine": os.environ.get('PDF_ENGINE', 'fast'),
+    }
+
+def compare(results, baseline, tolerance):
+    """ Stages whose p50 latency grew by more than `tolerance` (a fraction) since the baseline. """
+    regressions = []
+    for size, run in results["runs"].items():
+        old_run = baseline.get("runs", {}).get(size)
+        if not old_run:
+            continue
+        for stage, stats in run["stages"].items():
+            old = old_run["stages"].get(stage, {})
+            if "p50_ms" in stats and old.get("p50_ms"):
+                change = stats["p50_ms"] / old["p50_ms"] - 1
+                if change > tolerance:
+                    regressions.append((size, stage, old["p50_ms"], stats["p50_ms"], change))
+    return regressions
+
+def print_run(size, run):
+    print(f"\n{size} CVs ({run['files']} as files, {run['jds']} JDs; corpus built in {run['corpus_build_s']}s)")
+    print(f"{'stage':<28} {'calls':>7} {'docs/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8}")
+    for stage, stats in run["stages"].items():
+        if "skipped" in stats:
+            print(f"{stage:<28} skipped: {stats['skipped']}")
+            continue
+        print(f"{stage:<28} {stats['calls']:>7} {stats['throughput_per_s'] or 0:>10.1f} "
+              f"{stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['peak_rss_mb'] or 0:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the matching pipeline on synthetic corpora.")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated corpus sizes")
+    parser.add_argument("--file-sample", type=int, default=1000,
+                        help="CVs written as PDF/DOCX for the file stages (0 = all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/pipeline-<time>.json)")
+    parser.add_argument("--compare", help="earlier JSON results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {"environment": environment(), "file_sample": args.file_sample, "seed": args.seed, "runs": {}}
+    # A fresh process per size, so each size reports its own peak RSS
+    context = multiprocessing.get_context("spawn")
+    for size in (int(s) for s in args.sizes.split(",")):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            run = pool.submit(run_size, size, args.file_sample, args.seed).result()
+        results["runs"][str(size)] = run
+        print_run(size, run)
+
+    output = args.output or os.path.join(root_dir, "benchmarks", f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for size, stage, old, new, change in regressions:
+            print(f"REGRESSION {size} CVs {stage}: p50 {old:.3f} -> {new:.3f} ms (+{change:.0%})")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
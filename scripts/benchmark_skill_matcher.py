@@ -0,0 +1,120 @@
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add backend to path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(root_dir, 'backend'))
+
+from match import extract_categorized_skills, get_skill_taxonomy, preprocess_text, read_file
+from skill_taxonomy import SkillTaxonomy, build_skill_trie, match_skill_tokens, tokenize_skills
+
+SAMPLES_DIR = os.path.join(root_dir, 'data', 'samples')
+REPEATS = 200
+
+def legacy_extract(text, categories):
+    """ The previous per-skill substring scan, kept here for comparison. """
+    found = {category: set() for category in categories}
+    text_processed = preprocess_text(text)
+    for category, skills in categories.items():
+        for skill in skills:
+            if skill in text_processed:
+                found[category].add(skill)
+    return found
+
+def trie_extract(text, trie, categories):
+    found = {category: set() for category in categories}
+    for category, skill in match_skill_tokens(tokenize_skills(text), trie):
+        found[category].add(skill)
+    return found
+
+def inflate_taxonomy(size):
+    """ Pads the real taxonomy with synthetic entries up to `size` skills. """
+    categories = {k: set(v) for k, v in get_skill_taxonomy().categories.items()}
+    total = sum(len(v) for v in categories.values())
+    i = 0
+    while total < size:
+        categories["technical"].add(f"synthskill{i} framework")
+        i += 1
+        total += 1
+    return categories
+
+def time_per_doc(fn, texts):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (REPEATS * len(texts)) * 1e6
+
+def set_overlap(cv_sets, jd_set):
+    """ Matched/missing/extra skills and ratio per CV with string set operations. """
+    return [(cv & jd_set, jd_set - cv, cv - jd_set, len(cv & jd_set) / len(jd_set) if jd_set else 0.0)
+            for cv in cv_sets]
+
+def benchmark_overlap(n_cvs=50000):
+    """ One JD against n_cvs CV skill sets: string sets vs taxonomy bitsets. """
+    print(f"\nOverlap of one JD with {n_cvs} CVs:")
+    print(f"{'taxonomy':>10} {'sets ms':>9} {'bitsets ms':>11} {'speedup':>9} {'pool rows ms':>13}")
+    rng = random.Random(0)
+    for size in (200, 5000, 20000):
+        taxonomy = SkillTaxonomy(inflate_taxonomy(size))
+        cv_sets = [set(rng.sample(taxonomy.names, rng.randint(10, 40))) for _ in range(n_cvs)]
+        jd_set = set(rng.sample(taxonomy.names, 15))
+        # Profiles carry their bitsets; the pool's word rows are built once and reused for every JD
+        cv_bits = [taxonomy.bits(cv) for cv in cv_sets]
+        jd_bits = taxonomy.bits(jd_set)
+        start = time.perf_counter()
+        cv_words = taxonomy.words(cv_bits)
+        words_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        by_sets = set_overlap(cv_sets, jd_set)
+        sets_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        overlap = taxonomy.overlap(cv_words, jd_bits)
+        ratio = overlap.ratio
+        bits_ms = (time.perf_counter() - start) * 1000
+        assert np.array_equal(ratio, [r for _, _, _, r in by_sets])
+        print(f"{size:>10} {sets_ms:>9.1f} {bits_ms:>11.1f} {sets_ms / bits_ms:>8.1f}x {words_ms:>13.1f}")
+
+def benchmark_compile(texts):
+    """ Compiling large taxonomies with aliases (one per two skills), and extraction with them. """
+    print(f"\n{'taxonomy':>10} {'aliases':>8} {'compile ms':>11} {'extract us/doc':>15}")
+    for size in (1000, 10000, 50000):
+        categories = inflate_taxonomy(size)
+        names = sorted(categories["technical"])
+        aliases = {f"alias{i} fw": names[i] for i in range(0, len(names), 2)}
+        start = time.perf_counter()
+        taxonomy = SkillTaxonomy(categories, aliases)
+        compile_ms = (time.perf_counter() - start) * 1000
+        extract_us = time_per_doc(taxonomy.extract, texts)
+        print(f"{size:>10} {len(aliases):>8} {compile_ms:>11.1f} {extract_us:>15.1f}")
+
+def main():
+    files = sorted(f for f in os.listdir(SAMPLES_DIR) if f.endswith('.pdf'))
+    texts = [read_file(os.path.join(SAMPLES_DIR, f)) for f in files]
+    print(f"Loaded {len(texts)} sample documents from {SAMPLES_DIR}\n")
+
+    print("Skills found (legacy substring scan vs token trie):")
+    for name, text in zip(files, texts):
+        old = set().union(*legacy_extract(text, get_skill_taxonomy().categories).values())
+        new = set().union(*extract_categorized_skills(text).values())
+        print(f"  {name}: {len(old)} -> {len(new)}"
+              f"  dropped={sorted(old - new)} added={sorted(new - old)}")
+
+    print(f"\n{'taxonomy':>10} {'legacy us/doc':>15} {'trie us/doc':>13} {'speedup':>9}")
+    for size in (200, 1000, 5000, 20000):
+        categories = inflate_taxonomy(size)
+        trie = build_skill_trie(categories)
+        legacy_us = time_per_doc(lambda t: legacy_extract(t, categories), texts)
+        trie_us = time_per_doc(lambda t: trie_extract(t, trie, categories), texts)
+        print(f"{size:>10} {legacy_us:>15.1f} {trie_us:>13.1f} {legacy_us / trie_us:>8.1f}x")
+
+    benchmark_compile(texts)
+    benchmark_overlap()
+
+if __name__ == "__main__":
+    main()
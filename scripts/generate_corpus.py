@@ -0,0 +1,152 @@
+import argparse
+import os
+import random
+import sys
+
+import docx
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# Add backend to path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(root_dir, 'backend'))
+
+from match import get_skill_taxonomy
+
+# Synthetic CVs and JDs in the shape of generate_high_match.py / generate_low_match.py,
+# with names, skills, seniority and education drawn at random (seeded, so a
+# corpus of a given size is the same on every run).
+
+FIRST_NAMES = ["Alex", "Maria", "James", "Aisha", "Wei", "Fatima", "Daniel", "Sofia", "Omar", "Emma",
+               "Lucas", "Priya", "Noah", "Hana", "Samuel", "Zara", "Ivan", "Chloe", "Ahmed", "Grace"]
+LAST_NAMES = ["Smith", "Khan", "Garcia", "Chen", "Johnson", "Ali", "Müller", "Rossi", "Nguyen", "Brown",
+              "Ahmed", "Silva", "Kowalski", "Tanaka", "Okafor", "Martin", "Haddad", "Lee", "Novak", "Evans"]
+ROLES = ["Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer", "Mobile Developer",
+         "Machine Learning Engineer", "Full Stack Developer", "QA Engineer", "Data Engineer", "Product Analyst"]
+LEVELS = [("Junior", 1), ("", 3), ("Senior", 6), ("Lead", 9)]
+COMPANIES = ["Tech Solutions Inc.", "Cloud Nine Systems", "DataWorks", "Bright Apps", "Nordic Software",
+             "Acme Analytics", "Blue Harbor Labs", "Quantum Retail", "Open Health", "Vertex Finance"]
+DEGREES = ["Bachelor's in Computer Science", "Master's in Data Science", "B.Tech in Information Technology",
+           "PhD in Machine Learning", "Diploma in Software Development", "MBA, Business School"]
+UNIVERSITIES = ["University of Technology", "State University", "Institute of Science", "City College"]
+DUTIES = ["Built and maintained services using {0} and {1}.",
+          "Reduced deployment time by {n}% by introducing {0}.",
+          "Led a team of {m} developers delivering features with {0}.",
+          "Migrated legacy systems to {0}, improving reliability.",
+          "Designed data pipelines with {0} and {1} for reporting.",
+          "Mentored junior engineers on {0} best practices."]
+
+SKILL_CATEGORIES = get_skill_taxonomy().categories
+TECHNICAL = sorted(SKILL_CATEGORIES["technical"])
+TOOLS = sorted(SKILL_CATEGORIES["tools"])
+SOFT = sorted(SKILL_CATEGORIES["soft"])
+
+def pick(rng, pool, k):
+    return rng.sample(pool, min(k, len(pool)))
+
+def synthetic_cv(rng, i):
+    """ Lines of one synthetic CV; length varies with the number of jobs held. """
+    level, years = rng.choice(LEVELS)
+    role = f"{level} {rng.choice(ROLES)}".strip()
+    technical, tools = pick(rng, TECHNICAL, rng.randint(4, 12)), pick(rng, TOOLS, rng.randint(2, 6))
+    skills = technical + tools
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        role,
+        f"{name.split()[0].lower()}.{i}@example.com",
+        "",
+        "Professional Summary:",
+        f"{role} with {years + rng.randint(0, 3)} years of experience in {technical[0]} development.",
+        f"Strong {', '.join(pick(rng, SOFT, 3))} skills.",
+        "",
+        "Skills:",
+        f"- Languages & Frameworks: {', '.join(technical)}",
+        f"- Tools: {', '.join(tools)}",
+        "",
+        "Experience:",
+    ]
+    end_year = 2024
+    for _ in range(rng.randint(1, 6)):
+        start_year = end_year - rng.randint(1, 4)
+        lines.append(f"{role} | {rng.choice(COMPANIES)} ({start_year} - {end_year})")
+        for _ in range(rng.randint(2, 4)):
+            a, b = pick(rng, skills, 2)
+            lines.append("- " + rng.choice(DUTIES).format(a, b, n=rng.randint(10, 60), m=rng.randint(2, 9)))
+        end_year = start_year
+    lines += ["", "Education:", f"- {rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}"]
+    return lines
+
+def synthetic_jd(rng, i):
+    """ Lines of one synthetic job description. """
+    level, years = rng.choice(LEVELS)
+    role = f"{level} {rng.choice(ROLES)}".strip()
+    required = pick(rng, TECHNICAL, rng.randint(3, 8)) + pick(rng, TOOLS, rng.randint(1, 4))
+    return [
+        f"Job Title: {role}",
+        "",
+        "Job Description:",
+        f"We are looking for a {role} to join our team at {rng.choice(COMPANIES)}.",
+        f"The ideal candidate has strong experience with {', '.join(required[:3])}.",
+        "",
+        "Requirements:",
+        f"- {years}+ years of experience in software development.",
+        f"- Proficiency in {', '.join(required)}.",
+        f"- Excellent {', '.join(pick(rng, SOFT, 2))} skills.",
+        f"- {rng.choice(DEGREES).split(',')[0]} or related field.",
+        "",
+        "Responsibilities:",
+        f"- Design, build and maintain systems using {required[0]}.",
+        "- Collaborate with product and design teams.",
+        f"- Requisition {i}: apply now, send resume to hiring@example.com.",
+    ]
+
+def create_pdf(filename, text_lines):
+    c = canvas.Canvas(filename, pagesize=letter)
+    width, height = letter
+    y = height - 40
+    for line in text_lines:
+        if y < 40:
+            c.showPage()
+            y = height - 40
+        c.drawString(40, y, line)
+        y -= 20
+    c.save()
+
+def create_docx(filename, text_lines):
+    document = docx.Document()
+    for line in text_lines:
+        document.add_paragraph(line)
+    document.save(filename)
+
+def generate_corpus(directory, n_cvs, n_jds=1, seed=0, formats=("pdf", "docx")):
+    """ Writes cv_<i>.<ext> and jd_<i>.<ext> files; returns the CV paths per format. """
+    os.makedirs(directory, exist_ok=True)
+    writers = {"pdf": create_pdf, "docx": create_docx}
+    rng = random.Random(seed)
+    paths = {fmt: [] for fmt in formats}
+    for i in range(n_cvs):
+        lines = synthetic_cv(rng, i)
+        for fmt in formats:
+            path = os.path.join(directory, f"cv_{i}.{fmt}")
+            writers[fmt](path, lines)
+            paths[fmt].append(path)
+    for i in range(n_jds):
+        lines = synthetic_jd(rng, i)
+        for fmt in formats:
+            writers[fmt](os.path.join(directory, f"jd_{i}.{fmt}"), lines)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic CV/JD corpus as PDF and DOCX files.")
+    parser.add_argument("directory")
+    parser.add_argument("--cvs", type=int, default=100)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--formats", default="pdf,docx")
+    args = parser.parse_args()
+    generate_corpus(args.directory, args.cvs, args.jds, args.seed, tuple(args.formats.split(",")))
+    print(f"Created {args.cvs} CVs and {args.jds} JDs in {args.directory}")
+
+if __name__ == "__main__":
+    main()
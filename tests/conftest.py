@@ -0,0 +1,66 @@
+import hashlib
+import os
+import random
+import re
+import sys
+
+import numpy as np
+import pytest
+import spacy
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(root_dir, 'backend'))
+sys.path.append(os.path.join(root_dir, 'scripts'))
+
+import match
+from generate_corpus import synthetic_cv, synthetic_jd
+
+VECTOR_WIDTH = 32
+
+
+def blank_nlp_with_vectors(texts):
+    """
+    A blank English pipeline (tokenizer only, no NER) whose vocabulary has a
+    fixed pseudo-random vector for every word of `texts` longer than three
+    letters, so shorter words stay out of vocabulary as in a real model.
+    """
+    nlp = spacy.blank("en")
+    for word in sorted({w for text in texts for w in re.findall(r"[A-Za-z]{4,}", text)}):
+        seed = int.from_bytes(hashlib.sha256(word.lower().encode('utf-8')).digest()[:4], 'little')
+        nlp.vocab.set_vector(word, np.random.default_rng(seed).standard_normal(VECTOR_WIDTH).astype(np.float32))
+    return nlp
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """(CV texts, JD texts) of a seeded synthetic corpus, with an empty CV and a CV identical to a JD."""
+    rng = random.Random(7)
+    cvs = ["\n".join(synthetic_cv(rng, i)) for i in range(40)]
+    jds = ["\n".join(synthetic_jd(rng, i)) for i in range(4)]
+    return cvs + ["", jds[0]], jds
+
+
+@pytest.fixture(scope="session", autouse=True)
+def nlp(corpus):
+    cvs, jds = corpus
+    previous = match._nlp, match._nlp_loaded
+    match._nlp, match._nlp_loaded = blank_nlp_with_vectors(cvs + jds), True
+    yield match._nlp
+    match._nlp, match._nlp_loaded = previous
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    """The web app module, imported with its databases, indexes and uploads under a temporary directory."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        import app
+        yield app
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
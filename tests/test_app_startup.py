@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import threading
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+
+def test_importing_the_app_does_not_load_the_model(tmp_path):
+    code = ("import match\n"
+            "calls = []\n"
+            "match.warm_up_nlp = lambda: calls.append(True)\n"
+            "import app\n"
+            "assert not calls and not match._nlp_loaded, calls\n")
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(BACKEND), SPACY_PREWARM="1")
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True, timeout=120)
+
+
+def test_model_is_prewarmed_on_the_first_request(app_module, client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app_module, "warm_up_nlp", lambda: calls.append(True))
+    monkeypatch.setattr(app_module, "_prewarm_started", threading.Event())
+    monkeypatch.setitem(app_module.app.config, "SPACY_PREWARM", True)
+    assert not calls
+    client.get("/about")
+    client.get("/about")
+    assert calls == [True]
@@ -0,0 +1,30 @@
+import numpy as np
+
+from match import CVProfile, JobProfile, build_cv_profiles, calculate_batch_match, calculate_cv_jd_match
+
+
+def test_pipe_profiles_match_single_profiles(corpus):
+    cvs, _ = corpus
+    batched = build_cv_profiles(cvs, batch_size=4)
+    for text, profile in zip(cvs, batched):
+        single = CVProfile.from_text(text)
+        assert profile.skills == single.skills
+        assert profile.name == single.name
+        assert profile.vector_norm == single.vector_norm
+        assert np.array_equal(profile.vector, single.vector)
+
+
+def test_batch_match_equals_single_match(corpus):
+    cvs, jds = corpus
+    for jd in jds:
+        expected = [calculate_cv_jd_match(cv, jd) for cv in cvs]
+        assert calculate_batch_match(cvs, jd, batch_size=4) == expected
+        assert calculate_batch_match(cvs, JobProfile(jd)) == expected
+
+
+def test_batch_match_unrendered(corpus):
+    cvs, jds = corpus
+    results = calculate_batch_match(cvs, jds[1], render=False)
+    assert results[cvs.index("")] is None
+    assert [r.to_dict() for r in results if r is not None] == \
+        [calculate_cv_jd_match(cv, jds[1]) for cv in cvs if cv]
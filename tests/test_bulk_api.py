@@ -0,0 +1,65 @@
+import base64
+import json
+
+from generate_corpus import create_pdf
+
+
+def post_bulk(client, body, **kwargs):
+    response = client.post("/api/match/bulk", **kwargs, **({"json": body} if body is not None else {}))
+    return response.status_code, [json.loads(line) for line in response.get_data().splitlines()]
+
+
+def test_json_bulk_streams_one_line_per_cv(app_module, client, corpus):
+    cvs, jds = corpus
+    items = [{"id": f"cv-{i}", "text": cv} for i, cv in enumerate(cvs[:5])] + ["not an object", {"text": "short"}]
+    status, lines = post_bulk(client, {"jd": {"text": jds[1]}, "cvs": items})
+    assert status == 200
+    assert [line.get("index") for line in lines] == list(range(7)) + [None]
+    assert [line["id"] for line in lines[:5]] == [f"cv-{i}" for i in range(5)]
+    assert lines[5] == {"index": 5, "id": 5, "error": "Expected a JSON object"}
+    assert lines[6]["error"].startswith("Invalid CV")
+    assert lines[-1]["status"] == "done" and (lines[-1]["total"], lines[-1]["failed"]) == (7, 2)
+
+    # Each line is the full result the single-CV scoring gives
+    job, _ = app_module.load_job_profile(jd_text_input=jds[1])
+    for line, result in zip(lines[:5], app_module.calculate_batch_match(cvs[:5], job)):
+        assert line["match_percentage"] == result["match_percentage"]
+        assert line["skills"] == result["skills"]
+
+
+def test_ndjson_bulk_with_a_file_and_chunks(client, corpus, tmp_path, monkeypatch, app_module):
+    cvs, jds = corpus
+    monkeypatch.setitem(app_module.app.config, "BULK_CHUNK_SIZE", 2)
+    path = str(tmp_path / "cv.pdf")
+    create_pdf(path, cvs[0].splitlines())
+    with open(path, "rb") as f:
+        pdf = base64.b64encode(f.read()).decode("ascii")
+    body = "\n".join(json.dumps(line) for line in [
+        {"jd": {"text": jds[0]}},
+        {"id": "pdf", "file": pdf, "filename": "cv.pdf"},
+        {"id": "bad", "file": "%%%", "filename": "cv.pdf"},
+        {"id": "text", "text": cvs[1]},
+    ]) + "\n"
+    status, lines = post_bulk(client, None, data=body, content_type="application/x-ndjson")
+    assert status == 200
+    assert [line.get("id") for line in lines] == ["pdf", "bad", "text", None]
+    assert lines[0]["candidate_name"] and "match_percentage" in lines[0]
+    assert lines[1]["error"] == "'file' is not valid base64"
+    assert lines[-1]["completed"] == 2
+
+
+def test_stored_results_and_registered_jds(client, corpus, app_module):
+    cvs, jds = corpus
+    jd_id = app_module.jd_registry.add("Bulk JD", jds[2])
+    before = app_module.candidate_store.count(jd_id=jd_id)
+    status, lines = post_bulk(client, {"jd_id": jd_id, "store": True, "cvs": [{"text": cv} for cv in cvs[:3]]})
+    assert status == 200 and lines[-1]["completed"] == 3
+    assert app_module.candidate_store.count(jd_id=jd_id) == before + 3
+
+
+def test_bad_requests(client, corpus):
+    _, jds = corpus
+    assert post_bulk(client, {"jd": {"text": jds[0]}}) == (400, [{"error": "Expected a JSON object with a 'cvs' list"}])
+    assert post_bulk(client, {"jd_id": 10 ** 6, "cvs": []}) == (400, [{"error": "JD not found"}])
+    status, lines = post_bulk(client, None, data="not json\n", content_type="application/x-ndjson")
+    assert (status, lines) == (400, [{"error": "The first line must be a JSON object"}])
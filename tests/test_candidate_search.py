@@ -0,0 +1,50 @@
+import pytest
+
+
+@pytest.fixture
+def indexed(client, corpus):
+    cvs, jds = corpus
+    client.post("/api/match/bulk", json={"jd": {"text": jds[0]}, "store": True,
+                                         "cvs": [{"text": cv} for cv in cvs[:12]]}).get_data()
+    return jds[1]
+
+
+def search(client, jd_text, k):
+    response = client.post("/api/candidates/search", data={"jd_text": jd_text, "k": k})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_search_rescores_the_shortlist(client, indexed):
+    found = search(client, indexed, 5)
+    assert len(found["results"]) == 5 and found["skipped"] == 0
+    assert found["scored"] == found["shortlisted"]
+    assert all(result["rescored"] for result in found["results"])
+    scores = [result["match_percentage"] for result in found["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_evicted_candidates_fall_back_to_their_stored_scores(client, indexed, app_module, monkeypatch):
+    full = search(client, indexed, 5)
+    kept = [result["cv_hash"] for result in full["results"][:3]]
+    get = app_module.feature_cache.get
+    monkeypatch.setattr(app_module.feature_cache, "get", lambda key: get(key) if key in kept else None)
+
+    found = search(client, indexed, 5)
+    assert found["scored"] == 3 and found["skipped"] == full["shortlisted"] - 3
+    results = found["results"]
+    assert [result["cv_hash"] for result in results[:3]] == kept
+    # Evicted ones fill the remaining places in retrieval order, with the scores stored for them
+    assert [result["rescored"] for result in results] == [True] * 3 + [False] * 2
+    assert results[3]["retrieval_score"] >= results[4]["retrieval_score"]
+    stored = app_module.candidate_store.by_hashes([result["cv_hash"] for result in results[3:]], components=True)
+    for result in results[3:]:
+        candidate = stored[result["cv_hash"]]
+        assert result["stored_score"] == candidate["score"] and result["candidate_id"] == candidate["id"]
+        assert set(result["component_scores"]) == {"semantic", "tfidf", "skills", "exp", "edu"}
+
+    # Nothing left to rescore: the whole list comes from the stored scores
+    monkeypatch.setattr(app_module.feature_cache, "get", lambda key: None)
+    found = search(client, indexed, 5)
+    assert found["scored"] == 0 and found["skipped"] == found["shortlisted"]
+    assert len(found["results"]) == 5 and not any(result["rescored"] for result in found["results"])
@@ -0,0 +1,71 @@
+import pytest
+
+from candidate_store import CandidateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CandidateStore(str(tmp_path / "candidates.sqlite3"))
+    # Many ties on score, so paging has to fall back on the id
+    for i in range(23):
+        store.add({"candidate_name": f"Candidate {i:02d}", "cv_filename": f"cv_{i}.pdf",
+                   "match_percentage": [40.0, 55.5, 55.5, 70.0][i % 4],
+                   "experience_level": {"cv": "Senior Level" if i % 3 else "Junior Level"}})
+    return store
+
+
+def walk_forward(store, limit, **filters):
+    pages, cursor = [], None
+    while True:
+        rows, cursor, _ = store.page(after=cursor, limit=limit, **filters)
+        pages.append([row["id"] for row in rows])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("sort", ["score", "date", "name"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_keyset_pages_cover_the_sorted_rows(store, sort, order):
+    column = {"score": "score", "date": "created_at", "name": "name"}[sort]
+    everything, _, _ = store.page(sort=sort, order=order, limit=100)
+    key = [(row[column], row["id"]) for row in everything]
+    assert key == sorted(key, reverse=order == "desc")
+
+    pages = walk_forward(store, 5, sort=sort, order=order)
+    assert [cand_id for page in pages for cand_id in page] == [row["id"] for row in everything]
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+
+
+def test_backward_pages_mirror_forward_pages(store):
+    filters = {"sort": "score", "order": "desc"}
+    forward, cursor, prev_cursor = [], None, None
+    while True:
+        rows, next_cursor, prev_cursor = store.page(after=cursor, limit=4, **filters)
+        forward.append((rows, prev_cursor))
+        if next_cursor is None:
+            break
+        cursor = next_cursor
+
+    # From the last page, `before` cursors lead back through the same pages
+    rows, prev_cursor = forward[-1]
+    for expected, _ in reversed(forward[:-1]):
+        rows, _, prev_cursor = store.page(before=prev_cursor, limit=4, **filters)
+        assert [row["id"] for row in rows] == [row["id"] for row in expected]
+    assert prev_cursor is None
+
+
+def test_filters_apply_to_every_page(store):
+    pages = walk_forward(store, 3, sort="score", exp="Junior Level", min_score=50)
+    ids = [cand_id for page in pages for cand_id in page]
+    everything, _, _ = store.page(sort="score", limit=100)
+    assert ids == [row["id"] for row in everything if row["exp"] == "Junior Level" and row["score"] >= 50]
+    assert store.count() == 23
+
+
+def test_count_follows_the_filters(store):
+    everything, _, _ = store.page(limit=100)
+    assert store.count() == len(everything) == 23
+    assert store.count(exp="Junior Level", min_score=50) == \
+        sum(row["exp"] == "Junior Level" and row["score"] >= 50 for row in everything)
+    assert store.count(max_score=40) == 6
+    assert store.count(jd_id=7) == 0
@@ -0,0 +1,65 @@
+import random
+import re
+
+import pytest
+
+from document_validator import (COMPANY_PATTERNS, CONTACT_PATTERNS, CV_KEYWORDS, JD_KEYWORDS, analyze_text,
+                                document_confidences, get_document_type, validate_cv, validate_jd)
+
+CV = """John Doe
+Email: john.doe@example.com | linkedin.com/in/johndoe
+Professional Summary: engineer with 5 years of experience.
+Work Experience, Education, Skills: Python, SQL"""
+
+JD = """Senior Python Developer
+We are looking for a candidate to join our team.
+Responsibilities and Requirements: Django. Qualifications preferred. Benefits: salary.
+How to apply: send resume"""
+
+
+def reference_confidences(text):
+    """The per-pattern scoring the validator replaced: every regex searched separately, IGNORECASE."""
+    lower = text.lower().strip()
+    contact = any(re.search(p, text, re.IGNORECASE) for p in CONTACT_PATTERNS)
+    company = any(re.search(p, text, re.IGNORECASE) for p in COMPANY_PATTERNS)
+    cv = min(sum(k in lower for k in CV_KEYWORDS) * 10, 50) + 30 * contact - 20 * company + \
+        10 * sum(s in lower for s in ('experience', 'education', 'skills'))
+    jd = min(sum(k in lower for k in JD_KEYWORDS) * 10, 50) + 30 * company - 20 * contact + \
+        10 * sum(s in lower for s in ('responsibilities', 'requirements', 'qualifications'))
+    return max(0, min(cv, 100)), max(0, min(jd, 100))
+
+
+def shuffled_case(rng, text):
+    return "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in text)
+
+
+def test_confidences_match_the_per_pattern_scoring(corpus):
+    cvs, jds = corpus
+    rng = random.Random(3)
+    texts = [CV, JD, "JOIN US at our COMPANY", "Call +44 (20) 7946 0958", "Ünïcode résumé, Skills: Python"]
+    texts += [text for text in cvs + jds if text]
+    texts += [shuffled_case(rng, text) for text in texts]
+    for text in texts:
+        assert document_confidences(text) == reference_confidences(text), text[:60]
+
+
+def test_signals():
+    signals = analyze_text(CV)
+    assert signals.has_contact and not signals.has_company
+    assert {"experience", "education", "skills", "summary", "professional"} <= signals.keywords
+    signals = analyze_text(JD)
+    assert signals.has_company and {"responsibilities", "requirements", "looking for"} <= signals.keywords
+
+
+@pytest.mark.parametrize("validate", [validate_cv, validate_jd])
+def test_short_documents_are_rejected(validate):
+    assert validate("   short  ") == (False, 0.0, "Document is too short (minimum 10 characters required)")
+    assert validate("") == (False, 0.0, "Document is too short (minimum 10 characters required)")
+
+
+def test_document_types():
+    assert validate_cv(CV)[:2] == (True, 100)
+    assert validate_jd(JD)[:2] == (True, 100)
+    assert get_document_type(CV) == "CV"
+    assert get_document_type(JD) == "JD"
+    assert get_document_type("Some random text without any signal") == "UNKNOWN"
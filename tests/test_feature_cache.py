@@ -0,0 +1,38 @@
+import json
+import sqlite3
+
+from feature_cache import FeatureCache, content_hash
+from match import CVProfile, JobProfile, calculate_cv_jd_match
+
+
+def test_cached_profile_scores_like_a_fresh_one(corpus, tmp_path):
+    cvs, jds = corpus
+    cache = FeatureCache(str(tmp_path / "features.sqlite3"))
+    job = JobProfile(jds[0])
+    for text in cvs[:10]:
+        key = content_hash(text.encode('utf-8'))
+        cache.put(key, CVProfile.from_text(text).to_dict())
+        cached = CVProfile.from_dict(cache.get(key))
+        assert calculate_cv_jd_match(cached, job) == calculate_cv_jd_match(text, job)
+
+
+def test_cache_round_trip_is_json(tmp_path):
+    cache = FeatureCache(str(tmp_path / "features.sqlite3"), max_entries=2)
+    for i in range(3):
+        cache.put(str(i), {"n": i})
+    assert cache.get("0") is None
+    assert cache.get("2") == json.loads('{"n": 2}')
+
+
+def test_running_totals_follow_puts_and_evictions(tmp_path):
+    path = str(tmp_path / "features.sqlite3")
+    cache = FeatureCache(path, max_entries=3)
+    for i in range(5):
+        cache.put(str(i), {"n": i, "pad": "x" * i})
+    cache.put("4", {"n": 4, "pad": "y" * 100})
+    cache.delete("3")
+
+    with sqlite3.connect(path) as conn:
+        actual = conn.execute("SELECT COUNT(*), SUM(size) FROM features").fetchone()
+        assert conn.execute("SELECT entries, bytes FROM feature_stats").fetchone() == actual
+    assert actual[0] == 2
@@ -0,0 +1,36 @@
+from jd_registry import JDRegistry
+
+
+def test_open_set_follows_other_workers(corpus, tmp_path):
+    _, jds = corpus
+    path = str(tmp_path / "jds.sqlite3")
+    # Two registries on one database stand in for two web workers
+    first, second = JDRegistry(path), JDRegistry(path)
+    kept = first.add("Kept", jds[0])
+    assert [row["id"] for row in second.job_set()[0]] == [kept]
+
+    added = first.add("Added", jds[1])
+    assert [row["id"] for row in second.job_set()[0]] == [kept, added]
+    assert second.profile(added).text == first.profile(added).text
+
+    assert second.close(kept)
+    assert [row["id"] for row in first.job_set()[0]] == [added]
+    assert first.profile(kept) is None
+
+
+def test_weights_follow_other_workers(corpus, tmp_path):
+    _, jds = corpus
+    path = str(tmp_path / "jds.sqlite3")
+    first, second = JDRegistry(path), JDRegistry(path)
+    jd_id = first.add("Backend", jds[0])
+    assert second.profile(jd_id).weight_profile is None
+
+    profile = first.set_weight_profile({"weights": {"semantic": 0.5}})
+    assert second.weight_profile() == profile
+    assert second.profile(jd_id).weight_profile == profile
+
+    own = first.set_weight_profile({"weights": {"skills": 0.5}}, jd_id=jd_id)
+    assert second.weighted_jd_ids() == [jd_id]
+    assert second.profile(jd_id).weight_profile == own
+    assert second.clear_weight_profile(jd_id)
+    assert first.weight_profile(jd_id) == profile
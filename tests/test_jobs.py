@@ -0,0 +1,23 @@
+from jobs import JobManager
+from match import compute_match
+
+
+def test_jobs_are_visible_to_other_managers(corpus, tmp_path):
+    cvs, jds = corpus
+    path = str(tmp_path / "jobs.sqlite3")
+    tasks = [(f"cv_{i}.txt", lambda cv=cv: compute_match(cv, jds[0])) for i, cv in enumerate(cvs[:6])]
+    tasks.append(("broken.txt", lambda: {"error": "Invalid CV"}))
+    job = JobManager(path).submit(tasks)
+    streamed = list(job.stream(timeout=30))
+
+    # A second manager stands in for another web worker sharing the database
+    other = JobManager(path).get(job.id)
+    status = other.to_dict()
+    assert status["status"] == "done" and status["completed"] == 7 and status["failed"] == 1
+    assert status["errors"] == [{"cv_filename": "broken.txt", "error": "Invalid CV"}]
+    scores = [result["match_percentage"] for result in status["results"]]
+    assert scores == sorted(scores, reverse=True)
+    assert sorted(scores) == sorted(compute_match(cv, jds[0]).match_percentage for cv in cvs[:6])
+    assert list(other.stream(timeout=5)) == streamed
+    assert streamed[-1] == {"id": job.id, "status": "done", "total": 7, "completed": 7}
+    assert JobManager(path).get("missing") is None
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+import pdf_text
+from generate_corpus import create_pdf
+from pdf_text import iter_pdf_pages, page_count
+
+LINES_PER_PAGE = 36
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("pdf") / "long.pdf")
+    create_pdf(path, [f"Page {i // LINES_PER_PAGE} line {i} python kubernetes leadership" for i in range(6 * LINES_PER_PAGE)])
+    return path
+
+
+def test_layout_engine_is_the_default(pdf_path):
+    assert pdf_text.PDF_ENGINE == "layout"
+    pages = list(iter_pdf_pages(pdf_path, max_pages=0, max_chars=0))
+    assert pages == list(pdf_text._layout_pages(pdf_path, 0, None))
+    assert len(pages) == page_count(pdf_path) == 6
+    assert pages[2].startswith(f"Page 2 line {2 * LINES_PER_PAGE}")
+
+
+def test_fast_engine_yields_the_same_words(pdf_path):
+    layout = list(iter_pdf_pages(pdf_path, max_pages=0, max_chars=0, engine="layout"))
+    fast = list(iter_pdf_pages(pdf_path, max_pages=0, max_chars=0, engine="fast"))
+    assert [page.split() for page in fast] == [page.split() for page in layout]
+
+
+@pytest.mark.parametrize("engine", ["layout", "fast"])
+def test_page_and_char_budgets(pdf_path, engine):
+    assert len(list(iter_pdf_pages(pdf_path, max_pages=2, max_chars=0, engine=engine))) == 2
+    first = next(iter_pdf_pages(pdf_path, max_pages=0, max_chars=0, engine=engine))
+    # The page that reaches the budget is kept whole, then extraction stops
+    pages = list(iter_pdf_pages(pdf_path, max_pages=0, max_chars=len(first) + 1, engine=engine))
+    assert len(pages) == 2 and pages[0] == first
+    assert len(list(iter_pdf_pages(pdf_path, max_pages=4, max_chars=len(first), engine=engine))) == 1
+
+
+@pytest.mark.parametrize("engine", ["layout", "fast"])
+def test_bytes_and_streams(pdf_path, engine):
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    expected = list(iter_pdf_pages(pdf_path, max_pages=0, max_chars=0, engine=engine))
+    assert list(iter_pdf_pages(data, max_pages=0, max_chars=0, engine=engine)) == expected
+    assert list(iter_pdf_pages(io.BytesIO(data), max_pages=0, max_chars=0, engine=engine)) == expected
+
+
+def test_page_parallel_layout_matches_serial(pdf_path, monkeypatch):
+    monkeypatch.setattr(pdf_text, "PDF_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(pdf_text, "PDF_PAGES_PER_TASK", 2)
+    serial = list(iter_pdf_pages(pdf_path, max_pages=5, max_chars=0, workers=0))
+    assert list(iter_pdf_pages(pdf_path, max_pages=5, max_chars=0, workers=2)) == serial
+    assert len(serial) == 5
@@ -0,0 +1,60 @@
+import os
+import time
+
+import pytest
+
+from profiling import RequestProfiler
+
+TOKEN = "profile-secret"
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def test_captures_are_saved_and_pruned(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), keep=2)
+    ids = []
+    for _ in range(3):
+        capture = profiler.start()
+        busy(10000)
+        ids.append(profiler.finish(capture, "busy")["id"])
+        time.sleep(0.002)  # IDs sort by their millisecond timestamp
+    recent = profiler.recent()
+    assert [summary["id"] for summary in recent] == ids[:0:-1]
+    assert any("busy" in entry["function"] for entry in recent[0]["top"])
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{i}{ext}" for i in ids[1:] for ext in (".json", ".prof"))
+
+
+def test_wrap_profiles_each_call(tmp_path):
+    profiler = RequestProfiler(str(tmp_path))
+    assert profiler.wrap(busy, "task")(100) == busy(100)
+    assert profiler.recent()[0]["label"] == "task"
+
+
+@pytest.fixture
+def profiler(app_module, tmp_path, monkeypatch):
+    profiler = RequestProfiler(str(tmp_path))
+    monkeypatch.setattr(app_module, "request_profiler", profiler)
+    monkeypatch.setitem(app_module.app.config, "PROFILE_TOKEN", TOKEN)
+    return profiler
+
+
+def test_requests_are_profiled_with_the_token(client, profiler):
+    assert "X-Profile-Id" not in client.get("/about").headers
+    response = client.get("/about", headers={"X-Profile-Token": TOKEN})
+    summary = profiler.recent(1)[0]
+    assert response.headers["X-Profile-Id"] == summary["id"] and summary["label"] == "GET /about"
+
+
+def test_streamed_responses_are_profiled_until_the_body_is_sent(client, profiler, corpus):
+    cvs, jds = corpus
+    response = client.post("/api/match/bulk", headers={"X-Profile-Token": TOKEN},
+                           json={"jd": {"text": jds[0]}, "cvs": [{"text": cv} for cv in cvs[:4]]})
+    assert len(response.get_data().splitlines()) == 5
+    response.close()
+    summary = profiler.recent(1)[0]
+    assert response.headers["X-Profile-Id"] == summary["id"]
+    assert summary["label"] == "POST /api/match/bulk (streamed)"
+    # The scoring ran inside the generator, after the view returned
+    assert any("score_bulk" in entry["function"] for entry in summary["top"])
@@ -0,0 +1,79 @@
+import csv
+import json
+import sys
+import zipfile
+
+import pytest
+
+import score
+
+
+@pytest.fixture
+def cv_dir(tmp_path, corpus):
+    cvs, jds = corpus
+    directory = tmp_path / "cvs"
+    (directory / "nested").mkdir(parents=True)
+    for i, cv in enumerate(cvs[:9]):
+        (directory / ("nested" if i % 3 == 0 else "") / f"cv_{i}.txt").write_text(cv)
+    (directory / "broken.txt").write_text("tiny")
+    (directory / "notes.md").write_text("skipped")
+    (tmp_path / "jd.txt").write_text(jds[0])
+    return directory
+
+
+def run(monkeypatch, tmp_path, cvs, out, *extra):
+    monkeypatch.setattr(sys, "argv", ["score.py", "--jd", str(tmp_path / "jd.txt"), "--cvs", str(cvs),
+                                      "--out", str(out), "--workers", "0", "--chunk-size", "4", *extra])
+    score.main()
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_scores_every_document(monkeypatch, tmp_path, cv_dir, corpus):
+    out = tmp_path / "results.csv"
+    run(monkeypatch, tmp_path, cv_dir, out)
+    rows = read_rows(out)
+    assert [row["file"] for row in rows] == sorted(["broken.txt"] + [f"cv_{i}.txt" for i in range(9) if i % 3] +
+                                                   [f"nested/cv_{i}.txt" for i in range(0, 9, 3)])
+    broken = next(row for row in rows if row["file"] == "broken.txt")
+    assert broken["error"].startswith("Invalid CV") and broken["match_percentage"] == ""
+    assert all(row["jd_hash"] == rows[0]["jd_hash"] for row in rows)
+
+    archive = tmp_path / "cvs.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for path in sorted(cv_dir.rglob("*")):
+            if path.is_file():
+                z.write(path, path.relative_to(cv_dir).as_posix())
+    run(monkeypatch, tmp_path, archive, tmp_path / "from_zip.csv")
+    assert read_rows(tmp_path / "from_zip.csv") == rows
+
+
+@pytest.mark.parametrize("name", ["results.csv", "results.jsonl"])
+def test_interrupted_runs_resume(monkeypatch, tmp_path, cv_dir, name):
+    out = tmp_path / name
+    run(monkeypatch, tmp_path, cv_dir, out)
+    complete = out.read_text()
+
+    # Cut the file off mid-row, as an interruption would
+    lines = complete.splitlines(keepends=True)
+    out.write_text("".join(lines[:5]) + lines[5][:10])
+    run(monkeypatch, tmp_path, cv_dir, out)
+    assert out.read_text() == complete
+
+
+def test_resume_refuses_other_jds_and_layouts(monkeypatch, tmp_path, cv_dir, corpus):
+    out = tmp_path / "results.csv"
+    run(monkeypatch, tmp_path, cv_dir, out)
+    (tmp_path / "jd.txt").write_text(corpus[1][1])
+    with pytest.raises(SystemExit, match="different JD"):
+        run(monkeypatch, tmp_path, cv_dir, out)
+    run(monkeypatch, tmp_path, cv_dir, out, "--restart")
+    assert len(read_rows(out)) == 10
+
+    old = tmp_path / "old.jsonl"
+    old.write_text(json.dumps({"file": "cv_1.txt", "semantic_score": 0.5}) + "\n")
+    with pytest.raises(SystemExit, match="other columns"):
+        run(monkeypatch, tmp_path, cv_dir, old)
@@ -0,0 +1,34 @@
+from collections import Counter
+
+from match import JobProfile, build_cv_profiles, compute_match, tfidf_analyzer
+from score_matrix import COMPONENTS, score_matrix
+from tfidf_index import TfidfIndex
+
+
+def _assert_matches_pairs(cvs, jobs, **kwargs):
+    scores = score_matrix(cvs, jobs, **kwargs)
+    assert scores["final"].shape == (len(cvs), len(jobs))
+    for i, cv in enumerate(cvs):
+        for j, job in enumerate(jobs):
+            result = compute_match(cv, job)
+            if result is None:
+                assert all(scores[name][i, j] == 0.0 for name in scores)
+                continue
+            for name in COMPONENTS + ("final",):
+                assert scores[name][i, j] == getattr(result, name), (i, j, name)
+            assert round(scores["final"][i, j] * 100, 2) == result.match_percentage
+
+
+def test_score_matrix_equals_pairwise_scores(corpus):
+    cvs, jds = corpus
+    jobs = [JobProfile(jd) for jd in jds]
+    jobs[2].weight_profile = {"weights": {"semantic": 0.1, "tfidf": 0.1, "skills": 0.6, "exp": 0.1, "edu": 0.1}}
+    _assert_matches_pairs(build_cv_profiles(cvs), jobs)
+
+
+def test_score_matrix_equals_pairwise_scores_with_corpus_idf(corpus):
+    cvs, jds = corpus
+    index = TfidfIndex(min_docs=10)
+    index.add((str(i), Counter(tfidf_analyzer(cv))) for i, cv in enumerate(cvs))
+    assert index.ready
+    _assert_matches_pairs(build_cv_profiles(cvs), [JobProfile(jd, tfidf_index=index) for jd in jds])
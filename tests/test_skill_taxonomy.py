@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+import match
+import skill_taxonomy
+from match import MatchResult, compute_match
+from skill_taxonomy import TaxonomySource, load_skill_taxonomy, parse_skill_taxonomy
+
+DOCUMENT = {
+    "version": "2024.1",
+    "categories": {"technical": ["Kubernetes", "python", "machine learning"], "soft": ["leadership"]},
+    "aliases": {"kubernetes": ["k8s", "Kube"], "machine learning": ["ml"]},
+}
+
+
+def test_aliases_resolve_to_their_skill():
+    taxonomy = parse_skill_taxonomy(DOCUMENT)
+    assert taxonomy.version == "2024.1"
+    assert taxonomy.aliases == {"k8s": "kubernetes", "kube": "kubernetes", "ml": "machine learning"}
+    found = taxonomy.extract("Ran K8s clusters, ML pipelines in Python; showed leadership")
+    assert found == {"technical": {"kubernetes", "machine learning", "python"}, "soft": {"leadership"}}
+    assert taxonomy.extract("kubectl and mlflow") == {"technical": set(), "soft": set()}
+
+
+def test_version_defaults_to_content_digest():
+    taxonomy = parse_skill_taxonomy(dict(DOCUMENT, version=""))
+    assert taxonomy.version == taxonomy.digest
+    assert parse_skill_taxonomy(dict(DOCUMENT, version="other")).digest == taxonomy.digest
+    assert parse_skill_taxonomy(dict(DOCUMENT, aliases={})).digest != taxonomy.digest
+
+
+@pytest.mark.parametrize("document, message", [
+    ([], "non-empty \"categories\""),
+    ({"categories": {}}, "non-empty \"categories\""),
+    ({"categories": {"technical": "python"}}, "list of non-empty strings"),
+    ({"categories": {"technical": ["python", " "]}}, "list of non-empty strings"),
+    ({"categories": {"technical": ["python"]}, "aliases": ["py"]}, "\"aliases\" must map"),
+    ({"categories": {"technical": ["python"]}, "aliases": {"python": "py"}}, "list of non-empty strings"),
+    ({"categories": {"technical": ["python", "django"]}, "aliases": {"python": ["Django"]}}, "is also a skill"),
+    ({"categories": {"technical": ["python", "perl"]}, "aliases": {"python": ["p"], "perl": ["p"]}},
+     "given for two skills"),
+    ({"categories": {"technical": ["python"]}, "aliases": {"rust": ["rs"]}}, "unknown skills: rust"),
+])
+def test_invalid_documents_are_rejected(document, message):
+    with pytest.raises(ValueError, match=message):
+        parse_skill_taxonomy(document)
+
+
+def test_invalid_file_keeps_loaded_taxonomy(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps(DOCUMENT))
+    source = TaxonomySource(str(path), check_interval=0)
+    path.write_text("{not json")
+    with pytest.raises(ValueError, match="Invalid JSON"):
+        load_skill_taxonomy(str(path))
+    with pytest.raises(ValueError):
+        source.reload()
+    assert source.current().version == "2024.1"
+
+
+def updated_document(version):
+    return dict(DOCUMENT, version=version, categories=dict(DOCUMENT["categories"], tools=["terraform"]))
+
+
+def test_replace_writes_the_file_in_its_own_format(tmp_path, monkeypatch):
+    yaml = pytest.importorskip("yaml")
+    path = tmp_path / "skills.yaml"
+    path.write_text(yaml.safe_dump(DOCUMENT))
+    source = TaxonomySource(str(path), check_interval=0)
+    updated = updated_document("2024.2")
+    assert source.replace(updated).version == "2024.2"
+    assert yaml.safe_load(path.read_text()) == updated
+
+    # Without PyYAML the YAML file is left as it is
+    monkeypatch.setattr(skill_taxonomy, "yaml", None)
+    with pytest.raises(ValueError, match="PyYAML"):
+        source.replace(updated_document("2024.3"))
+    assert yaml.safe_load(path.read_text()) == updated and source.current().version == "2024.2"
+
+
+def test_taxonomy_changes_need_the_admin_token(client, app_module, tmp_path, monkeypatch):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps(DOCUMENT))
+    monkeypatch.setattr(app_module, "SKILL_TAXONOMIES", TaxonomySource(str(path), check_interval=0))
+    updated = updated_document("2024.2")
+    assert client.put("/api/taxonomy", json=updated).status_code == 403
+    monkeypatch.setitem(app_module.app.config, "ADMIN_TOKEN", "admin-secret")
+    assert client.put("/api/taxonomy", json=updated).status_code == 401
+    assert client.post("/api/taxonomy/reload", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert json.loads(path.read_text())["version"] == "2024.1"
+
+    admin = {"X-Admin-Token": "admin-secret"}
+    assert client.put("/api/taxonomy", json=updated, headers=admin).get_json()["version"] == "2024.2"
+    assert client.post("/api/taxonomy/reload", headers=admin).status_code == 200
+    assert client.get("/api/taxonomy").get_json()["version"] == "2024.2"
+
+
+def test_from_compact_does_not_intern_unknown_skills(corpus):
+    cvs, jds = corpus
+    taxonomy = match.get_skill_taxonomy()
+    stored = compute_match(cvs[0], jds[0]).to_compact()
+    assert MatchResult.from_compact(stored).to_dict() == compute_match(cvs[0], jds[0]).to_dict()
+
+    stored["skills"][0]["technical"].append("cobol 2077")
+    size = len(taxonomy.names)
+    restored = MatchResult.from_compact(stored).to_dict()
+    assert len(taxonomy.names) == size and "cobol 2077" not in taxonomy.ids
+    assert "cobol 2077" in restored["skills"]["extra"]
+    assert "cobol 2077" in restored["skills"]["cv_categorized"]["technical"]
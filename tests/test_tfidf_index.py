@@ -0,0 +1,81 @@
+from collections import Counter
+
+import numpy as np
+
+from shards import ShardDirectory
+from tfidf_index import TfidfIndex
+
+
+def _docs(prefix, n):
+    return [(f"{prefix}{i}", Counter({f"term{i % 7}": 2, f"{prefix}word": 1, "common": 1})) for i in range(n)]
+
+
+def test_saved_every_n_documents(tmp_path):
+    index = TfidfIndex(str(tmp_path), refresh_every=100, min_docs=1, save_every=5)
+    shards = ShardDirectory(str(tmp_path))
+    index.add(_docs("a", 4))
+    assert shards.names() == []
+    index.add(_docs("b", 1))
+    assert len(TfidfIndex(str(tmp_path))) == 5
+
+    # Each save writes only the documents added since the previous one
+    index.add(_docs("c", 5))
+    names = shards.names()
+    assert [shards.read(name)["keys"].tolist() for name in names] == [
+        ["a0", "a1", "a2", "a3", "b0"], [f"c{i}" for i in range(5)]]
+    assert sorted(shards.read(names[1])["terms"].tolist()) == sorted(
+        {"common", "cword"} | {f"term{i}" for i in range(5)})
+    reloaded = TfidfIndex(str(tmp_path), min_docs=1)
+    assert reloaded.keys == index.keys
+    index.refresh()
+    query = Counter({"term3": 1, "cword": 1})
+    assert np.allclose(reloaded.score(query), index.score(query))
+
+
+def test_load_compacts_the_shards(tmp_path):
+    writer = TfidfIndex(str(tmp_path), min_docs=1, save_every=1)
+    for doc in _docs("a", 40):
+        writer.add([doc])
+    shards = ShardDirectory(str(tmp_path))
+    assert len(shards.names()) == 40
+    loaded = TfidfIndex(str(tmp_path), min_docs=1)
+    assert len(loaded) == 40 and len(shards.names()) == 1
+    # The writer still sees everything and keeps adding shards next to the compacted one
+    writer.add(_docs("b", 1))
+    assert len(shards.names()) == 2 and len(TfidfIndex(str(tmp_path))) == 41
+
+
+def test_row_blocks_are_stacked_lazily(tmp_path):
+    eager = TfidfIndex(refresh_every=12, min_docs=1, consolidate_every=1)
+    lazy = TfidfIndex(refresh_every=12, min_docs=1, consolidate_every=50)
+    for doc in _docs("a", 30):
+        eager.add([doc])
+        lazy.add([doc])
+    # The IDF was refreshed at the 1st, 13th and 25th document; the 5 rows since aren't stacked yet
+    assert len(lazy._blocks) == 5 and lazy.matrix.shape[0] == 25
+    query = Counter({"term2": 1, "aword": 2})
+    assert np.allclose(lazy.score(query), eager.score(query))
+    assert not lazy._blocks and lazy.matrix.shape[0] == 30
+
+
+def test_workers_merge_before_saving(tmp_path):
+    first = TfidfIndex(str(tmp_path), refresh_every=5, min_docs=1, save_every=1)
+    second = TfidfIndex(str(tmp_path), refresh_every=5, min_docs=1, save_every=1)
+    first.add(_docs("a", 6))
+    second.add(_docs("b", 6))
+    first.add(_docs("c", 1))
+
+    reloaded = TfidfIndex(str(tmp_path), min_docs=1)
+    assert sorted(reloaded.keys) == sorted(first.keys)
+    assert len(reloaded) == 13
+    # Merged documents count towards the next IDF refresh like local ones
+    assert second.idf_docs == 12
+    assert first.idf_docs == 13
+
+
+def test_search_sees_rows_saved_elsewhere(tmp_path):
+    reader = TfidfIndex(str(tmp_path), min_docs=1, save_every=1)
+    writer = TfidfIndex(str(tmp_path), min_docs=1, save_every=1)
+    writer.add(_docs("a", 3))
+    hits = reader.search(Counter({"aword": 1}), k=5)
+    assert {key for key, _ in hits} == {"a0", "a1", "a2"}
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import vector_index
+from shards import ShardDirectory
+from vector_index import VectorIndex
+
+
+def _vectors(prefix, n, dim=8, seed=0):
+    rng = np.random.default_rng(seed)
+    return [(f"{prefix}{i}", rng.normal(size=dim).astype(np.float32)) for i in range(n)]
+
+
+def test_search_ranks_by_cosine():
+    index = VectorIndex()
+    items = _vectors("a", 50)
+    assert index.add(items + [("empty", np.zeros(8)), ("none", None), items[0]]) == 50
+    query = items[7][1] + 0.1
+    matrix = np.vstack([vector for _, vector in items])
+    cosine = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    expected = np.argsort(-cosine)[:5]
+    hits = index.search(query, k=5)
+    assert [key for key, _ in hits] == [f"a{i}" for i in expected]
+    assert np.allclose([score for _, score in hits], cosine[expected], atol=1e-5)
+    assert np.allclose(index.scores(query, ["a3", "a9"]), cosine[[3, 9]], atol=1e-5)
+    with pytest.raises(ValueError, match="does not match"):
+        index.add([("wide", np.ones(9))])
+
+
+def test_saves_write_only_new_vectors(tmp_path):
+    index = VectorIndex(str(tmp_path), save_every=5)
+    shards = ShardDirectory(str(tmp_path))
+    index.add(_vectors("a", 4))
+    assert shards.names() == []
+    index.add(_vectors("b", 3))
+    index.add(_vectors("c", 5))
+    assert [shards.read(name)["keys"].tolist() for name in shards.names()] == [
+        ["a0", "a1", "a2", "a3", "b0", "b1", "b2"], [f"c{i}" for i in range(5)]]
+    reloaded = VectorIndex(str(tmp_path))
+    assert reloaded.keys == index.keys and np.allclose(reloaded.matrix, index.matrix)
+
+
+def test_two_instances_save_into_one_directory(tmp_path):
+    first = VectorIndex(str(tmp_path), save_every=1)
+    second = VectorIndex(str(tmp_path), save_every=1)
+    first.add(_vectors("a", 3, seed=1))
+    second.add(_vectors("b", 3, seed=2))
+    first.add(_vectors("c", 2, seed=3))
+
+    # Neither save dropped the other's vectors
+    reloaded = VectorIndex(str(tmp_path))
+    assert sorted(reloaded.keys) == sorted(first.keys) and len(reloaded) == 8
+    assert len(second) == 6
+    # search() picks up what the other process saved
+    query = dict(_vectors("c", 2, seed=3))["c1"]
+    assert second.search(query, k=1)[0][0] == "c1" and len(second) == 8
+
+
+def test_load_compacts_the_shards(tmp_path):
+    writer = VectorIndex(str(tmp_path), save_every=1)
+    for item in _vectors("a", 40):
+        writer.add([item])
+    shards = ShardDirectory(str(tmp_path))
+    assert len(shards.names()) == 40
+    loaded = VectorIndex(str(tmp_path))
+    assert len(loaded) == 40 and len(shards.names()) == 1
+    assert np.allclose(loaded.matrix, writer.matrix)
+
+
+def test_approximate_search_above_the_threshold():
+    if vector_index.hnswlib is None:
+        pytest.skip("hnswlib is not installed")
+    exact = VectorIndex()
+    approximate = VectorIndex(ann_min_items=100)
+    items = _vectors("a", 300, dim=16)
+    exact.add(items)
+    approximate.add(items[:200])
+    approximate.search(items[0][1], k=1)  # builds the graph, which later adds extend
+    approximate.add(items[200:])
+    for key, query in items[::30]:
+        assert approximate.search(query, k=1)[0][0] == key
+    query = items[5][1] + items[6][1]
+    assert {key for key, _ in approximate.search(query, k=3)} == {key for key, _ in exact.search(query, k=3)}
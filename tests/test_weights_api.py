@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+TOKEN = "admin-secret"
+
+
+@pytest.fixture
+def admin(app_module, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, "ADMIN_TOKEN", TOKEN)
+    return {"X-Admin-Token": TOKEN}
+
+
+def wait_for(client, url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(url).get_json()
+        if job["status"] == "done" or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def stored_scores(app_module, jd_id):
+    rows, _, _ = app_module.candidate_store.page(jd_id=jd_id, limit=100)
+    return {row["id"]: row["score"] for row in rows}
+
+
+def test_weight_changes_need_the_admin_token(client, app_module, monkeypatch):
+    body = {"weights": {"skills": 0.5}}
+    assert client.put("/api/weights", json=body).status_code == 403
+    monkeypatch.setitem(app_module.app.config, "ADMIN_TOKEN", TOKEN)
+    assert client.put("/api/weights", json=body).status_code == 401
+    assert client.put("/api/weights", json=body, headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert client.delete("/api/jds/1/weights").status_code == 401
+    # Reading the profiles stays open
+    assert client.get("/api/weights").status_code == 200
+
+
+def test_rescore_runs_as_a_job(client, app_module, admin, corpus):
+    cvs, jds = corpus
+    jd_id = app_module.jd_registry.add("Weights JD", jds[3])
+    client.post("/api/match/bulk", json={"jd_id": jd_id, "store": True,
+                                         "cvs": [{"text": cv} for cv in cvs[:4]]}).get_data()
+    before = stored_scores(app_module, jd_id)
+
+    response = client.put(f"/api/jds/{jd_id}/weights", json={"weights": {"skills": 0.9, "semantic": 0.0}},
+                          headers=admin)
+    assert response.status_code == 202
+    queued = response.get_json()
+    assert queued["profile"]["weights"]["skills"] == 0.9
+    job = wait_for(client, queued["status_url"])
+    assert job["status"] == "done" and job["results"][0]["rescored"] == 4
+    after = stored_scores(app_module, jd_id)
+    assert after.keys() == before.keys() and after != before
+
+    response = client.delete(f"/api/jds/{jd_id}/weights", headers=admin)
+    assert response.status_code == 202 and response.get_json()["profile"] is None
+    wait_for(client, response.get_json()["status_url"])
+    assert stored_scores(app_module, jd_id) == before
+
+
+def test_bad_profiles_are_rejected_before_queueing(client, admin):
+    assert client.put("/api/weights", json=["skills"], headers=admin).status_code == 400
+    assert client.put("/api/weights", json={"weights": {"unknown": 1}}, headers=admin).status_code == 400